@@ -0,0 +1,174 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Configuration
+API_BASE_URL = "http://127.0.0.1:5000/api"
+
+# (connect, read) seconds
+DEFAULT_TIMEOUT = (3, 10)
+
+# Methods that can safely be sent twice
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+RETRY_STATUSES = {502, 503, 504}
+
+# A keyed request answered 409 + Retry-After is still running on the server
+# (e.g. the first attempt timed out on our side): retry the same key
+IN_PROGRESS_STATUS = 409
+
+# Event streams: the server sends a keep-alive comment every 15 s, so a read
+# this long without any line means the connection is dead
+EVENT_READ_TIMEOUT = 45
+EVENT_MAX_BACKOFF_SECONDS = 30
+
+# The only client error worth reconnecting after (rate limited)
+TOO_MANY_REQUESTS_STATUS = 429
+
+
+class ApiClient:
+    """
+    Shared HTTP client for the Flet frontends.
+
+    - One requests.Session: pooled keep-alive connections to the backend
+    - Every call has a timeout
+    - Idempotent calls are retried a bounded number of times with exponential
+      backoff on connection errors, timeouts and 502/503/504; a keyed call is
+      also retried on 409 "already in progress" (at least Retry-After apart)
+    - aget()/apost() run the same calls on a small thread pool, so async Flet
+      handlers can await them without blocking the UI
+    """
+
+    def __init__(
+        self,
+        base_url: str = API_BASE_URL,
+        timeout=DEFAULT_TIMEOUT,
+        retries: int = 3,
+        backoff_seconds: float = 0.3,
+        pool_size: int = 8,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_seconds = backoff_seconds
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="api")
+
+    def request(self, method: str, path: str, idempotent: bool = None,
+                idempotency_key: str = None, **kwargs) -> requests.Response:
+        """
+        Send one request to API_BASE_URL + path. `idempotent` defaults to the
+        HTTP method's semantics; pass True for POSTs that only read (e.g. check_balance).
+        With `idempotency_key` the request carries an Idempotency-Key header,
+        so the backend answers a retry with the original response and it is
+        safe to retry.
+        """
+        method = method.upper()
+        if idempotency_key:
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), "Idempotency-Key": idempotency_key}
+            if idempotent is None:
+                idempotent = True
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        kwargs.setdefault("timeout", self.timeout)
+        attempts = 1 + (self.retries if idempotent else 0)
+
+        for attempt in range(attempts):
+            last = attempt == attempts - 1
+            delay = self.backoff_seconds * (2 ** attempt)
+            try:
+                resp = self.session.request(method, f"{self.base_url}{path}", **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if last:
+                    raise
+            else:
+                in_progress = (idempotency_key and resp.status_code == IN_PROGRESS_STATUS
+                               and "Retry-After" in resp.headers)
+                if (resp.status_code not in RETRY_STATUSES and not in_progress) or last:
+                    return resp
+                if in_progress:
+                    delay = max(delay, self._retry_after(resp))
+            time.sleep(delay)
+
+    def _retry_after(self, resp: requests.Response) -> float:
+        try:
+            return float(resp.headers.get("Retry-After", 0))
+        except ValueError:
+            return 0.0
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+    async def arequest(self, method: str, path: str, **kwargs) -> requests.Response:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(self.request, method, path, **kwargs))
+
+    async def aget(self, path: str, **kwargs) -> requests.Response:
+        return await self.arequest("GET", path, **kwargs)
+
+    async def apost(self, path: str, **kwargs) -> requests.Response:
+        return await self.arequest("POST", path, **kwargs)
+
+    def events(self, path: str, stop: threading.Event):
+        """
+        Yield (event, data) from a server-sent event stream until `stop` is set.
+        Reconnects with capped exponential backoff (or the server's `retry:`)
+        when the stream drops; keep-alive comments are skipped. A 4xx reply
+        (other than 429) raises requests.HTTPError instead: reconnecting
+        would get the same answer forever.
+        """
+        delay = 1.0
+        while not stop.is_set():
+            try:
+                with self.session.get(f"{self.base_url}{path}", stream=True,
+                                      timeout=(self.timeout[0], EVENT_READ_TIMEOUT)) as resp:
+                    if 400 <= resp.status_code < 500 and resp.status_code != TOO_MANY_REQUESTS_STATUS:
+                        resp.raise_for_status()
+                    if resp.status_code != 200:
+                        raise requests.ConnectionError(f"event stream returned {resp.status_code}")
+                    event, data = "message", []
+                    for line in resp.iter_lines(decode_unicode=True):
+                        if stop.is_set():
+                            return
+                        if line:
+                            field, _, value = line.partition(":")
+                            value = value[1:] if value.startswith(" ") else value
+                            if field == "event":
+                                event = value
+                            elif field == "data":
+                                data.append(value)
+                            elif field == "retry" and value.isdigit():
+                                delay = int(value) / 1000
+                            continue
+                        # Blank line ends one event
+                        if data:
+                            yield event, json.loads("\n".join(data))
+                            delay = 1.0
+                        event, data = "message", []
+            except requests.HTTPError:
+                raise
+            except (requests.RequestException, ValueError):
+                pass
+            stop.wait(delay)
+            delay = min(delay * 2, EVENT_MAX_BACKOFF_SECONDS)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+
+# One client (and connection pool) per frontend process
+client = ApiClient()
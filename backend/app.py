@@ -1,5 +1,13 @@
+import atexit
+import functools
+import hashlib
+import hmac
+import json
+import math
+import os
 from pathlib import Path
-from flask import Flask, request, jsonify
+from flask import Flask, current_app, request, jsonify, Response, send_file
+from werkzeug.http import http_date
 
 # Imports
 from storage.bankcode_store import BankCodeStore
@@ -7,10 +15,189 @@ from storage.merchant_store import MerchantStore
 from storage.household_store import HouseholdStore
 from storage.redemption_store import RedemptionStore
 from storage.counter_store import CounterStore
+from storage.checkpoint_store import CheckpointStore
+from storage.log_index_store import LogIndexStore
+from storage.audit_index_store import AuditIndexStore
+from storage.snapshot_store import SnapshotStore
+from storage.household_disk_store import HouseholdDiskStore
+from storage.household_archive_store import HouseholdArchiveStore
 
 from services.merchant_service import MerchantService
 from services.household_service import HouseholdService
 from services.redemption_service import RedemptionService
+from services.stats_service import StatsService
+from services.district_stats_service import DistrictStatsService
+from services.transaction_history_service import TransactionHistoryService
+from services.export_service import ExportService
+from services.audit_service import AuditService
+from services.snapshot_service import SnapshotService
+from services.household_cache import HouseholdCache
+from services.event_service import EventService
+from services.idempotency_cache import IdempotencyCache, KeyInFlightError
+from storage.idempotency_store import IdempotencyStore
+from storage.tranche_store import TrancheStore
+from services.rate_limiter import TokenBucketLimiter
+
+SNAPSHOT_INTERVAL_SECONDS = 300
+
+# 0 keeps every household in memory. Otherwise households live in households.db
+# and at most this many are cached (LRU, write-through).
+HOUSEHOLD_CACHE_SIZE = 0
+
+# How often the live and district statistics are checkpointed (on a timer, off the redeem path)
+STATS_CHECKPOINT_SECONDS = 60
+
+# How often fully-redeemed households are moved to the cold archive (memory mode)
+TIERING_INTERVAL_SECONDS = 3600
+
+# Seconds between keep-alive comments on idle event streams
+EVENT_KEEPALIVE_SECONDS = 15
+
+# Reject a registration when the unit already has a household
+ONE_HOUSEHOLD_PER_UNIT = False
+
+# Bearer token for operator-only endpoints (tranche grants); unset disables them
+OPERATOR_TOKEN = os.environ.get("CDC_OPERATOR_TOKEN", "")
+
+# Token-bucket limits as (requests per second, burst)
+HOUSEHOLD_CODE_RATE_LIMIT = (10 / 60, 5)    # generate_code* per household
+MERCHANT_REDEEM_RATE_LIMIT = (60 / 60, 20)  # redemptions per merchant (code guessing)
+CLIENT_RATE_LIMIT = (300 / 60, 60)          # hot endpoints per client address
+
+# Endpoints counted against CLIENT_RATE_LIMIT
+RATE_LIMITED_PATHS = {"/api/enquiry", "/api/enquiry/batch", "/api/redemption", "/api/redemption/batch"}
+
+# Transient replies (conflict, rate limited) are never cached under an Idempotency-Key
+UNCACHED_STATUSES = {409, 429}
+
+def parse_since_version(value) -> int:
+    """`since_version` from a query string or JSON body (None when absent)."""
+    if value is None or value == "":
+        return None
+    try:
+        version = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("since_version must be a non-negative integer.")
+    if version < 0:
+        raise ValueError("since_version must be a non-negative integer.")
+    return version
+
+def operator_only(view):
+    """
+    Route decorator: require `Authorization: Bearer <CDC_OPERATOR_TOKEN>`.
+    Apply it above @idempotent, so a refused request is never cached.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not OPERATOR_TOKEN:
+            return jsonify({"error": "Operator endpoints are disabled (CDC_OPERATOR_TOKEN is not set)."}), 403
+        scheme, _, token = (request.headers.get("Authorization") or "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(token.strip().encode(), OPERATOR_TOKEN.encode()):
+            return jsonify({"error": "Operator credentials required."}), 401, {"WWW-Authenticate": "Bearer"}
+        return view(*args, **kwargs)
+    return wrapper
+
+def too_many_requests(retry_after: float) -> Response:
+    """429 telling the client how many whole seconds to wait."""
+    resp = jsonify({"error": "Too many requests. Please retry later."})
+    resp.status_code = 429
+    resp.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+    return resp
+
+def request_in_progress(error: str) -> Response:
+    """409 for a retry whose first attempt is still running; Retry-After invites the same key again."""
+    resp = jsonify({"error": error})
+    resp.status_code = 409
+    resp.headers["Retry-After"] = "1"
+    return resp
+
+def export_response(export_service: ExportService, segments: list, download_name: str) -> Response:
+    """
+    The virtual CSV of `segments`, honouring a single-range Range header:
+    206 for a satisfiable range, 416 (Content-Range: bytes */size) for one
+    past the end. An If-Range ETag or date that no longer matches the export
+    means it changed since the first attempt, so it is sent whole.
+    """
+    total = export_service.total_length(segments)
+    etag = export_service.etag(segments)
+    last_modified = export_service.last_modified(segments)
+    headers = {
+        "Content-Disposition": f"attachment; filename={download_name}",
+        "Accept-Ranges": "bytes",
+        "ETag": f'"{etag}"',
+        "Last-Modified": http_date(last_modified),
+    }
+
+    if_range = request.if_range
+    if if_range.etag:
+        unchanged = if_range.etag == etag
+    elif if_range.date:
+        unchanged = if_range.date == last_modified
+    else:
+        unchanged = True
+
+    # Multiple ranges and other units are not supported: answer with the whole file
+    byte_request = request.range is not None and request.range.units == "bytes" and len(request.range.ranges) == 1
+    if not (byte_request and unchanged):
+        headers["Content-Length"] = str(total)
+        return Response(export_service.stream(segments), mimetype="text/csv", headers=headers)
+
+    byte_range = request.range.range_for_length(total)
+    if byte_range is None:
+        resp = jsonify({"error": "Requested range not satisfiable"})
+        resp.status_code = 416
+        resp.headers["Content-Range"] = f"bytes */{total}"
+        return resp
+
+    start, stop = byte_range
+    headers["Content-Range"] = f"bytes {start}-{stop - 1}/{total}"
+    headers["Content-Length"] = str(stop - start)
+    return Response(export_service.stream(segments, start, stop - start),
+                    status=206, mimetype="text/csv", headers=headers)
+
+def idempotent(cache: IdempotencyCache, scope: str):
+    """
+    Route decorator for the Idempotency-Key header. The first request with a
+    key runs the view and its response is cached unless it is a 5xx or
+    transient (UNCACHED_STATUSES); a retry gets that response back without
+    running the view. Reusing a key for a different
+    body is rejected with 422, and a retry while the first is running with
+    409 + Retry-After (the client retries the same key).
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            key = (request.headers.get("Idempotency-Key") or "").strip()
+            if not key:
+                return view(*args, **kwargs)
+            if len(key) > 255:
+                return jsonify({"error": "Idempotency-Key must be at most 255 characters."}), 400
+
+            key = f"{scope}:{key}"
+            fingerprint = hashlib.sha256(request.get_data()).hexdigest()
+            try:
+                entry = cache.begin(key)
+            except KeyInFlightError as e:
+                return request_in_progress(str(e))
+            if entry is not None:
+                if entry["fingerprint"] != fingerprint:
+                    return jsonify({"error": "Idempotency-Key was already used for a different request."}), 422
+                resp = Response(entry["body"], status=entry["status"], mimetype=entry["mimetype"])
+                resp.headers["Idempotent-Replayed"] = "true"
+                return resp
+
+            try:
+                resp = current_app.make_response(view(*args, **kwargs))
+            except Exception:
+                cache.release(key)
+                raise
+            if resp.status_code < 500 and resp.status_code not in UNCACHED_STATUSES:
+                cache.complete(key, fingerprint, resp.status_code, resp.get_data(as_text=True), resp.mimetype)
+            else:
+                cache.release(key)
+            return resp
+        return wrapper
+    return decorator
 
 def create_app() -> Flask:
     app = Flask(__name__)
@@ -21,7 +208,6 @@ def create_app() -> Flask:
     
     # Initialize Stores
     bank_store = BankCodeStore(data_dir / "BankCode.csv")
-    bank_store.load()
     merchant_store = MerchantStore(data_dir / "Merchant.txt")
     household_store = HouseholdStore(data_dir / "households.json")
     counter_store = CounterStore(data_dir / "counters.json")
@@ -29,11 +215,86 @@ def create_app() -> Flask:
 
     # Initialize Services
     merchant_service = MerchantService(merchant_store, bank_store)
-    merchant_service.bootstrap_from_file()
 
-    household_service = HouseholdService(household_store)
-    household_service.bootstrap_from_file()
+    household_cache = None
+    if HOUSEHOLD_CACHE_SIZE:
+        household_disk_store = HouseholdDiskStore(data_dir / "households.db")
+        household_disk_store.open()
+        household_cache = HouseholdCache(household_disk_store, HOUSEHOLD_CACHE_SIZE)
+        atexit.register(household_disk_store.close)
+    archive_store = HouseholdArchiveStore(data_dir / "households_archive.jsonl")
+    archive_store.load()
+    tranche_store = TrancheStore(data_dir / "tranches.jsonl")
+    tranche_store.load()
+    household_service = HouseholdService(
+        household_store, household_cache, archive_store,
+        one_household_per_unit=ONE_HOUSEHOLD_PER_UNIT,
+        tranche_store=tranche_store
+    )
+
+    if household_cache is not None:
+        # Disk mode: households are not held in memory, so there is nothing to snapshot
+        bank_store.load()
+        merchant_service.bootstrap_from_file()
+        household_service.bootstrap_from_file()
+    else:
+        # Restore from the binary snapshot when it is still current, else re-parse the text files
+        snapshot_service = SnapshotService(
+            SnapshotStore(
+                data_dir / "state.snapshot",
+                [bank_store.bankcode_csv_path, merchant_store.merchant_file_path,
+                 household_store.household_file_path, archive_store.archive_file_path],
+                [merchant_store.lock, household_store.lock, archive_store.lock],
+            ),
+            household_service, merchant_service, bank_store
+        )
+        if not snapshot_service.restore():
+            bank_store.load()
+            merchant_service.bootstrap_from_file()
+            household_service.bootstrap_from_file(workers=4)
+        atexit.register(snapshot_service.save)
+        snapshot_service.start_periodic(SNAPSHOT_INTERVAL_SECONDS)
+        household_service.archive_cold_households()
+        household_service.start_periodic_tiering(TIERING_INTERVAL_SECONDS)
+
+    stats_service = StatsService(redemption_store, CheckpointStore(data_dir / "stats_checkpoint.json"))
+    stats_service.bootstrap()
+    atexit.register(stats_service.checkpoint)
+    stats_service.start_periodic(STATS_CHECKPOINT_SECONDS)
+
+    district_stats_service = DistrictStatsService(
+        redemption_store, household_service, CheckpointStore(data_dir / "district_stats_checkpoint.json")
+    )
+    district_stats_service.bootstrap()
+    atexit.register(district_stats_service.checkpoint)
+    district_stats_service.start_periodic(STATS_CHECKPOINT_SECONDS)
+
+    history_service = TransactionHistoryService(
+        redemption_store,
+        household_index=LogIndexStore(data_dir / "household_tx_index.csv"),
+        merchant_index=LogIndexStore(data_dir / "merchant_tx_index.csv"),
+    )
+    history_service.bootstrap()
+
+    export_service = ExportService(redemption_store)
+
+    audit_service = AuditService(redemption_store, AuditIndexStore(data_dir / "audit_index.json"))
+    audit_service.bootstrap()
+    atexit.register(audit_service.save)
     
+    event_service = EventService()
+
+    # Completed redemptions by merchant + idempotency key (single and batch),
+    # journaled so a retry after a restart still gets the original result
+    redemption_idempotency = IdempotencyCache(store=IdempotencyStore(data_dir / "idempotency_redemptions.jsonl"))
+    redemption_idempotency.load()
+    # Idempotency-Key replies for the registration endpoints (memory only)
+    idempotency_cache = IdempotencyCache()
+
+    household_limiter = TokenBucketLimiter(*HOUSEHOLD_CODE_RATE_LIMIT)
+    merchant_limiter = TokenBucketLimiter(*MERCHANT_REDEEM_RATE_LIMIT)
+    client_limiter = TokenBucketLimiter(*CLIENT_RATE_LIMIT)
+
     # Shared memory for pending codes
     pending_codes_memory = {}
     
@@ -45,15 +306,38 @@ def create_app() -> Flask:
         counter_store=counter_store,       
         redemption_store=redemption_store, 
         pending_codes=pending_codes_memory,
-        code_ttl_seconds=600
+        code_ttl_seconds=600,
+        stats_service=stats_service,
+        district_stats_service=district_stats_service,
+        event_service=event_service,
+        idempotency_cache=redemption_idempotency
     )
 
+    @app.before_request
+    def limit_clients():
+        if request.path in RATE_LIMITED_PATHS:
+            wait = client_limiter.acquire(request.remote_addr or "")
+            if wait:
+                return too_many_requests(wait)
+
     @app.get("/health")
     def health():
         return jsonify({"status": "ok"})
 
     # --- 1. MERCHANT REGISTRATION & VERIFICATION ---
+    @app.get("/api/bankcodes")
+    def bank_codes():
+        catalogue, etag = bank_store.catalogue()
+        if request.if_none_match.contains(etag):
+            resp = Response(status=304)
+        else:
+            resp = jsonify(catalogue)
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = "no-cache"  # clients may keep it, but must revalidate
+        return resp
+
     @app.post("/api/merchants")
+    @idempotent(idempotency_cache, "merchants")
     def register_merchant():
         payload = request.get_json(silent=True) or {}
         try:
@@ -68,6 +352,21 @@ def create_app() -> Flask:
         except ValueError as e:
             return jsonify({"error": str(e)}), 400
 
+    @app.get("/api/merchants/search")
+    def search_merchants():
+        try:
+            limit = int(request.args.get("limit", 10))
+        except ValueError:
+            return jsonify({"error": "limit must be a number"}), 400
+        merchants = merchant_service.search_by_name(request.args.get("q", ""), limit)
+        return jsonify({
+            "status": "success",
+            "merchants": [
+                {"merchant_id": m.merchant_id, "merchant_name": m.merchant_name, "status": m.status}
+                for m in merchants
+            ]
+        })
+
     @app.get("/api/merchants/<merchant_id>")
     def check_merchant(merchant_id):
         merchant = merchant_service.get_merchant(merchant_id)
@@ -75,8 +374,23 @@ def create_app() -> Flask:
             return jsonify({"status": "exists", "name": merchant.merchant_name})
         return jsonify({"error": "Merchant not found"}), 404
 
+    @app.get("/api/merchants/<merchant_id>/redemptions")
+    def merchant_redemptions(merchant_id):
+        if not merchant_service.get_merchant(merchant_id):
+            return jsonify({"error": "Merchant not found"}), 404
+        try:
+            page = history_service.redemptions_for_merchant(
+                merchant_id,
+                cursor=request.args.get("cursor"),
+                limit=request.args.get("limit", 20)
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify({"status": "success", "merchant_id": merchant_id, **page})
+
     # --- 2. HOUSEHOLD REGISTRATION ---
     @app.post("/api/households")
+    @idempotent(idempotency_cache, "households")
     def register_household():
         payload = request.get_json(silent=True) or {}
         
@@ -100,6 +414,75 @@ def create_app() -> Flask:
         except ValueError as e:
             return jsonify({"error": str(e)}), 400
 
+    @app.get("/api/households")
+    def households_at_address():
+        postal = (request.args.get("postal_code") or "").strip()
+        if not postal:
+            return jsonify({"error": "Missing postal_code"}), 400
+        households = household_service.find_by_address(postal, request.args.get("unit_number"))
+        return jsonify({
+            "status": "success",
+            "postal_code": postal,
+            "households": [
+                {"household_id": h.household_id, "unit_number": h.unit_number}
+                for h in households
+            ]
+        })
+
+    @app.post("/api/households/<household_id>/tranches")
+    @operator_only
+    @idempotent(idempotency_cache, "tranches")
+    def grant_tranche(household_id):
+        payload = request.get_json(silent=True) or {}
+        before = household_service.get_household(household_id)
+        before_vouchers = dict(before.vouchers) if before else {}
+        try:
+            # Always the configured tranche: the client only names which one
+            household = household_service.grant_tranche(household_id, payload.get("tranche_id"))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        event_service.publish(household_id, "wallet", {
+            "version": household.version,
+            "balance": household.balance,
+            "vouchers": dict(household.vouchers),
+            "changed": {d: q - before_vouchers.get(d, 0) for d, q in household.vouchers.items()
+                        if q != before_vouchers.get(d, 0)},
+        })
+        return jsonify({
+            "status": "success",
+            "household_id": household.household_id,
+            "balance": household.balance,
+            "vouchers": household.vouchers
+        }), 201
+
+    @app.get("/api/households/<household_id>/transactions")
+    def household_transactions(household_id):
+        if not household_service.get_household(household_id):
+            return jsonify({"error": "Not found"}), 404
+        return jsonify({
+            "status": "success",
+            "household_id": household_id,
+            "transactions": history_service.transactions_for_household(household_id)
+        })
+
+    @app.get("/api/households/<household_id>/events")
+    def household_events(household_id):
+        if not household_service.get_household(household_id):
+            return jsonify({"error": "Not found"}), 404
+        subscription = event_service.subscribe(household_id)
+
+        def stream():
+            try:
+                yield "retry: 3000\n\n"
+                while not subscription.closed:
+                    message = subscription.next(timeout=EVENT_KEEPALIVE_SECONDS)
+                    yield message if message is not None else ": keep-alive\n\n"
+            finally:
+                event_service.unsubscribe(household_id, subscription)
+
+        return Response(stream(), mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
     # --- 3. ENQUIRY (Check Balance & Generate Code) ---
     @app.post("/api/enquiry")
     def enquiry():
@@ -109,6 +492,12 @@ def create_app() -> Flask:
 
         if not h_id:
             return jsonify({"error": "Missing household_id"}), 400
+
+        # Each code sits in pending_codes until used or expired, so cap how fast they are made
+        if action in ("generate_code", "generate_code_for_amount"):
+            wait = household_limiter.acquire(str(h_id))
+            if wait:
+                return too_many_requests(wait)
         
         try:
             if action == "generate_code":
@@ -118,36 +507,200 @@ def create_app() -> Flask:
                 
                 code = redemption_service.generate_code(h_id, vouchers)
                 return jsonify({"status": "success", "code": code})
+
+            elif action == "generate_code_for_amount":
+                if payload.get("amount") is None:
+                    return jsonify({"error": "No amount provided"}), 400
+
+                code, vouchers = redemption_service.generate_code_for_amount(h_id, payload.get("amount"))
+                return jsonify({"status": "success", "code": code, "vouchers": vouchers})
             
             else: 
                 household = household_service.get_household(h_id)
                 if not household:
                     return jsonify({"error": "Not found"}), 404
-                
-                return jsonify({
-                    "status": "success", 
-                    "balance": household.balance,
-                    "vouchers": household.vouchers
-                })
 
+                since_version = parse_since_version(payload.get("since_version"))
+                return jsonify(household_service.wallet_since(household, since_version))
+
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+    @app.get("/api/enquiry")
+    def enquiry_get():
+        h_id = request.args.get("household_id")
+        if not h_id:
+            return jsonify({"error": "Missing household_id"}), 400
+        try:
+            since_version = parse_since_version(request.args.get("since_version"))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        household = household_service.get_household(h_id)
+        if not household:
+            return jsonify({"error": "Not found"}), 404
+
+        # The wallet version is the validator: unchanged version, unchanged body
+        etag = f"{household.household_id}-v{household.version}"
+        if request.if_none_match.contains(etag):
+            resp = Response(status=304)
+        else:
+            resp = jsonify(household_service.wallet_since(household, since_version))
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = "no-cache"
+        return resp
+
+    @app.post("/api/enquiry/batch")
+    def enquiry_batch():
+        payload = request.get_json(silent=True) or {}
+        household_ids = payload.get("household_ids")
+        if not isinstance(household_ids, list):
+            return jsonify({"error": "Missing household_ids list"}), 400
+        try:
+            results = household_service.enquire_many(household_ids)
         except ValueError as e:
             return jsonify({"error": str(e)}), 400
 
+        # Serialise one household at a time instead of building the whole body
+        def stream():
+            yield '{"status": "success", "households": ['
+            for i, item in enumerate(results):
+                yield ("," if i else "") + json.dumps(item)
+            yield "]}"
+
+        return Response(stream(), mimetype="application/json")
+
     # --- 4. REDEMPTION (Merchant Claims Code) ---
     @app.post("/api/redemption")
     def redeem():
         payload = request.get_json(silent=True) or {}
+        wait = merchant_limiter.acquire(str(payload.get("merchant_id") or ""))
+        if wait:
+            return too_many_requests(wait)
         try:
             result = redemption_service.redeem(
                 code=payload.get("code"),
-                merchant_id=payload.get("merchant_id")
+                merchant_id=payload.get("merchant_id"),
+                # Idempotency-Key header or body field: same merchant-scoped store as the batch path
+                idempotency_key=payload.get("idempotency_key") or request.headers.get("Idempotency-Key")
             )
             return jsonify(result), 200
+        except KeyInFlightError as e:
+            return request_in_progress(str(e))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+    @app.post("/api/redemption/batch")
+    def redeem_batch():
+        payload = request.get_json(silent=True) or {}
+        items = payload.get("redemptions")
+        if not isinstance(items, list):
+            return jsonify({"error": "Missing redemptions list"}), 400
+
+        # Every item counts against its merchant's limit; items over it stay pending
+        admitted, deferred, waits = [], [], []
+        for item in items:
+            merchant_id = item.get("merchant_id") if isinstance(item, dict) else None
+            wait = merchant_limiter.acquire(str(merchant_id or ""))
+            if wait:
+                deferred.append(item)
+                waits.append(wait)
+            else:
+                admitted.append(item)
+        if deferred and not admitted:
+            return too_many_requests(min(waits))
+
+        try:
+            results = redemption_service.redeem_batch(admitted)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        for item in deferred:
+            results.append({
+                "idempotency_key": item.get("idempotency_key") if isinstance(item, dict) else None,
+                "status": "pending",
+                "error": "Too many redemptions. Please retry later.",
+            })
+        return jsonify({"results": results}), 200
+
+    # --- 5. LIVE STATISTICS ---
+    @app.get("/api/stats")
+    def stats():
+        return jsonify(stats_service.snapshot())
+
+    @app.get("/api/stats/districts")
+    def district_stats():
+        try:
+            return jsonify(district_stats_service.heat_map(request.args.get("from"), request.args.get("to")))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+    # --- 6. LIABILITIES (Finance) ---
+    @app.get("/api/liabilities")
+    def liabilities():
+        if request.args.get("verify", "").lower() in ("1", "true", "yes"):
+            return jsonify(household_service.verify_liabilities())
+        return jsonify(household_service.liabilities())
+
+    @app.get("/api/metrics/household-cache")
+    def household_cache_metrics():
+        if household_cache is None:
+            return jsonify({
+                "mode": "memory",
+                "households": len(household_service.households_by_id),
+                "archived": len(archive_store)
+            })
+        return jsonify({"mode": "disk", **household_cache.metrics()})
+
+    @app.get("/api/metrics/id-filters")
+    def id_filter_metrics():
+        return jsonify({
+            "households": household_service.id_filter.metrics(),
+            "merchants": merchant_service.id_filter.metrics()
+        })
+
+    # --- 7. AUDIT EXPORT ---
+    @app.get("/api/exports/redemptions")
+    def export_redemptions():
+        try:
+            segments = export_service.plan(request.args.get("from"), request.args.get("to"))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if not segments:
+            return jsonify({"error": "No redemption logs in range"}), 404
+
+        download_name = f"Redeem_{request.args.get('from')}_{request.args.get('to')}.csv"
+
+        # A single whole file: let Werkzeug serve it (sendfile + Range handled for us)
+        if len(segments) == 1:
+            return send_file(segments[0][0], mimetype="text/csv", as_attachment=True,
+                             download_name=download_name, conditional=True)
+
+        return export_response(export_service, segments, download_name)
+
+    # --- 8. AUDIT LOOKUPS ---
+    @app.get("/api/audit/tx/<tx_id>")
+    def audit_transaction(tx_id):
+        try:
+            result = audit_service.find_transaction(tx_id)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if not result:
+            return jsonify({"error": "Transaction not found"}), 404
+        return jsonify({"status": "success", **result})
+
+    @app.get("/api/audit/voucher/<voucher_code>")
+    def audit_voucher(voucher_code):
+        try:
+            result = audit_service.find_voucher(voucher_code)
         except ValueError as e:
             return jsonify({"error": str(e)}), 400
+        if not result:
+            return jsonify({"error": "Voucher code not found"}), 404
+        return jsonify({"status": "success", **result})
 
     return app
 
 if __name__ == "__main__":
     app = create_app()
-    app.run(host="127.0.0.1", port=5000, debug=True)
\ No newline at end of file
+    # No reloader: its watcher process would run create_app() too, and its
+    # timers and atexit hooks would write a stale snapshot over the real one
+    app.run(host="127.0.0.1", port=5000, debug=True, use_reloader=False)
\ No newline at end of file
@@ -1,10 +1,23 @@
-from dataclasses import dataclass, asdict
+import re
+from dataclasses import dataclass, asdict, field
+
+
+def unit_key(unit_number: str) -> str:
+    """Address-index key for a unit: "#06-03" and "#6-3" are the same unit."""
+    unit = str(unit_number or "").strip()
+    match = re.match(r"^#?(\d+)-(\d+)$", unit)
+    return f"#{int(match.group(1))}-{int(match.group(2))}" if match else unit.upper()
+
 
 @dataclass
 class Household:
     """
     Household domain model.
     Encapsulates the wallet data and location info.
+
+    `version` goes up by one on every wallet mutation; `voucher_versions`
+    records the version at which each denomination last changed, so a client
+    holding version N can be sent only the denominations changed since N.
     """
     household_id: str
     postal_code: str
@@ -12,6 +25,22 @@ class Household:
     balance: int
     vouchers: dict[str, int]
     link: str
+    version: int = 0
+    voucher_versions: dict[str, int] = field(default_factory=dict)
+
+    def bump_version(self, denoms) -> int:
+        """Record one mutation touching `denoms`. Returns the new version."""
+        self.version += 1
+        for denom in denoms:
+            self.voucher_versions[str(denom)] = self.version
+        return self.version
+
+    def vouchers_changed_since(self, version: int) -> dict[str, int]:
+        """Denominations whose quantity changed after `version`."""
+        return {
+            denom: qty for denom, qty in self.vouchers.items()
+            if self.voucher_versions.get(denom, 0) > version
+        }
 
     def to_dict(self) -> dict:
         """Convert object to dictionary for JSON storage."""
@@ -26,5 +55,7 @@ class Household:
             unit_number=data.get("unit_number", ""),
             balance=data["balance"],
             vouchers=data["vouchers"],
-            link=data["link"]
+            link=data["link"],
+            version=int(data.get("version", 0)),
+            voucher_versions=data.get("voucher_versions", {})
         )
\ No newline at end of file
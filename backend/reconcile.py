@@ -0,0 +1,61 @@
+"""
+Nightly reconciliation of households.json against the redemption logs.
+
+Usage (from backend/ directory):
+  python reconcile.py [--workers N] [--full]
+"""
+
+import argparse
+from pathlib import Path
+
+from storage.checkpoint_store import CheckpointStore
+from storage.household_store import HouseholdStore
+from storage.household_disk_store import HouseholdDiskStore
+from storage.household_archive_store import HouseholdArchiveStore
+from storage.redemption_store import RedemptionStore
+from storage.tranche_store import TrancheStore
+
+from services.reconciliation_service import ReconciliationService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reconcile household wallets against redemption logs.")
+    parser.add_argument("--workers", type=int, default=4, help="number of worker processes (shards)")
+    parser.add_argument("--full", action="store_true", help="ignore the checkpoint and re-read every log")
+    args = parser.parse_args()
+
+    base_dir = Path(__file__).resolve().parent
+    data_dir = base_dir / "storage" / "data"
+
+    # Disk mode (households.db) takes precedence over households.json
+    household_store = HouseholdDiskStore(data_dir / "households.db")
+    if household_store.exists():
+        household_store.open()
+    else:
+        household_store = HouseholdStore(data_dir / "households.json")
+
+    archive_store = HouseholdArchiveStore(data_dir / "households_archive.jsonl")
+    archive_store.load()
+    tranche_store = TrancheStore(data_dir / "tranches.jsonl")
+    tranche_store.load()
+
+    service = ReconciliationService(
+        household_store=household_store,
+        redemption_store=RedemptionStore(data_dir),
+        checkpoint_store=CheckpointStore(data_dir / "reconcile_checkpoint.json"),
+        report_path=data_dir / "reconcile_report.json",
+        workers=args.workers,
+        archive_store=archive_store,
+        tranche_store=tranche_store,
+    )
+    report = service.run(full=args.full)
+
+    print(f"Households checked: {report['households_checked']}")
+    print(f"Log files read: {len(report['files_processed'])}")
+    print(f"Discrepancies: {report['discrepancy_count']}")
+    for item in report["discrepancies"][:20]:
+        print(f"  {item['household_id']} {item['field']}: expected {item['expected']}, actual {item['actual']}")
+
+
+if __name__ == "__main__":
+    main()
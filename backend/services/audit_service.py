@@ -0,0 +1,161 @@
+import re
+import threading
+from bisect import bisect_left, bisect_right
+
+from storage.audit_index_store import AuditIndexStore
+from storage.redemption_store import RedemptionStore, REDEEM_HEADER
+
+
+def _tx_number(tx_id: str) -> int:
+    match = re.match(r"^TX(\d+)$", (tx_id or "").strip())
+    if not match:
+        raise ValueError("Invalid transaction ID. Must be 'TX' followed by digits.")
+    return int(match.group(1))
+
+
+def _voucher_number(voucher_code: str) -> int:
+    match = re.match(r"^V(\d+)$", (voucher_code or "").strip())
+    if not match:
+        raise ValueError("Invalid voucher code. Must be 'V' followed by digits.")
+    return int(match.group(1))
+
+
+class AuditService:
+    """
+    Dispute lookups by transaction ID or voucher code.
+
+    CounterStore hands out TX/V numbers in increasing order, and redemptions
+    take them under the redemption log lock, so the logs are sorted by both. Per hour file we keep every Nth (tx, v, offset) as a
+    sparse index; a lookup is two binary searches plus reading at most N rows.
+
+    - New rows are indexed as RedemptionStore appends them (listener)
+    - The index file is saved when an hour file is finished and on shutdown;
+      anything newer is re-scanned from the stored end offset at bootstrap
+    """
+
+    def __init__(self, redemption_store: RedemptionStore, audit_index_store: AuditIndexStore, sample_every: int = 32):
+        self.redemption_store = redemption_store
+        self.audit_index_store = audit_index_store
+        self.sample_every = sample_every
+
+        self._files: dict[str, dict] = {}
+        # Sorted file names that have rows, with their first TX / V numbers (for bisect)
+        self._names: list[str] = []
+        self._first_tx: list[int] = []
+        self._first_v: list[int] = []
+        self._lock = threading.Lock()
+
+        self.redemption_store.add_listener(self._on_append)
+
+    def bootstrap(self) -> None:
+        """Load the saved index and index any rows written after it was saved."""
+        saved = self.audit_index_store.load()
+        log_files = self.redemption_store.list_log_files()
+        self._files = {p.name: saved[p.name] for p in log_files if p.name in saved}
+        for path in log_files:
+            entry = self._entry(path.name)
+            if entry["end"] >= path.stat().st_size:
+                continue
+            for offset, row in self.redemption_store.iter_rows_with_offsets(path, entry["end"]):
+                self._add(path.name, offset, row)
+            entry["end"] = path.stat().st_size
+
+        self._names, self._first_tx, self._first_v = [], [], []
+        for name in sorted(self._files):
+            self._register(name)
+        self.save()
+
+    def save(self) -> None:
+        with self._lock:
+            self.audit_index_store.save(self._files)
+
+    def find_transaction(self, tx_id: str) -> dict:
+        """All log rows of one transaction, or None."""
+        number = _tx_number(tx_id)
+        hit = self._locate(number, 0)
+        if hit is None:
+            return None
+        file_name, rows = hit
+        rows = [r for r in rows if r["Transaction_ID"] == f"TX{number}"]
+        return {"transaction_id": f"TX{number}", "file": file_name, "rows": rows} if rows else None
+
+    def find_voucher(self, voucher_code: str) -> dict:
+        """The log row where a voucher code was used, or None."""
+        number = _voucher_number(voucher_code)
+        hit = self._locate(number, 1)
+        if hit is None:
+            return None
+        file_name, rows = hit
+        for row in rows:
+            if row["Voucher_Code"] == f"V{number:07d}":
+                return {"voucher_code": row["Voucher_Code"], "file": file_name, "row": row}
+        return None
+
+    # --------------------------
+    # Helpers
+    # --------------------------
+    def _entry(self, file_name: str) -> dict:
+        entry = self._files.get(file_name)
+        if entry is None:
+            entry = self._files[file_name] = {"points": [], "rows": 0, "end": 0}
+        return entry
+
+    def _register(self, file_name: str) -> None:
+        points = self._files[file_name]["points"]
+        if points and (not self._names or self._names[-1] != file_name):
+            self._names.append(file_name)
+            self._first_tx.append(points[0][0])
+            self._first_v.append(points[0][1])
+
+    def _add(self, file_name: str, offset: int, row: dict) -> None:
+        try:
+            tx = _tx_number(row.get("Transaction_ID"))
+            v = _voucher_number(row.get("Voucher_Code"))
+        except ValueError:
+            return
+        entry = self._entry(file_name)
+        if entry["rows"] % self.sample_every == 0:
+            entry["points"].append([tx, v, offset])
+        entry["rows"] += 1
+
+    def _on_append(self, file_name: str, offset: int, row: list[str]) -> None:
+        with self._lock:
+            new_file = file_name not in self._files
+            self._add(file_name, offset, dict(zip(REDEEM_HEADER, row)))
+            self._files[file_name]["end"] = (self.redemption_store.data_dir / file_name).stat().st_size
+            self._register(file_name)
+        if new_file:
+            self.save()  # the previous hour is complete: persist its index
+
+    def _locate(self, number: int, column: int):
+        """
+        (file, rows) for `number` in column 0 (tx) or 1 (voucher): start at the
+        nearest sample point below it and read forward until we pass it.
+        """
+        with self._lock:
+            firsts = self._first_tx if column == 0 else self._first_v
+            i = bisect_right(firsts, number) - 1
+            if i < 0:
+                return None
+            names = self._names[i:]
+            points = self._files[names[0]]["points"]
+            keys = [p[column] for p in points]
+            start = points[max(bisect_left(keys, number) - 1, 0)][2]
+
+        key_field = "Transaction_ID" if column == 0 else "Voucher_Code"
+        parse = _tx_number if column == 0 else _voucher_number
+        rows = []
+        # A transaction written across the top of an hour continues in the next file
+        for file_name in names:
+            path = self.redemption_store.data_dir / file_name
+            for _, row in self.redemption_store.iter_rows_with_offsets(path, start):
+                try:
+                    value = parse(row.get(key_field))
+                except ValueError:
+                    continue
+                if value > number:
+                    return names[0], rows
+                if value == number:
+                    rows.append(row)
+            start = 0
+        return names[0], rows
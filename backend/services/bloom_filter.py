@@ -0,0 +1,63 @@
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    Probabilistic set of strings: might_contain() never returns False for an
+    added item, and returns True for a missing one with ~false_positive_rate
+    probability (while no more than `capacity` items are added).
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float = 0.01):
+        self.capacity = max(1, int(capacity))
+        self.false_positive_rate = false_positive_rate
+
+        self.num_bits = max(8, int(-self.capacity * math.log(false_positive_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+        # Lookup statistics
+        self.checks = 0
+        self.rejected = 0
+        self.false_positives = 0
+
+    def _positions(self, item: str):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def might_contain(self, item: str) -> bool:
+        self.checks += 1
+        for pos in self._positions(item):
+            if not self._bits[pos >> 3] & (1 << (pos & 7)):
+                self.rejected += 1
+                return False
+        return True
+
+    def record_false_positive(self) -> None:
+        """Called by the owner when might_contain() passed but the real lookup missed."""
+        self.false_positives += 1
+
+    def metrics(self) -> dict:
+        passed = self.checks - self.rejected
+        return {
+            "items": self.count,
+            "capacity": self.capacity,
+            "bits": self.num_bits,
+            "hashes": self.num_hashes,
+            "checks": self.checks,
+            "rejected": self.rejected,
+            "reject_rate": round(self.rejected / self.checks, 4) if self.checks else None,
+            "false_positives": self.false_positives,
+            "false_positive_rate": round(self.false_positives / passed, 4) if passed else None,
+        }
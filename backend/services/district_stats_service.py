@@ -0,0 +1,212 @@
+import copy
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from services.household_service import HouseholdService
+from storage.checkpoint_store import CheckpointStore
+from storage.redemption_store import RedemptionStore, hour_bound, parse_amount
+
+logger = logging.getLogger(__name__)
+
+# Hours older than this are rolled up into one bucket per day
+HOURLY_RETENTION_DAYS = 31
+
+
+def sector_of(postal_code: str) -> str:
+    """Postal sector = first two digits of the postal code."""
+    postal_code = (postal_code or "").strip()
+    return postal_code[:2] if len(postal_code) >= 2 else "unknown"
+
+
+def _tally_file(data_dir: str, file_name: str, start: int = 0) -> dict:
+    """
+    Worker: {hour: {household_id: {merchant_id: [count, amount]}}} for the
+    transactions of one log file at or after `start`. Runs in a child process,
+    so the household -> sector mapping is left to the parent.
+    """
+    store = RedemptionStore(Path(data_dir))
+    tally: dict = {}
+    seen_tx = set()
+    for _, row in store.iter_rows_with_offsets(store.data_dir / file_name, start):
+        tx_id = row.get("Transaction_ID", "")
+        if tx_id in seen_tx:
+            continue  # one row per note; count the transaction once
+        seen_tx.add(tx_id)
+        hour = (row.get("Transaction_Date_Time") or "")[:10]
+        if len(hour) != 10:
+            continue
+        merchants = tally.setdefault(hour, {}).setdefault(row.get("Household_ID", ""), {})
+        cell = merchants.setdefault(row.get("Merchant_ID", ""), [0, 0])
+        cell[0] += 1
+        cell[1] += parse_amount(row.get("Amount_Redeemed"))
+    return tally
+
+
+class DistrictStatsService:
+    """
+    Redemption heat map by postal sector x hour, with a per-merchant breakdown.
+
+    - RedemptionService.redeem calls record() with the household's postal code
+    - The first start backfills every log file in parallel (one file per task)
+    - Aggregates are checkpointed with the log position they cover, so later
+      starts only replay the tail, like StatsService. Checkpoints run on a
+      daemon timer (start_periodic), never on the redeem path
+    - Hours older than hourly_retention_days are rolled up into per-day
+      buckets at each checkpoint, so the aggregates stay bounded
+    """
+
+    def __init__(
+        self,
+        redemption_store: RedemptionStore,
+        household_service: HouseholdService,
+        checkpoint_store: CheckpointStore,
+        workers: int = 4,
+        hourly_retention_days: int = HOURLY_RETENTION_DAYS,
+    ):
+        self.redemption_store = redemption_store
+        self.household_service = household_service
+        self.checkpoint_store = checkpoint_store
+        self.workers = max(1, int(workers))
+        self.hourly_retention_days = hourly_retention_days
+
+        # hour (YYYYMMDDHH) -> sector -> {"count", "amount", "merchants": {id: {"count", "amount"}}}
+        self.hours: dict[str, dict[str, dict]] = {}
+        # day (YYYYMMDD) -> sector -> same cell, for hours past the retention
+        self.days: dict[str, dict[str, dict]] = {}
+
+        self._lock = threading.Lock()
+        self._checkpoint_lock = threading.Lock()
+
+    def bootstrap(self) -> None:
+        """Restore from the checkpoint and replay the log tail, or backfill everything once."""
+        checkpoint = self.checkpoint_store.load()
+        data_dir = str(self.redemption_store.data_dir)
+
+        if not checkpoint:
+            names = [p.name for p in self.redemption_store.list_log_files()]
+            if self.workers == 1 or len(names) <= 1:
+                tallies = [_tally_file(data_dir, name) for name in names]
+            else:
+                with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                    tallies = list(pool.map(_tally_file, [data_dir] * len(names), names))
+            for tally in tallies:
+                self._merge(tally)
+        else:
+            self.hours = checkpoint["hours"]
+            self.days = checkpoint.get("days") or {}
+            position = checkpoint.get("position") or {}
+            last_file = position.get("file", "")
+            last_offset = int(position.get("offset", 0))
+            for path in self.redemption_store.list_log_files():
+                if path.name < last_file:
+                    continue
+                start = last_offset if path.name == last_file else 0
+                self._merge(_tally_file(data_dir, path.name, start))
+
+        self.checkpoint()
+
+    def record(self, postal_code: str, merchant_id: str, total: int, when) -> None:
+        """Count one completed redemption."""
+        with self._lock:
+            self._add(when.strftime("%Y%m%d%H"), sector_of(postal_code), merchant_id, 1, total)
+
+    def heat_map(self, date_from: str = None, date_to: str = None) -> dict:
+        """
+        Sector x hour counts/amounts between two dates (YYYYMMDD or YYYYMMDDHH,
+        inclusive; open-ended when omitted), plus per-sector totals by merchant.
+        Rolled-up days are listed under "days" and counted only when the whole
+        day is inside the range.
+        """
+        low = hour_bound(date_from, "00") if date_from else ""
+        high = hour_bound(date_to, "23") if date_to else "9999999999"
+        if low > high:
+            raise ValueError("'from' must not be after 'to'.")
+
+        hours: dict[str, dict] = {}
+        days: dict[str, dict] = {}
+        sectors: dict[str, dict] = {}
+        with self._lock:
+            for day in sorted(self.days):
+                if low <= day + "00" and day + "23" <= high:
+                    days[day] = self._fold(self.days[day], sectors)
+            for hour in sorted(self.hours):
+                if low <= hour <= high:
+                    hours[hour] = self._fold(self.hours[hour], sectors)
+        return {"hours": hours, "days": days, "sectors": sectors}
+
+    def checkpoint(self) -> None:
+        """
+        Persist the aggregates together with the log position they cover.
+        Position and a copy of the aggregates are taken under the redemption
+        log lock (see RedemptionStore); the slow write happens after both
+        locks are released, so redemptions are not held up by it.
+        """
+        with self._checkpoint_lock:
+            with self.redemption_store.lock, self._lock:
+                self._roll_up(datetime.now())
+                files = self.redemption_store.list_log_files()
+                position = {"file": files[-1].name, "offset": files[-1].stat().st_size} if files else {}
+                data = copy.deepcopy({"hours": self.hours, "days": self.days})
+            data["position"] = position
+            self.checkpoint_store.save(data)
+
+    def start_periodic(self, interval_seconds: int) -> None:
+        """Checkpoint every interval_seconds on a daemon timer."""
+        def tick():
+            try:
+                self.checkpoint()
+            except Exception:
+                # Keep the timer alive: one bad tick must not stop checkpoints for good
+                logger.exception("District stats checkpoint failed")
+            self.start_periodic(interval_seconds)
+
+        self._timer = threading.Timer(interval_seconds, tick)
+        self._timer.daemon = True
+        self._timer.start()
+
+    # --------------------------
+    # Helpers
+    # --------------------------
+    def _merge(self, tally: dict) -> None:
+        """Fold a worker tally in, mapping each household to its postal sector."""
+        for hour, households in tally.items():
+            for household_id, merchants in households.items():
+                sector = sector_of(self.household_service.postal_code_of(household_id))
+                for merchant_id, (count, amount) in merchants.items():
+                    self._add(hour, sector, merchant_id, count, amount)
+
+    def _add(self, hour: str, sector: str, merchant_id: str, count: int, amount: int) -> None:
+        cell = self.hours.setdefault(hour, {}).setdefault(sector, {"count": 0, "amount": 0, "merchants": {}})
+        cell["count"] += count
+        cell["amount"] += amount
+        merchant = cell["merchants"].setdefault(merchant_id, {"count": 0, "amount": 0})
+        merchant["count"] += count
+        merchant["amount"] += amount
+
+    def _roll_up(self, now: datetime) -> None:
+        """Fold every hour older than the retention into its day's bucket."""
+        cutoff = (now - timedelta(days=self.hourly_retention_days)).strftime("%Y%m%d") + "00"
+        for hour in [h for h in self.hours if h < cutoff]:
+            day = self.days.setdefault(hour[:8], {})
+            for sector, cell in self.hours.pop(hour).items():
+                self._add_cell(day, sector, cell)
+
+    def _fold(self, bucket: dict, sectors: dict) -> dict:
+        """Per-sector count/amount of one bucket, adding it into the `sectors` totals."""
+        cells = {}
+        for sector, cell in bucket.items():
+            cells[sector] = {"count": cell["count"], "amount": cell["amount"]}
+            self._add_cell(sectors, sector, cell)
+        return cells
+
+    def _add_cell(self, cells: dict, sector: str, cell: dict) -> None:
+        total = cells.setdefault(sector, {"count": 0, "amount": 0, "merchants": {}})
+        total["count"] += cell["count"]
+        total["amount"] += cell["amount"]
+        for merchant_id, m in cell["merchants"].items():
+            merchant = total["merchants"].setdefault(merchant_id, {"count": 0, "amount": 0})
+            merchant["count"] += m["count"]
+            merchant["amount"] += m["amount"]
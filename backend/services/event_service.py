@@ -0,0 +1,71 @@
+import itertools
+import json
+import queue
+import threading
+
+# Events buffered per subscriber before a slow client is dropped
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class Subscription:
+    """One open event stream: a bounded queue of pre-formatted SSE messages."""
+
+    def __init__(self):
+        self._queue: queue.Queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.closed = False
+
+    def push(self, message: str) -> None:
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            self.closed = True  # too far behind; the client reconnects and re-reads its wallet
+
+    def next(self, timeout: float) -> str:
+        """The next message, or None after `timeout` seconds without one."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class EventService:
+    """
+    Server-sent events per household (wallet changes, consumed codes).
+
+    RedemptionService publishes; each open GET /api/households/<id>/events
+    holds a Subscription and drains it. Nothing is persisted: a client that
+    (re)connects gets only new events and should fetch its wallet once.
+    """
+
+    def __init__(self):
+        self._subscribers: dict[str, set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, household_id: str) -> Subscription:
+        subscription = Subscription()
+        with self._lock:
+            self._subscribers.setdefault(household_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, household_id: str, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(household_id)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[household_id]
+
+    def publish(self, household_id: str, event: str, data: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(household_id, ()))
+        if not subscribers:
+            return
+        message = f"id: {next(self._ids)}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+        for subscription in subscribers:
+            subscription.push(message)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(s) for s in self._subscribers.values())
@@ -0,0 +1,87 @@
+import hashlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+
+from storage.redemption_store import RedemptionStore, hour_bound, hour_of
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ExportService:
+    """
+    Redemption log export for auditors.
+
+    The hourly files in a range are exposed as one virtual CSV: the first file
+    in full, every later file without its header line. Sizes are fixed when the
+    export is planned, so rows appended to the live hour mid-download cannot
+    shift byte offsets, and a resumed download (Range: bytes=N-) lines up.
+    """
+
+    def __init__(self, redemption_store: RedemptionStore):
+        self.redemption_store = redemption_store
+
+    def plan(self, date_from: str, date_to: str) -> list[tuple[Path, int, int]]:
+        """
+        Segments (file, start, end) covering every hourly log between the two
+        dates (YYYYMMDD or YYYYMMDDHH, inclusive).
+        """
+        low = hour_bound(date_from, "00")
+        high = hour_bound(date_to, "23")
+        if low > high:
+            raise ValueError("'from' must not be after 'to'.")
+
+        segments = []
+        for path in self.redemption_store.list_log_files():
+            if not (low <= hour_of(path) <= high):
+                continue
+            size = path.stat().st_size
+            if size == 0:
+                continue
+            start = 0 if not segments else self._header_length(path)
+            segments.append((path, start, size))
+        return segments
+
+    def total_length(self, segments: list[tuple[Path, int, int]]) -> int:
+        return sum(end - start for _, start, end in segments)
+
+    def etag(self, segments: list[tuple[Path, int, int]]) -> str:
+        """Changes whenever a file in the range grows, so a stale resume can be refused."""
+        digest = hashlib.md5()
+        for path, start, end in segments:
+            digest.update(f"{path.name}:{start}:{end};".encode("utf-8"))
+        return digest.hexdigest()
+
+    def last_modified(self, segments: list[tuple[Path, int, int]]) -> datetime:
+        """Newest modification time of the files in the range (UTC, whole seconds, as HTTP dates carry)."""
+        newest = max(path.stat().st_mtime for path, _, _ in segments)
+        return datetime.fromtimestamp(int(newest), tz=timezone.utc)
+
+    def stream(self, segments: list[tuple[Path, int, int]], offset: int = 0, length: int = None) -> Iterator[bytes]:
+        """Yield `length` bytes (default: all) of the virtual file from byte `offset`, CHUNK_SIZE at a time."""
+        remaining = self.total_length(segments) - offset if length is None else length
+        for path, start, end in segments:
+            if remaining <= 0:
+                break
+            size = end - start
+            if offset >= size:
+                offset -= size
+                continue
+            with path.open("rb") as f:
+                f.seek(start + offset)
+                to_read = min(size - offset, remaining)
+                while to_read > 0:
+                    chunk = f.read(min(CHUNK_SIZE, to_read))
+                    if not chunk:
+                        break
+                    to_read -= len(chunk)
+                    remaining -= len(chunk)
+                    yield chunk
+            offset = 0
+
+    # --------------------------
+    # Helpers
+    # --------------------------
+    def _header_length(self, path: Path) -> int:
+        with path.open("rb") as f:
+            return len(f.readline())
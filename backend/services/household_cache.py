@@ -0,0 +1,107 @@
+import threading
+from collections import OrderedDict
+from typing import Iterator
+
+from models.household import Household
+from storage.household_disk_store import HouseholdDiskStore
+
+
+class HouseholdCache:
+    """
+    Size-bounded LRU cache in front of a HouseholdDiskStore.
+
+    Used as HouseholdService.households_by_id in disk mode, so it supports the
+    dict operations the services rely on (get, in, [], len, values). Memory
+    is proportional to the active set. Changes are written through to disk
+    before save() returns: a write-back cache would lose wallet deductions
+    on a crash while the redemption log keeps their rows, so the same
+    vouchers could be spent twice.
+    """
+
+    def __init__(self, disk_store: HouseholdDiskStore, capacity: int):
+        self.disk_store = disk_store
+        self.capacity = max(1, int(capacity))
+
+        self._entries: OrderedDict[str, Household] = OrderedDict()
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.writes = 0
+
+    # --------------------------
+    # dict-like interface
+    # --------------------------
+    def get(self, household_id: str, default=None) -> Household:
+        with self._lock:
+            household = self._entries.get(household_id)
+            if household is not None:
+                self._entries.move_to_end(household_id)
+                self.hits += 1
+                return household
+
+            self.misses += 1
+            household = self.disk_store.get(household_id) if household_id else None
+            if household is None:
+                return default
+            self._insert(household)
+            return household
+
+    def __getitem__(self, household_id: str) -> Household:
+        household = self.get(household_id)
+        if household is None:
+            raise KeyError(household_id)
+        return household
+
+    def __setitem__(self, household_id: str, household: Household) -> None:
+        self.save(household)
+
+    def __contains__(self, household_id: str) -> bool:
+        with self._lock:
+            if household_id in self._entries:
+                return True
+        return self.disk_store.contains(household_id)
+
+    def __len__(self) -> int:
+        return self.disk_store.count()
+
+    def values(self) -> Iterator[Household]:
+        """Every household, streamed from disk (cached copies are the same objects callers hold)."""
+        for household in self.disk_store.iter_households():
+            with self._lock:
+                cached = self._entries.get(household.household_id)
+            yield cached if cached is not None else household
+
+    # --------------------------
+    # Write-through
+    # --------------------------
+    def save(self, household: Household) -> None:
+        """Write a changed household to disk, then (re)cache it."""
+        with self._lock:
+            self.disk_store.save(household)
+            self.writes += 1
+            if household.household_id in self._entries:
+                self._entries[household.household_id] = household
+                self._entries.move_to_end(household.household_id)
+            else:
+                self._insert(household)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "capacity": self.capacity,
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "writes": self.writes,
+            }
+
+    def _insert(self, household: Household) -> None:
+        self._entries[household.household_id] = household
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)  # already on disk: nothing to write back
+            self.evictions += 1
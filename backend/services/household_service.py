@@ -1,23 +1,167 @@
+import logging
 import random
 import re
-from models.household import Household
+import threading
+from typing import Iterator
+from models.household import Household, unit_key
 from storage.household_store import HouseholdStore
+from storage.household_archive_store import HouseholdArchiveStore
+from storage.tranche_store import TrancheStore
+from services.household_cache import HouseholdCache
+from services.bloom_filter import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+# Voucher entitlement granted to every newly registered household.
+INITIAL_VOUCHERS = {
+    "2": 80,
+    "5": 32,
+    "10": 45
+}
+
+# Voucher entitlement of every later tranche (only these denominations exist)
+TRANCHE_VOUCHERS = dict(INITIAL_VOUCHERS)
+
+# Smallest Bloom filter built over registered IDs (it is rebuilt bigger as needed)
+ID_FILTER_MIN_CAPACITY = 100_000
+
+# Most households looked up by one batch enquiry
+MAX_ENQUIRY_BATCH_SIZE = 500
+
+# Per-household locks are striped over this many locks (memory stays bounded)
+HOUSEHOLD_LOCK_STRIPES = 256
+
 
 class HouseholdService:
     """
     Business logic for household registration and balance management.
     """
 
-    def __init__(self, household_store: HouseholdStore):
+    def __init__(
+        self,
+        household_store: HouseholdStore,
+        household_cache: HouseholdCache = None,
+        archive_store: HouseholdArchiveStore = None,
+        one_household_per_unit: bool = False,
+        tranche_store: TrancheStore = None,
+    ):
         self.household_store = household_store
-        
-        self.households_by_id: dict[str, Household] = {}
+        self.household_cache = household_cache
+
+        # Ledger of tranches granted after registration (grants are refused without one)
+        self.tranche_store = tranche_store
 
-    def bootstrap_from_file(self) -> None:
+        # Cold tier: fully-redeemed households moved out of the hot registry
+        self.archive_store = archive_store
+        self._tier_lock = threading.Lock()
+        self._tier_timer = None
+
+        # Every household in memory, or (disk mode) an LRU cache over the disk store
+        self.households_by_id: dict[str, Household] = household_cache if household_cache is not None else {}
+
+        # Program-wide liability, kept in step with every wallet change
+        self.outstanding_value = 0
+        self.outstanding_vouchers: dict[str, int] = {}
+        self._liability_lock = threading.Lock()
+
+        # Rejects most unknown IDs (typos, probes) without touching the registry
+        self.id_filter = BloomFilter(ID_FILTER_MIN_CAPACITY)
+
+        # Address index: postal_code -> unit_key(unit_number) -> {household IDs}
+        # (memory mode only; in disk mode the disk store indexes the address)
+        self.ids_by_address: dict[str, dict[str, set[str]]] = {}
+        self.one_household_per_unit = one_household_per_unit
+        self._address_lock = threading.Lock()
+
+        # Held across load, change and persist of a household (see household_lock)
+        self._household_locks = [threading.RLock() for _ in range(HOUSEHOLD_LOCK_STRIPES)]
+
+    def bootstrap_from_file(self, workers: int = 1, progress_every: int = 100_000) -> None:
         """Load existing households on startup to support server reboot."""
-        households = self.household_store.load_all()
+        if self.household_cache is not None:
+            self._bootstrap_disk_mode(progress_every)
+            return
+        loaded = self.load_households(self.household_store.iter_households(workers=workers), progress_every)
+        logger.info("Loaded %d households from %s", loaded, self.household_store.household_file_path)
+
+    def _bootstrap_disk_mode(self, progress_every: int) -> None:
+        """
+        Disk mode: households stay on disk. On first start the JSON file is
+        migrated into the disk store; afterwards only the liability totals
+        and the ID filter are rebuilt, streaming over the store without
+        caching anything (addresses are looked up in the store itself).
+        """
+        disk_store = self.household_cache.disk_store
+        if disk_store.count() == 0:
+            batch = []
+            for h in self.household_store.iter_households():
+                batch.append(h)
+                if len(batch) >= 1000:
+                    disk_store.save_many(batch)
+                    batch = []
+            disk_store.save_many(batch)
+
+        self.id_filter = BloomFilter(max(ID_FILTER_MIN_CAPACITY, disk_store.count() * 2))
+        scanned = 0
+        for h in disk_store.iter_households():
+            self.apply_liability_delta(h.vouchers, h.balance)
+            self.id_filter.add(h.household_id)
+            scanned += 1
+            if scanned % progress_every == 0:
+                logger.info("Scanned %d households...", scanned)
+        logger.info("Disk mode: %d households in %s", scanned, disk_store.db_path)
+
+    def rebuild_id_filter(self) -> None:
+        """Re-create the ID Bloom filter from the registry, with room to double."""
+        if self.household_cache is not None:
+            ids = list(self.household_cache.disk_store.iter_ids())
+        else:
+            ids = list(self.households_by_id.keys())
+        if self.archive_store is not None:
+            ids += self.archive_store.ids()
+        id_filter = BloomFilter(max(ID_FILTER_MIN_CAPACITY, len(ids) * 2))
+        for h_id in ids:
+            id_filter.add(h_id)
+        self.id_filter = id_filter
+
+    def _remember_id(self, household_id: str) -> None:
+        self.id_filter.add(household_id)
+        if self.id_filter.count > self.id_filter.capacity:
+            self.rebuild_id_filter()
+
+    def household_lock(self, household_id: str) -> threading.RLock:
+        """
+        Lock to hold from get_household() to persist() when changing a wallet.
+        In disk mode the cache can evict the household in between, and a
+        concurrent get would load a second copy from disk: one of the two
+        changes would then be lost. Under the lock the second caller waits
+        and loads the persisted version.
+        """
+        return self._household_locks[hash(str(household_id)) % HOUSEHOLD_LOCK_STRIPES]
+
+    def persist(self, household: Household) -> None:
+        """Persist a changed household (to the JSON store, or through the cache to the disk store)."""
+        if self.household_cache is not None:
+            self.household_cache.save(household)
+        else:
+            self.household_store.save(household)
+
+    def load_households(self, households, progress_every: int = 100_000) -> int:
+        """Add already-persisted households to memory (file bootstrap or snapshot restore)."""
+        loaded = 0
         for h in households:
             self.households_by_id[h.household_id] = h
+            self.apply_liability_delta(h.vouchers, h.balance)
+            self._index_address(h.household_id, h.postal_code, h.unit_number)
+            loaded += 1
+            if loaded % progress_every == 0:
+                logger.info("Loaded %d households...", loaded)
+        if self.archive_store is not None:
+            # Archived households still occupy their unit
+            for h in self.archive_store.iter_households():
+                self._index_address(h.household_id, h.postal_code, h.unit_number)
+        self.rebuild_id_filter()
+        return loaded
 
     def register_household(self, household_id: str, postal_code: str, unit_number: str) -> Household:
         """
@@ -48,15 +192,13 @@ class HouseholdService:
 
         # 3. Check for Duplicates
         h_id = str(household_id).strip()
-        if h_id in self.households_by_id:
+        if self.id_filter.might_contain(h_id) and (
+            h_id in self.households_by_id or (self.archive_store is not None and h_id in self.archive_store)
+        ):
             raise ValueError("Household ID already exists.")
 
         # 4. Create Household
-        initial_vouchers = {
-            "2": 80,
-            "5": 32,
-            "10": 45
-        }
+        initial_vouchers = dict(INITIAL_VOUCHERS)
 
         calculated_balance = sum(int(denom) * qty for denom, qty in initial_vouchers.items())
 
@@ -68,23 +210,251 @@ class HouseholdService:
             vouchers=initial_vouchers,
             link=f"http://cdc.gov.sg/claim/{h_id}"
         )
+        household.bump_version(initial_vouchers)
 
-        # 5. Save
-        self.household_store.save(household)
+        # 5. Check the unit and save under the address lock, indexing only once
+        # the save succeeded so a failed save does not leave the unit claimed
+        with self._address_lock:
+            if self.one_household_per_unit and self._ids_at_address(postal, unit):
+                raise ValueError("A household is already registered at this unit.")
+            self.persist(household)
+            self._index_address(h_id, postal, unit)
         self.households_by_id[h_id] = household
+        self._remember_id(h_id)
+        self.apply_liability_delta(household.vouchers, household.balance)
 
         return household
 
     def get_household(self, household_id: str) -> Household:
-        return self.households_by_id.get(household_id)
+        # IDs come straight from JSON: anything but a non-empty string is simply unknown
+        if not isinstance(household_id, str) or not household_id or not self.id_filter.might_contain(household_id):
+            return None
+        household = self.households_by_id.get(household_id)
+        if household is None and self.archive_store is not None:
+            household = self.archive_store.get(household_id)  # cold tier (read-only)
+        if household is None:
+            self.id_filter.record_false_positive()
+        return household
+
+    def postal_code_of(self, household_id: str) -> str:
+        """
+        Postal code of a hot or archived household, or None. Read-only: unlike
+        get_household it neither counts in the ID filter metrics nor loads the
+        household into the disk-mode cache, so bulk scans (statistics replay)
+        do not skew either.
+        """
+        if self.household_cache is not None:
+            postal_code = self.household_cache.disk_store.postal_code_of(household_id)
+        else:
+            household = self.households_by_id.get(household_id)
+            postal_code = household.postal_code if household is not None else None
+        if postal_code is None and self.archive_store is not None:
+            household = self.archive_store.get(household_id)
+            postal_code = household.postal_code if household is not None else None
+        return postal_code
+
+    def find_by_address(self, postal_code: str, unit_number: str = None) -> list[Household]:
+        """Households registered at a postal code, optionally narrowed to one unit."""
+        ids = self._ids_at_address(str(postal_code).strip(), unit_number)
+        households = [self.get_household(h_id) for h_id in sorted(ids)]
+        return [h for h in households if h is not None]
+
+    def wallet_since(self, household: Household, since_version: int = None) -> dict:
+        """
+        Enquiry reply for a household. With `since_version` it is either
+        {"status": "not_modified"} or a delta holding only the denominations
+        changed after that version; otherwise (or when the client is ahead of
+        the server) the full wallet.
+        """
+        version = household.version
+        if since_version is not None and since_version == version:
+            return {"status": "not_modified", "version": version}
+        if since_version is not None and since_version < version:
+            return {
+                "status": "success",
+                "version": version,
+                "delta": True,
+                "balance": household.balance,
+                "vouchers": household.vouchers_changed_since(since_version),
+            }
+        return {
+            "status": "success",
+            "version": version,
+            "balance": household.balance,
+            "vouchers": household.vouchers,
+        }
+
+    def enquire_many(self, household_ids: list) -> Iterator[dict]:
+        """
+        Wallets for several households (kiosks, call centres), in request order.
+        The size check runs now; the lookups run lazily as the caller
+        consumes the result, so a streamed response never holds them all.
+        """
+        if len(household_ids) > MAX_ENQUIRY_BATCH_SIZE:
+            raise ValueError(f"At most {MAX_ENQUIRY_BATCH_SIZE} households per batch.")
+        return (self._enquiry_item(h_id) for h_id in household_ids)
+
+    def _enquiry_item(self, household_id) -> dict:
+        household = self.get_household(household_id) if isinstance(household_id, str) else None
+        if household is None:
+            return {"household_id": household_id, "status": "not_found"}
+        return {
+            "household_id": household_id,
+            "status": "success",
+            "version": household.version,
+            "balance": household.balance,
+            "vouchers": household.vouchers,
+        }
+
+    def _ids_at_address(self, postal_code: str, unit_number: str = None) -> set[str]:
+        if self.household_cache is not None:
+            return set(self.household_cache.disk_store.ids_at_address(postal_code, unit_number))
+        units = self.ids_by_address.get(postal_code, {})
+        if unit_number:
+            return set(units.get(unit_key(unit_number), set()))
+        return {h_id for unit_ids in list(units.values()) for h_id in unit_ids}
+
+    def _index_address(self, household_id: str, postal_code: str, unit_number: str) -> None:
+        if self.household_cache is not None:
+            return  # the disk store indexes the address as part of the save
+        units = self.ids_by_address.setdefault(postal_code, {})
+        units.setdefault(unit_key(unit_number), set()).add(household_id)
 
     def deduct_balance(self, household_id: str, amount: int) -> None:
-        household = self.get_household(household_id)
-        if not household:
-            raise ValueError("Household not found")
-        
-        if household.balance < amount:
-            raise ValueError("Insufficient balance")
+        with self.household_lock(household_id):
+            household = self.get_household(household_id)
+            if not household:
+                raise ValueError("Household not found")
+
+            if household.balance < amount:
+                raise ValueError("Insufficient balance")
+
+            household.balance -= amount
+            household.bump_version(())
+            self.apply_liability_delta({}, -amount)
+            self.persist(household)
+
+    # --------------------------
+    # Cold tiering
+    # --------------------------
+    def is_cold(self, household: Household) -> bool:
+        """Nothing left to redeem, so the household can no longer change until a new tranche."""
+        return household.balance == 0 and not any(int(q) for q in household.vouchers.values())
+
+    def archive_cold_households(self) -> int:
+        """
+        Move cold households from the hot registry (households.json) to the
+        archive. Returns how many were moved. In disk mode households are
+        saved one row at a time already, so there is nothing to gain.
+        """
+        if self.archive_store is None or self.household_cache is not None:
+            return 0
+        with self._tier_lock:
+            cold = [h for h in list(self.households_by_id.values()) if self.is_cold(h)]
+            if not cold:
+                return 0
+            # Archive first: a crash in between leaves a duplicate, and hot wins
+            self.archive_store.archive_many(cold)
+            self.household_store.remove_many([h.household_id for h in cold])
+            for h in cold:
+                self.households_by_id.pop(h.household_id, None)
+            if self.archive_store.dead_lines() > len(self.archive_store):
+                self.archive_store.compact()
+        logger.info("Archived %d cold households (%d hot)", len(cold), len(self.households_by_id))
+        return len(cold)
 
-        household.balance -= amount
-        self.household_store.save(household)
\ No newline at end of file
+    def start_periodic_tiering(self, interval_seconds: int) -> None:
+        """Run archive_cold_households every interval_seconds on a daemon timer."""
+        def tick():
+            try:
+                self.archive_cold_households()
+            except OSError as e:
+                logger.warning("Cold tiering failed: %s", e)
+            self.start_periodic_tiering(interval_seconds)
+
+        self._tier_timer = threading.Timer(interval_seconds, tick)
+        self._tier_timer.daemon = True
+        self._tier_timer.start()
+
+    def grant_tranche(self, household_id: str, tranche_id: str) -> Household:
+        """
+        Credit the configured tranche (TRANCHE_VOUCHERS) once per tranche_id,
+        promoting an archived household back to hot. The grant is written to
+        the tranche ledger before the wallet changes, so reconciliation
+        expects it.
+        """
+        if self.tranche_store is None:
+            raise ValueError("Tranche grants are not enabled.")
+        tranche_id = str(tranche_id or "").strip()
+        if not tranche_id or len(tranche_id) > 64:
+            raise ValueError("A tranche_id of at most 64 characters is required.")
+        vouchers = dict(TRANCHE_VOUCHERS)
+
+        with self._tier_lock, self.household_lock(household_id):
+            household = self.get_household(household_id)
+            if not household:
+                raise ValueError("Household not found")
+            was_cold = household_id not in self.households_by_id
+            if self.tranche_store.has(household_id, tranche_id):
+                raise ValueError(f"Tranche {tranche_id} was already granted to this household.")
+            self.tranche_store.record(household_id, tranche_id, vouchers)
+
+            for denom, qty in vouchers.items():
+                household.vouchers[denom] = int(household.vouchers.get(denom, 0)) + qty
+            value = sum(int(d) * q for d, q in vouchers.items())
+            household.balance += value
+            household.bump_version(vouchers)
+
+            self.persist(household)
+            self.households_by_id[household_id] = household
+            if was_cold:
+                self.archive_store.remove(household_id)
+            self.apply_liability_delta(vouchers, value)
+        return household
+
+    # --------------------------
+    # Liability counters
+    # --------------------------
+    def apply_liability_delta(self, vouchers: dict, value: int) -> None:
+        """Add (or, with negative numbers, remove) vouchers and value from the global totals."""
+        with self._liability_lock:
+            self.outstanding_value += int(value)
+            for denom, qty in vouchers.items():
+                denom = str(denom)
+                self.outstanding_vouchers[denom] = self.outstanding_vouchers.get(denom, 0) + int(qty)
+
+    def liabilities(self) -> dict:
+        """Current totals in O(1) (O(denominations))."""
+        with self._liability_lock:
+            return {
+                "outstanding_value": self.outstanding_value,
+                "outstanding_vouchers": dict(self.outstanding_vouchers),
+            }
+
+    def recompute_liabilities(self) -> dict:
+        """Full scan over every household; used to verify the running totals."""
+        value = 0
+        vouchers: dict[str, int] = {}
+        households = self.households_by_id.values()
+        if self.household_cache is None:
+            households = list(households)  # registrations may run concurrently
+        for h in households:
+            value += h.balance
+            for denom, qty in h.vouchers.items():
+                vouchers[str(denom)] = vouchers.get(str(denom), 0) + int(qty)
+        return {"outstanding_value": value, "outstanding_vouchers": vouchers}
+
+    def verify_liabilities(self) -> dict:
+        """Running totals next to a full recompute, with a consistency flag."""
+        result = self.liabilities()
+        recomputed = self.recompute_liabilities()
+
+        def non_zero(vouchers: dict) -> dict:
+            return {d: q for d, q in vouchers.items() if q}
+
+        result["recomputed"] = recomputed
+        result["consistent"] = (
+            result["outstanding_value"] == recomputed["outstanding_value"]
+            and non_zero(result["outstanding_vouchers"]) == non_zero(recomputed["outstanding_vouchers"])
+        )
+        return result
\ No newline at end of file
@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import OrderedDict
+
+from storage.idempotency_store import IdempotencyStore
+
+# Responses remembered per cache, and for how long
+IDEMPOTENCY_MAX_ENTRIES = 10_000
+IDEMPOTENCY_TTL_SECONDS = 24 * 3600
+
+
+class KeyInFlightError(ValueError):
+    """The key's first request is still running; the caller may retry the same key shortly."""
+
+
+class IdempotencyCache:
+    """
+    Responses of completed POSTs, keyed by the client's Idempotency-Key, so a
+    retried request is answered from memory without running the handler again.
+
+    - Bounded: the oldest entry is evicted first once max_entries is reached
+    - Every entry lives ttl_seconds; with one TTL, insertion order is expiry
+      order, so expired entries are dropped from the front lazily in O(1)
+    - A key whose first request is still running is "in flight": a concurrent
+      retry is refused rather than executed twice
+    - With an IdempotencyStore, entries are journaled and survive a restart
+    """
+
+    def __init__(
+        self,
+        max_entries: int = IDEMPOTENCY_MAX_ENTRIES,
+        ttl_seconds: int = IDEMPOTENCY_TTL_SECONDS,
+        store: IdempotencyStore = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.store = store
+
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._in_flight: set[str] = set()
+        self._journal_lines = 0
+        self._lock = threading.Lock()
+
+    def load(self) -> int:
+        """Restore unexpired entries from the store. Returns how many were kept."""
+        if self.store is None:
+            return 0
+        now = time.time()
+        entries = self.store.load()
+        with self._lock:
+            self._entries.clear()
+            for entry in entries:
+                if entry.get("expires_at", 0) > now:
+                    self._entries.pop(entry["key"], None)
+                    self._entries[entry["key"]] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._journal_lines = len(entries)
+            if self._journal_lines > len(self._entries):
+                self._compact()
+            return len(self._entries)
+
+    def begin(self, key: str) -> dict:
+        """
+        The cached response for `key`, or None after claiming the key for a
+        first execution (finish with complete() or release()).
+        Raises KeyInFlightError while another request with the key is in flight.
+        """
+        with self._lock:
+            self._evict_expired(time.time())
+            entry = self._entries.get(key)
+            if entry is not None:
+                return entry
+            if key in self._in_flight:
+                raise KeyInFlightError("A request with this Idempotency-Key is already in progress.")
+            self._in_flight.add(key)
+            return None
+
+    def complete(self, key: str, fingerprint: str, status: int, body: str, mimetype: str) -> None:
+        """Cache the response of a claimed key and release it."""
+        entry = {
+            "key": key,
+            "fingerprint": fingerprint,
+            "status": status,
+            "body": body,
+            "mimetype": mimetype,
+            "expires_at": time.time() + self.ttl_seconds,
+        }
+        with self._lock:
+            self._in_flight.discard(key)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if self.store is not None:
+                self.store.append(entry)
+                self._journal_lines += 1
+                if self._journal_lines > 2 * max(len(self._entries), 1000):
+                    self._compact()
+
+    def release(self, key: str) -> None:
+        """Give up a claimed key without caching anything (the handler failed)."""
+        with self._lock:
+            self._in_flight.discard(key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # --------------------------
+    # Helpers
+    # --------------------------
+    def _evict_expired(self, now: float) -> None:
+        while self._entries:
+            oldest = next(iter(self._entries.values()))
+            if oldest["expires_at"] > now:
+                return
+            self._entries.popitem(last=False)
+
+    def _compact(self) -> None:
+        self.store.rewrite(self._entries.values())
+        self._journal_lines = len(self._entries)
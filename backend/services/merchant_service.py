@@ -1,7 +1,19 @@
 import random
+from bisect import bisect_left, insort
 from models.merchant import Merchant
 from storage.merchant_store import MerchantStore
 from storage.bankcode_store import BankCodeStore
+from services.bloom_filter import BloomFilter
+
+# Merchant IDs are M + 4 digits, so 10,000 IDs at most
+ID_FILTER_CAPACITY = 10_000
+
+
+def _name_keys(merchant_name: str) -> list[str]:
+    """Search keys for a name: the whole name and every suffix starting at a word."""
+    words = merchant_name.casefold().split()
+    return [" ".join(words[i:]) for i in range(len(words))]
+
 
 class MerchantService:
     """
@@ -17,14 +29,27 @@ class MerchantService:
         self.merchants_by_id: dict[str, Merchant] = {}
         self.merchants_by_uen: dict[str, Merchant] = {}
 
+        # Sorted (name key, merchant_id) pairs for prefix search (see _name_keys)
+        self.name_index: list[tuple[str, str]] = []
+
+        # Rejects most unknown IDs (typos, probes) before the index lookup
+        self.id_filter = BloomFilter(ID_FILTER_CAPACITY)
+
     def bootstrap_from_file(self) -> None:
         """Load existing merchants from file into memory (for restart recovery)."""
-        merchants = self.merchant_store.load_all()
+        self.load_merchants(self.merchant_store.load_all())
+
+    def load_merchants(self, merchants: list[Merchant]) -> None:
+        """Add already-persisted merchants to the in-memory indexes (file bootstrap or snapshot restore)."""
         for m in merchants:
             if m.merchant_id:
                 self.merchants_by_id[m.merchant_id] = m
+                self.id_filter.add(m.merchant_id)
             if m.uen:
                 self.merchants_by_uen[m.uen] = m
+        self.name_index = sorted(
+            (key, m.merchant_id) for m in self.merchants_by_id.values() for key in _name_keys(m.merchant_name)
+        )
 
     def _generate_merchant_id(self) -> str:
         """
@@ -76,9 +101,41 @@ class MerchantService:
         self.merchant_store.append(merchant)
         self.merchants_by_id[merchant_id] = merchant
         self.merchants_by_uen[uen] = merchant
+        self.id_filter.add(merchant_id)
+        for key in _name_keys(merchant.merchant_name):
+            insort(self.name_index, (key, merchant_id))
 
         return merchant
 
     def get_merchant(self, merchant_id: str) -> Merchant:
         """Retrieve a merchant by ID."""
-        return self.merchants_by_id.get(merchant_id)
\ No newline at end of file
+        # IDs come straight from JSON: anything but a non-empty string is simply unknown
+        if not isinstance(merchant_id, str) or not merchant_id or not self.id_filter.might_contain(merchant_id):
+            return None
+        merchant = self.merchants_by_id.get(merchant_id)
+        if merchant is None:
+            self.id_filter.record_false_positive()
+        return merchant
+
+    def search_by_name(self, prefix: str, limit: int = 10) -> list[Merchant]:
+        """
+        Merchants whose name, or any word of it, starts with `prefix`
+        (case-insensitive), in name-key order. Costs O(log n + limit).
+        """
+        prefix = " ".join(str(prefix or "").casefold().split())
+        limit = max(1, min(int(limit), 50))
+        if not prefix:
+            return []
+
+        results: list[Merchant] = []
+        seen = set()
+        i = bisect_left(self.name_index, (prefix, ""))
+        while i < len(self.name_index) and len(results) < limit:
+            key, merchant_id = self.name_index[i]
+            if not key.startswith(prefix):
+                break
+            if merchant_id not in seen:
+                seen.add(merchant_id)
+                results.append(self.merchants_by_id[merchant_id])
+            i += 1
+        return results
\ No newline at end of file
@@ -0,0 +1,66 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Most identities tracked per limiter before the least recently seen is dropped
+MAX_BUCKETS = 100_000
+
+
+class TokenBucketLimiter:
+    """
+    Token buckets keyed by identity (household ID, merchant ID, client address).
+
+    - Each bucket holds up to `burst` tokens and refills at `rate` per second;
+      a request spends one token, O(1) per request
+    - Buckets are refilled lazily when touched, never by a background job
+    - Buckets are kept least-recently-used first; one idle long enough to be
+      full again is the same as no bucket, so it is dropped on the next call
+      (and the least recent is dropped past max_buckets)
+    """
+
+    def __init__(self, rate: float, burst: int, max_buckets: int = MAX_BUCKETS):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1.")
+        self.rate = float(rate)
+        self.burst = int(burst)
+        self.max_buckets = max_buckets
+        self._refill_seconds = self.burst / self.rate
+
+        # identity -> [tokens, last_refill]
+        self._buckets: OrderedDict[str, list] = OrderedDict()
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def acquire(self, key: str) -> float:
+        """Spend one token for `key`. Returns 0 if allowed, else seconds until a token is available."""
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(self.burst), now]
+                if len(self._buckets) > self.max_buckets:
+                    self._buckets.popitem(last=False)
+            else:
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+                self._buckets.move_to_end(key)
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return 0.0
+            self.rejected += 1
+            return (1 - bucket[0]) / self.rate
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _evict_idle(self, now: float) -> None:
+        # At most two per call keeps acquire() O(1) while still draining idle buckets
+        for _ in range(2):
+            if not self._buckets:
+                return
+            oldest_key = next(iter(self._buckets))
+            if now - self._buckets[oldest_key][1] < self._refill_seconds:
+                return
+            del self._buckets[oldest_key]
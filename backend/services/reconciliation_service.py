@@ -0,0 +1,192 @@
+import itertools
+import json
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from services.household_service import INITIAL_VOUCHERS
+from storage.checkpoint_store import CheckpointStore
+from storage.household_store import HouseholdStore
+from storage.household_disk_store import HouseholdDiskStore
+from storage.household_archive_store import HouseholdArchiveStore
+from storage.tranche_store import TrancheStore
+from storage.redemption_store import RedemptionStore, hour_of, parse_amount
+
+
+def shard_of(household_id: str, shard_count: int) -> int:
+    """Stable shard number for a household (unlike hash(), identical in every process)."""
+    return zlib.crc32(household_id.encode("utf-8")) % shard_count
+
+
+def _tally_shard(data_dir: str, file_names: list[str], shard: int, shard_count: int) -> dict:
+    """
+    Worker: count redeemed notes per household and denomination, for the
+    households that hash to `shard` only. Runs in a child process.
+    """
+    store = RedemptionStore(Path(data_dir))
+    redeemed: dict[str, dict[str, int]] = {}
+    for name in file_names:
+        for row in store.iter_rows(store.data_dir / name):
+            household_id = (row.get("Household_ID") or "").strip()
+            if not household_id or shard_of(household_id, shard_count) != shard:
+                continue
+            denom = str(parse_amount(row.get("Denomination_Used")))
+            wallet = redeemed.setdefault(household_id, {})
+            wallet[denom] = wallet.get(denom, 0) + 1
+    return redeemed
+
+
+class ReconciliationService:
+    """
+    Rebuilds every household's expected wallet from the initial allocation,
+    the tranche ledger and the redemption logs, and compares it with the
+    households.json snapshot.
+
+    - Log files are tallied in parallel, one worker per household-ID shard
+    - Completed hours are folded into a checkpoint, so the next run only
+      reads hours it has not seen yet
+    - The hour still being written is always re-read and never checkpointed
+    """
+
+    def __init__(
+        self,
+        household_store: HouseholdStore | HouseholdDiskStore,
+        redemption_store: RedemptionStore,
+        checkpoint_store: CheckpointStore,
+        report_path: Path,
+        workers: int = 4,
+        archive_store: HouseholdArchiveStore = None,
+        tranche_store: TrancheStore = None,
+    ):
+        self.household_store = household_store
+        self.archive_store = archive_store
+        self.tranche_store = tranche_store
+        self.redemption_store = redemption_store
+        self.checkpoint_store = checkpoint_store
+        self.report_path = report_path
+        self.workers = max(1, int(workers))
+
+    def run(self, full: bool = False) -> dict:
+        """Reconcile and write the discrepancy report. `full=True` ignores the checkpoint."""
+        checkpoint = {} if full else self.checkpoint_store.load()
+        last_hour = checkpoint.get("last_hour", "")
+        redeemed = checkpoint.get("redeemed", {})
+
+        current_hour = self.redemption_store.current_hour()
+        closed, open_ = [], []
+        for path in self.redemption_store.list_log_files():
+            hour = hour_of(path)
+            if hour <= last_hour:
+                continue
+            (open_ if hour >= current_hour else closed).append(path)
+
+        # 1) Fold finished hours into the checkpoint
+        if closed:
+            self._merge(redeemed, self._tally(closed))
+            last_hour = hour_of(closed[-1])
+        self.checkpoint_store.save({"last_hour": last_hour, "redeemed": redeemed})
+
+        # 2) Add the live hour on top, without persisting it
+        expected_redeemed = {h: dict(w) for h, w in redeemed.items()}
+        if open_:
+            self._merge(expected_redeemed, self._tally(open_))
+
+        report = self._diff(expected_redeemed)
+        report["files_processed"] = [p.name for p in closed + open_]
+        report["checkpoint_hour"] = last_hour
+        self._write_report(report)
+        return report
+
+    # --------------------------
+    # Helpers
+    # --------------------------
+    def _tally(self, paths: list[Path]) -> dict:
+        data_dir = str(self.redemption_store.data_dir)
+        names = [p.name for p in paths]
+        if self.workers == 1:
+            return _tally_shard(data_dir, names, 0, 1)
+
+        merged: dict = {}
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = [
+                pool.submit(_tally_shard, data_dir, names, shard, self.workers)
+                for shard in range(self.workers)
+            ]
+            for future in futures:
+                # Shards are disjoint, so a plain update is enough
+                merged.update(future.result())
+        return merged
+
+    def _merge(self, into: dict, tally: dict) -> None:
+        for household_id, wallet in tally.items():
+            target = into.setdefault(household_id, {})
+            for denom, qty in wallet.items():
+                target[denom] = target.get(denom, 0) + qty
+
+    def _diff(self, redeemed: dict) -> dict:
+        discrepancies = []
+        checked = 0
+        seen = set()
+        granted = self.tranche_store.granted_vouchers() if self.tranche_store is not None else {}
+
+        # Hot households first; an archived copy of a hot household is stale
+        households = self.household_store.iter_households()
+        if self.archive_store is not None:
+            households = itertools.chain(households, self.archive_store.iter_households())
+
+        for household in households:
+            if household.household_id in seen:
+                continue
+            seen.add(household.household_id)
+            checked += 1
+            used = redeemed.pop(household.household_id, {})
+            topped_up = granted.get(household.household_id, {})
+
+            # Initial allocation + recorded tranches - redeemed
+            expected_vouchers = {}
+            for denom in set(INITIAL_VOUCHERS) | set(topped_up) | set(used):
+                expected_vouchers[denom] = (
+                    INITIAL_VOUCHERS.get(denom, 0) + topped_up.get(denom, 0) - used.get(denom, 0)
+                )
+            expected_balance = sum(int(d) * q for d, q in expected_vouchers.items())
+
+            for denom in sorted(set(expected_vouchers) | set(household.vouchers), key=int):
+                expected = expected_vouchers.get(denom, 0)
+                actual = int(household.vouchers.get(denom, 0))
+                if expected != actual:
+                    discrepancies.append({
+                        "household_id": household.household_id,
+                        "field": f"vouchers.{denom}",
+                        "expected": expected,
+                        "actual": actual,
+                    })
+
+            if expected_balance != household.balance:
+                discrepancies.append({
+                    "household_id": household.household_id,
+                    "field": "balance",
+                    "expected": expected_balance,
+                    "actual": household.balance,
+                })
+
+        # Anything left was redeemed by a household that is not registered
+        for household_id in sorted(redeemed):
+            discrepancies.append({
+                "household_id": household_id,
+                "field": "household",
+                "expected": "registered",
+                "actual": "missing",
+            })
+
+        return {
+            "generated_at": datetime.now().isoformat(),
+            "households_checked": checked,
+            "discrepancy_count": len(discrepancies),
+            "discrepancies": discrepancies,
+        }
+
+    def _write_report(self, report: dict) -> None:
+        self.report_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.report_path.open("w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
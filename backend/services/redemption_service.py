@@ -1,3 +1,5 @@
+import hashlib
+import json
 import random
 from datetime import datetime, timedelta
 
@@ -6,6 +8,14 @@ from services.merchant_service import MerchantService
 from storage.household_store import HouseholdStore
 from storage.counter_store import CounterStore
 from storage.redemption_store import RedemptionStore
+from services.stats_service import StatsService
+from services.district_stats_service import DistrictStatsService
+from services.event_service import EventService
+from services.voucher_selector import select_vouchers, whole_dollars
+from services.idempotency_cache import IdempotencyCache, KeyInFlightError
+
+# Most redemptions accepted in one redeem_batch call
+MAX_BATCH_SIZE = 100
 
 
 class RedemptionService:
@@ -14,9 +24,11 @@ class RedemptionService:
     - Validate merchant_id
     - Validate redemption code (pending_codes in memory)
     - Deduct vouchers & balance from household
-    - Persist household JSON via HouseholdStore
+    - Persist household via HouseholdService (HouseholdStore JSON or disk cache)
     - Write redemption logs via RedemptionStore
     - Generate TX/V codes via CounterStore
+    - Feed live statistics via StatsService and DistrictStatsService (optional)
+    - Push wallet changes to the household app via EventService (optional)
     """
 
     def __init__(
@@ -28,6 +40,10 @@ class RedemptionService:
         redemption_store: RedemptionStore,
         pending_codes: dict,
         code_ttl_seconds: int = 600,
+        stats_service: StatsService = None,
+        district_stats_service: DistrictStatsService = None,
+        event_service: EventService = None,
+        idempotency_cache: IdempotencyCache = None,
     ):
         self.household_service = household_service
         self.household_store = household_store
@@ -36,6 +52,13 @@ class RedemptionService:
         self.redemption_store = redemption_store
         self.pending_codes = pending_codes
         self.code_ttl_seconds = code_ttl_seconds
+        self.stats_service = stats_service
+        self.district_stats_service = district_stats_service
+        self.event_service = event_service
+
+        # Completed redemptions by "<merchant_id>:<idempotency key>", shared by
+        # redeem() and redeem_batch(); app.py passes one journaled to disk
+        self.idempotency_cache = idempotency_cache if idempotency_cache is not None else IdempotencyCache()
 
     def generate_code(self, household_id: str, vouchers: dict) -> str:
         """
@@ -43,7 +66,7 @@ class RedemptionService:
         Validates that the household exists and has sufficient balance.
         """
         # 1. Validate Household
-        household = self.household_service.households_by_id.get(household_id)
+        household = self.household_service.get_household(household_id)
         if not household:
             raise ValueError("Household not found.")
 
@@ -64,7 +87,81 @@ class RedemptionService:
         }
         return code
 
-    def redeem(self, merchant_id: str, code: str) -> dict:
+    def generate_code_for_amount(self, household_id: str, amount) -> tuple[str, dict]:
+        """
+        Generates a code for a dollar amount instead of explicit vouchers:
+        the fewest notes from the wallet that add up to exactly `amount`.
+        Returns (code, vouchers).
+        """
+        household = self.household_service.get_household(household_id)
+        if not household:
+            raise ValueError("Household not found.")
+        amount = whole_dollars(amount)
+        if amount > household.balance:
+            raise ValueError("Insufficient balance.")
+
+        vouchers = select_vouchers(household.vouchers, amount)
+        if vouchers is None:
+            raise ValueError(f"No combination of your vouchers adds up to exactly ${amount}.")
+        return self.generate_code(household_id, vouchers), vouchers
+
+    def redeem(self, merchant_id: str, code: str, idempotency_key: str = None) -> dict:
+        """
+        Redeem a code. With an idempotency_key, a retry of a redemption that
+        already completed returns the original result instead of "Invalid code."
+        Keys are scoped per merchant, and reusing one for a different code is
+        refused.
+        """
+        idempotency_key = (idempotency_key or "").strip()
+        if not idempotency_key:
+            return self._redeem(merchant_id, code)
+
+        merchant_id = (merchant_id or "").strip()
+        code = (code or "").strip()
+        key = f"{merchant_id}:{idempotency_key}"
+        fingerprint = hashlib.sha256(f"{merchant_id}\n{code}".encode("utf-8")).hexdigest()
+
+        entry = self.idempotency_cache.begin(key)  # KeyInFlightError while the first attempt is in flight
+        if entry is not None:
+            if entry["fingerprint"] != fingerprint:
+                raise ValueError("This idempotency key was already used for a different redemption.")
+            return json.loads(entry["body"])
+
+        try:
+            result = self._redeem(merchant_id, code)
+        except Exception:
+            self.idempotency_cache.release(key)
+            raise
+        self.idempotency_cache.complete(key, fingerprint, 200, json.dumps(result), "application/json")
+        return dict(result)
+
+    def redeem_batch(self, items: list[dict]) -> list[dict]:
+        """
+        Redeem several queued codes (store-and-forward terminals). Each item is
+        {"idempotency_key", "merchant_id", "code"}; each gets its own final status,
+        or "pending" while an earlier attempt with its key is still running.
+        """
+        if len(items) > MAX_BATCH_SIZE:
+            raise ValueError(f"At most {MAX_BATCH_SIZE} redemptions per batch.")
+
+        results = []
+        for item in items:
+            item = item if isinstance(item, dict) else {}
+            entry = {"idempotency_key": item.get("idempotency_key")}
+            try:
+                entry["result"] = self.redeem(item.get("merchant_id"), item.get("code"), item.get("idempotency_key"))
+                entry["status"] = "success"
+            except KeyInFlightError as e:
+                # Still being redeemed by an earlier attempt: not final, send it again later
+                entry["status"] = "pending"
+                entry["error"] = str(e)
+            except ValueError as e:
+                entry["status"] = "failed"
+                entry["error"] = str(e)
+            results.append(entry)
+        return results
+
+    def _redeem(self, merchant_id: str, code: str) -> dict:
         merchant_id = (merchant_id or "").strip()
         code = (code or "").strip()
 
@@ -72,7 +169,7 @@ class RedemptionService:
             raise ValueError("merchant_id and code are required.")
 
         # 1) Validate merchant exists + active
-        merchant = self.merchant_service.merchants_by_id.get(merchant_id)
+        merchant = self.merchant_service.get_merchant(merchant_id)
         if not merchant:
             raise ValueError("Invalid merchant.")
 
@@ -96,58 +193,87 @@ class RedemptionService:
         if not household_id:
             raise ValueError("Code data corrupted (missing household_id).")
 
-        # 3) Load household from memory
-        household = self.household_service.households_by_id.get(household_id)
-        if not household:
-            raise ValueError("Household not found.")
+        # 3)-7) Load, deduct and persist under the household's lock, so a
+        # concurrent redemption never changes a second copy of the household
+        with self.household_service.household_lock(household_id):
+            # 3) Load household (from memory, or through the cache in disk mode)
+            household = self.household_service.get_household(household_id)
+            if not household:
+                raise ValueError("Household not found.")
 
-        # 4) Check voucher sufficiency
-        if not self._has_sufficient_vouchers(household.vouchers, selected_vouchers):
-            raise ValueError("Insufficient vouchers.")
+            # 4) Check voucher sufficiency
+            if not self._has_sufficient_vouchers(household.vouchers, selected_vouchers):
+                raise ValueError("Insufficient vouchers.")
 
-        # 5) Compute total amount
-        total = self._compute_total(selected_vouchers)
-        if total <= 0:
-            raise ValueError("Total amount must be > 0.")
+            # 5) Compute total amount
+            total = self._compute_total(selected_vouchers)
+            if total <= 0:
+                raise ValueError("Total amount must be > 0.")
 
-        # 6) Deduct vouchers + balance
-        self._deduct_from_household(household, selected_vouchers, total)
+            # 6) Deduct vouchers + balance
+            self._deduct_from_household(household, selected_vouchers, total)
 
-        # 7) Persist household JSON
-        self.household_store.save(household)
+            # 7) Persist household (JSON file, or through the cache to disk in disk mode)
+            self.household_service.persist(household)
 
         # 8) Write redemption logs (one row per voucher note)
-        tx_id = self.counter_store.next_transaction_id()
-        txn_time = datetime.now().strftime("%Y%m%d%H%M%S")  # required digits format
-
         total_items = sum(int(q) for q in selected_vouchers.values())
         counter = 1
 
-        for denom, qty in selected_vouchers.items():
-            denom = int(denom)
-            for _ in range(int(qty)):
-                voucher_code = self.counter_store.next_voucher_code()
-
-                remark = str(counter)
-                if counter == total_items:
-                    remark = "Final denomination used"
-
-                row = [
-                    tx_id,
-                    household_id,
-                    merchant_id,
-                    txn_time,
-                    voucher_code,
-                    f"${denom}.00",
-                    f"${total}.00",
-                    "Completed",
-                    remark,
-                ]
-                self.redemption_store.append_row(row)
-                counter += 1
-
-        # 9) Single-use code
-        self.pending_codes.pop(code, None)
+        # Logs and live statistics under the log lock, so a checkpoint never
+        # records a log position past rows the statistics have not counted.
+        # TX/V numbers are allocated under it too: the logs stay sorted by
+        # both, which the audit index's binary search relies on
+        with self.redemption_store.lock:
+            tx_id = self.counter_store.next_transaction_id()
+            txn_dt = datetime.now()
+            txn_time = txn_dt.strftime("%Y%m%d%H%M%S")  # required digits format
+
+            for denom, qty in selected_vouchers.items():
+                denom = int(denom)
+                for _ in range(int(qty)):
+                    voucher_code = self.counter_store.next_voucher_code()
+
+                    remark = str(counter)
+                    if counter == total_items:
+                        remark = "Final denomination used"
+
+                    row = [
+                        tx_id,
+                        household_id,
+                        merchant_id,
+                        txn_time,
+                        voucher_code,
+                        f"${denom}.00",
+                        f"${total}.00",
+                        "Completed",
+                        remark,
+                    ]
+                    self.redemption_store.append_row(row)
+                    counter += 1
+
+            # 9) Single-use code
+            self.pending_codes.pop(code, None)
+
+            # 10) Live statistics
+            if self.stats_service is not None:
+                self.stats_service.record(merchant_id, selected_vouchers, total, txn_dt)
+            if self.district_stats_service is not None:
+                self.district_stats_service.record(household.postal_code, merchant_id, total, txn_dt)
+
+        # 11) Push to the household's open event streams
+        if self.event_service is not None:
+            self.event_service.publish(household_id, "code_consumed", {
+                "code": code,
+                "transaction_id": tx_id,
+                "merchant_id": merchant_id,
+            })
+            self.event_service.publish(household_id, "wallet", {
+                "version": household.version,
+                "balance": household.balance,
+                "vouchers": dict(household.vouchers),
+                "changed": {str(d): -int(q) for d, q in selected_vouchers.items()},
+            })
 
         return {
             "transaction_id": tx_id,
@@ -179,10 +305,13 @@ class RedemptionService:
             if household.vouchers.get(denom, 0) < qty:
                 raise ValueError("Insufficient vouchers during deduction.")
             household.vouchers[denom] -= qty
+            self.household_service.apply_liability_delta({denom: -qty}, 0)
 
         household.balance -= int(total)
+        self.household_service.apply_liability_delta({}, -int(total))
         if household.balance < 0:
             raise ValueError("Balance cannot go negative.")
+        household.bump_version(selected)
 
     def _extract_created_time(self, txn: dict):
         value = txn.get("created_at", None)
@@ -0,0 +1,68 @@
+import logging
+import threading
+
+from services.household_service import HouseholdService
+from services.merchant_service import MerchantService
+from storage.bankcode_store import BankCodeStore
+from storage.snapshot_store import SnapshotStore
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotService:
+    """
+    Saves and restores the registry state (households, merchants, bank pairs)
+    through a SnapshotStore so a restart does not have to re-parse the text files.
+    The text files stay the source of truth: a stale snapshot is simply ignored.
+    """
+
+    def __init__(
+        self,
+        snapshot_store: SnapshotStore,
+        household_service: HouseholdService,
+        merchant_service: MerchantService,
+        bank_store: BankCodeStore,
+    ):
+        self.snapshot_store = snapshot_store
+        self.household_service = household_service
+        self.merchant_service = merchant_service
+        self.bank_store = bank_store
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def restore(self) -> bool:
+        """Load state from the snapshot. Returns False if the caller must bootstrap from text files."""
+        state = self.snapshot_store.load()
+        if state is None:
+            return False
+        self.bank_store.restore_pairs(state["bank_pairs"])
+        self.merchant_service.load_merchants(state["merchants"])
+        loaded = self.household_service.load_households(state["households"])
+        logger.info("Restored %d households from snapshot", loaded)
+        return True
+
+    def save(self) -> None:
+        with self._lock:
+            # Fingerprint first, and capture the state before any source write can land
+            with self.snapshot_store.locked():
+                sources = self.snapshot_store.fingerprint()
+                state = {
+                    "bank_pairs": self.bank_store.pairs(),
+                    "merchants": list(self.merchant_service.merchants_by_id.values()),
+                    "households": list(self.household_service.households_by_id.values()),
+                }
+            self.snapshot_store.save(state, sources)
+
+    def start_periodic(self, interval_seconds: int) -> None:
+        """Re-save every interval_seconds on a daemon timer."""
+        def tick():
+            try:
+                self.save()
+            except Exception:
+                # Keep the timer alive: one bad tick must not stop snapshots for good
+                logger.exception("Snapshot failed")
+            self.start_periodic(interval_seconds)
+
+        self._timer = threading.Timer(interval_seconds, tick)
+        self._timer.daemon = True
+        self._timer.start()
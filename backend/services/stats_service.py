@@ -0,0 +1,175 @@
+import copy
+import logging
+import threading
+from datetime import datetime
+
+from storage.checkpoint_store import CheckpointStore
+from storage.redemption_store import RedemptionStore, parse_amount
+
+logger = logging.getLogger(__name__)
+
+
+def _empty_bucket(start: int) -> dict:
+    return {"start": start, "count": 0, "amount": 0, "denominations": {}, "merchants": {}}
+
+
+class RollingCounter:
+    """
+    Ring buffer of fixed-width time buckets (e.g. 60 x 1 minute).
+    Slot = bucket number % size; a slot still holding an older bucket is
+    reset the first time it is reused, so nothing ever has to be "expired".
+    """
+
+    def __init__(self, size: int, bucket_seconds: int):
+        self.size = size
+        self.bucket_seconds = bucket_seconds
+        self.slots: list[dict] = [_empty_bucket(-1) for _ in range(size)]
+
+    def _bucket_number(self, when: datetime) -> int:
+        return int(when.timestamp()) // self.bucket_seconds
+
+    def add(self, when: datetime, merchant_id: str, vouchers: dict, total: int, count: int = 1) -> None:
+        number = self._bucket_number(when)
+        slot = self.slots[number % self.size]
+        if slot["start"] != number:
+            if slot["start"] > number:
+                return  # older than the whole window
+            slot = _empty_bucket(number)
+            self.slots[number % self.size] = slot
+
+        slot["count"] += count
+        slot["amount"] += total
+        for denom, qty in vouchers.items():
+            denom = str(denom)
+            slot["denominations"][denom] = slot["denominations"].get(denom, 0) + int(qty)
+        merchant = slot["merchants"].setdefault(merchant_id, {"count": 0, "amount": 0})
+        merchant["count"] += count
+        merchant["amount"] += total
+
+    def window(self, now: datetime) -> list[dict]:
+        """Buckets inside the window ending at `now`, oldest first (empty ones included)."""
+        latest = self._bucket_number(now)
+        result = []
+        for number in range(latest - self.size + 1, latest + 1):
+            slot = self.slots[number % self.size]
+            bucket = slot if slot["start"] == number else _empty_bucket(number)
+            result.append({
+                **bucket,
+                "start": datetime.fromtimestamp(number * self.bucket_seconds).isoformat(),
+            })
+        return result
+
+
+class StatsService:
+    """
+    Live redemption statistics for the operations dashboard.
+
+    - RedemptionService.redeem calls record() after writing the logs
+    - Counts/amounts are kept per minute (last hour) and per hour (last 2 days),
+      broken down by denomination and merchant
+    - A checkpoint (counters + log position) is written on a daemon timer
+      (start_periodic), never on the redeem path; on restart only the log tail
+      after that position is replayed. The position and a copy of the counters
+      are taken under the redemption log lock, so the position never runs
+      ahead of the counters
+    """
+
+    def __init__(
+        self,
+        redemption_store: RedemptionStore,
+        checkpoint_store: CheckpointStore,
+    ):
+        self.redemption_store = redemption_store
+        self.checkpoint_store = checkpoint_store
+
+        self.per_minute = RollingCounter(size=60, bucket_seconds=60)
+        self.per_hour = RollingCounter(size=48, bucket_seconds=3600)
+
+        self._lock = threading.Lock()
+        self._checkpoint_lock = threading.Lock()
+
+    def bootstrap(self) -> None:
+        """Restore counters from the last checkpoint, then replay the log tail."""
+        checkpoint = self.checkpoint_store.load()
+        if checkpoint:
+            self.per_minute.slots = checkpoint["per_minute"]
+            self.per_hour.slots = checkpoint["per_hour"]
+
+        position = checkpoint.get("position") or {}
+        last_file = position.get("file", "")
+        last_offset = int(position.get("offset", 0))
+
+        for path in self.redemption_store.list_log_files():
+            if path.name < last_file:
+                continue
+            start = last_offset if path.name == last_file else 0
+            self._replay(path, start)
+
+        self.checkpoint()
+
+    def record(self, merchant_id: str, vouchers: dict, total: int, when: datetime = None) -> None:
+        """Count one completed redemption."""
+        when = when or datetime.now()
+        with self._lock:
+            self.per_minute.add(when, merchant_id, vouchers, total)
+            self.per_hour.add(when, merchant_id, vouchers, total)
+
+    def snapshot(self, now: datetime = None) -> dict:
+        now = now or datetime.now()
+        with self._lock:
+            return {
+                "per_minute": self.per_minute.window(now),
+                "per_hour": self.per_hour.window(now),
+            }
+
+    def checkpoint(self) -> None:
+        """
+        Persist counters together with the log position they cover. Both are
+        taken under the redemption log lock (see RedemptionStore); the write
+        happens after it is released, so redemptions are not held up by it.
+        """
+        with self._checkpoint_lock:
+            with self.redemption_store.lock, self._lock:
+                files = self.redemption_store.list_log_files()
+                position = {"file": files[-1].name, "offset": files[-1].stat().st_size} if files else {}
+                data = copy.deepcopy({"per_minute": self.per_minute.slots, "per_hour": self.per_hour.slots})
+            data["position"] = position
+            self.checkpoint_store.save(data)
+
+    def start_periodic(self, interval_seconds: int) -> None:
+        """Checkpoint every interval_seconds on a daemon timer."""
+        def tick():
+            try:
+                self.checkpoint()
+            except Exception:
+                # Keep the timer alive: one bad tick must not stop checkpoints for good
+                logger.exception("Stats checkpoint failed")
+            self.start_periodic(interval_seconds)
+
+        self._timer = threading.Timer(interval_seconds, tick)
+        self._timer.daemon = True
+        self._timer.start()
+
+    # --------------------------
+    # Helpers
+    # --------------------------
+    def _replay(self, path, start: int) -> None:
+        """Feed logged rows back into the counters (one row = one voucher note)."""
+        seen_tx = set()
+        for _, row in self.redemption_store.iter_rows_with_offsets(path, start):
+            try:
+                when = datetime.strptime(row["Transaction_Date_Time"], "%Y%m%d%H%M%S")
+            except (KeyError, ValueError):
+                continue
+            tx_id = row.get("Transaction_ID", "")
+            merchant_id = row.get("Merchant_ID", "")
+            denom = str(parse_amount(row.get("Denomination_Used")))
+
+            # Transaction count/amount once per TX, denominations once per note
+            first_row = tx_id not in seen_tx
+            seen_tx.add(tx_id)
+            total = parse_amount(row.get("Amount_Redeemed")) if first_row else 0
+            count = 1 if first_row else 0
+
+            self.per_minute.add(when, merchant_id, {denom: 1}, total, count)
+            self.per_hour.add(when, merchant_id, {denom: 1}, total, count)
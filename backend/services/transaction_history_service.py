@@ -0,0 +1,165 @@
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from storage.log_index_store import LogIndexStore
+from storage.redemption_store import RedemptionStore, REDEEM_HEADER, parse_amount
+
+
+def _scan_file(data_dir: str, file_name: str, key_fields: list[str], start: int = 0) -> dict:
+    """
+    Worker: {key_field: [(key, file, offset), ...]} for every row of one log
+    file at or after `start`. Runs in a child process.
+    """
+    store = RedemptionStore(Path(data_dir))
+    entries = {field: [] for field in key_fields}
+    for offset, row in store.iter_rows_with_offsets(store.data_dir / file_name, start):
+        for field in key_fields:
+            key = (row.get(field) or "").strip()
+            if key:
+                entries[field].append((key, file_name, offset))
+    return entries
+
+
+def encode_cursor(position: tuple[str, int]) -> str:
+    return f"{position[0]}:{position[1]}"
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    file_name, sep, offset = (cursor or "").rpartition(":")
+    if not sep or not file_name or not offset.isdigit():
+        raise ValueError("Invalid cursor.")
+    return file_name, int(offset)
+
+
+class TransactionHistoryService:
+    """
+    Household and merchant transaction history without scanning the logs.
+
+    - LogIndexStores map Household_ID / Merchant_ID -> (log file, byte offset) per row;
+      (file, offset) order is time order, since files are hourly and append-only
+    - New rows are indexed as RedemptionStore appends them (listener)
+    - A missing index is rebuilt from all logs in parallel, one file per task
+    """
+
+    def __init__(
+        self,
+        redemption_store: RedemptionStore,
+        household_index: LogIndexStore,
+        merchant_index: LogIndexStore,
+        workers: int = 4,
+    ):
+        self.redemption_store = redemption_store
+        self.household_index = household_index
+        self.merchant_index = merchant_index
+        self.workers = max(1, int(workers))
+
+        # Log column -> index over that column
+        self._indexes = {
+            "Household_ID": household_index,
+            "Merchant_ID": merchant_index,
+        }
+        self.redemption_store.add_listener(self._on_append)
+
+    def bootstrap(self) -> None:
+        """Load each index, rebuilding it if missing and catching up on rows it has not seen."""
+        missing = [field for field, index in self._indexes.items() if not index.exists()]
+        if missing:
+            scanned = self._scan_all(missing)
+            for field in missing:
+                self._indexes[field].rebuild(scanned[field])
+
+        data_dir = str(self.redemption_store.data_dir)
+        for field, index in self._indexes.items():
+            if field in missing:
+                continue
+            index.load()
+            last_file, last_offset = index.last_position()
+            for path in self.redemption_store.list_log_files():
+                if path.name < last_file:
+                    continue
+                # Resume after the last indexed row, not inside it
+                start = self.redemption_store.end_of_row(path, last_offset) if path.name == last_file else 0
+                for key, file_name, offset in _scan_file(data_dir, path.name, [field], start)[field]:
+                    index.add(key, file_name, offset)
+
+    def transactions_for_household(self, household_id: str) -> list[dict]:
+        """All transactions of a household, newest first."""
+        return self._group(self._read(self.household_index.lookup(household_id)))[::-1]
+
+    def redemptions_for_merchant(self, merchant_id: str, cursor: str = None, limit: int = 20) -> dict:
+        """
+        One page of a merchant's transactions, newest first.
+        `cursor` is the next_cursor of the previous page; pages stay stable
+        while new redemptions arrive because those only ever land after it.
+        """
+        limit = max(1, min(int(limit), 100))
+        positions = self.merchant_index.lookup(merchant_id)
+        end = bisect_left(positions, decode_cursor(cursor)) if cursor else len(positions)
+
+        # Walk backwards, keeping every row of the last transaction on the page
+        rows: list[dict] = []
+        tx_ids: list[str] = []
+        i = end - 1
+        while i >= 0:
+            row = self._read([positions[i]])[0]
+            tx_id = row.get("Transaction_ID", "")
+            if tx_id not in tx_ids:
+                if len(tx_ids) == limit:
+                    break
+                tx_ids.append(tx_id)
+            rows.append(row)
+            i -= 1
+
+        start = i + 1
+        return {
+            "redemptions": self._group(rows[::-1])[::-1],
+            "next_cursor": encode_cursor(positions[start]) if start > 0 else None,
+        }
+
+    # --------------------------
+    # Helpers
+    # --------------------------
+    def _on_append(self, file_name: str, offset: int, row: list[str]) -> None:
+        record = dict(zip(REDEEM_HEADER, row))
+        for field, index in self._indexes.items():
+            if record.get(field):
+                index.add(record[field], file_name, offset)
+
+    def _scan_all(self, key_fields: list[str]) -> dict:
+        data_dir = str(self.redemption_store.data_dir)
+        names = [p.name for p in self.redemption_store.list_log_files()]
+        if self.workers == 1 or len(names) <= 1:
+            results = [_scan_file(data_dir, name, key_fields) for name in names]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                results = list(pool.map(_scan_file, [data_dir] * len(names), names, [key_fields] * len(names)))
+        return {field: [entry for result in results for entry in result[field]] for field in key_fields}
+
+    def _read(self, positions: list[tuple[str, int]]) -> list[dict]:
+        return [
+            self.redemption_store.read_row_at(self.redemption_store.data_dir / file_name, offset)
+            for file_name, offset in positions
+        ]
+
+    def _group(self, rows: list[dict]) -> list[dict]:
+        """Fold one-row-per-note log rows back into transactions (log order kept)."""
+        transactions: dict[str, dict] = {}
+        for row in rows:
+            tx_id = row.get("Transaction_ID", "")
+            txn = transactions.get(tx_id)
+            if txn is None:
+                txn = transactions[tx_id] = {
+                    "transaction_id": tx_id,
+                    "household_id": row.get("Household_ID", ""),
+                    "merchant_id": row.get("Merchant_ID", ""),
+                    "date_time": row.get("Transaction_Date_Time", ""),
+                    "amount_redeemed": parse_amount(row.get("Amount_Redeemed")),
+                    "status": row.get("Payment_Status", ""),
+                    "vouchers": {},
+                    "voucher_codes": [],
+                }
+            denom = str(parse_amount(row.get("Denomination_Used")))
+            txn["vouchers"][denom] = txn["vouchers"].get(denom, 0) + 1
+            txn["voucher_codes"].append(row.get("Voucher_Code", ""))
+        return list(transactions.values())
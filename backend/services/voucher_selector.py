@@ -0,0 +1,87 @@
+import math
+
+# Largest amount one code may be generated for (bounds the DP table)
+MAX_SELECTION_AMOUNT = 10_000
+
+
+def _split(denom: int, qty: int) -> list[tuple[int, int]]:
+    """
+    Binary split of `qty` notes into packs of 1, 2, 4, ... plus a remainder,
+    so every count 0..qty is a sum of distinct packs: (denom, notes) each.
+    """
+    packs = []
+    size = 1
+    while qty > 0:
+        take = min(size, qty)
+        packs.append((denom, take))
+        qty -= take
+        size *= 2
+    return packs
+
+
+def whole_dollars(amount) -> int:
+    """
+    `amount` as a positive int. Accepts ints, integral floats (12.0) and digit
+    strings ("12"); rejects bools, fractions (12.7) and anything <= 0.
+    """
+    if isinstance(amount, bool):
+        raise ValueError("Amount must be a positive whole number of dollars.")
+    if isinstance(amount, str):
+        amount = amount.strip()
+        if not amount.isdecimal():
+            raise ValueError("Amount must be a positive whole number of dollars.")
+        amount = int(amount)
+    elif isinstance(amount, float):
+        if not amount.is_integer():
+            raise ValueError("Amount must be a positive whole number of dollars.")
+        amount = int(amount)
+    elif not isinstance(amount, int):
+        raise ValueError("Amount must be a positive whole number of dollars.")
+    if amount <= 0:
+        raise ValueError("Amount must be a positive whole number of dollars.")
+    return amount
+
+
+def select_vouchers(wallet: dict[str, int], amount: int) -> dict[str, int]:
+    """
+    Vouchers from `wallet` adding up to exactly `amount` with the fewest notes,
+    or None when no exact combination exists.
+
+    Bounded coin change as a 0/1 knapsack over binary-split packs: the table
+    has one cell per dollar up to `amount`, and each denomination contributes
+    O(log quantity) packs, so a large wallet costs little more than a small one.
+    Ties go to larger notes (they are considered last and win on equal count).
+    """
+    amount = whole_dollars(amount)
+    if amount > MAX_SELECTION_AMOUNT:
+        raise ValueError(f"Amount must not exceed ${MAX_SELECTION_AMOUNT}.")
+
+    packs = []
+    for denom in sorted(wallet, key=int):
+        d, qty = int(denom), int(wallet[denom])
+        if d > 0 and qty > 0:
+            packs.extend(_split(d, min(qty, amount // d)))
+
+    # best[s] = fewest notes summing to s; took[i][s] marks pack i as used for s
+    best = [0] + [math.inf] * amount
+    took = []
+    for denom, notes in packs:
+        weight = denom * notes
+        used = bytearray(amount + 1)
+        for s in range(amount, weight - 1, -1):
+            candidate = best[s - weight] + notes
+            if candidate <= best[s] and candidate != math.inf:
+                best[s] = candidate
+                used[s] = 1
+        took.append(used)
+
+    if best[amount] == math.inf:
+        return None
+
+    selection: dict[str, int] = {}
+    s = amount
+    for (denom, notes), used in zip(reversed(packs), reversed(took)):
+        if used[s]:
+            selection[str(denom)] = selection.get(str(denom), 0) + notes
+            s -= denom * notes
+    return selection
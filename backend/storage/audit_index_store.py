@@ -0,0 +1,33 @@
+import json
+import os
+from pathlib import Path
+
+
+class AuditIndexStore:
+    """
+    Sparse audit index over the hourly redemption logs, stored as JSON:
+        {file_name: {"points": [[tx, v, offset], ...], "rows": n, "end": byte_end}}
+
+    Transaction IDs and voucher codes only ever grow, so a handful of
+    sampled points per file is enough to binary-search to a nearby offset.
+    """
+
+    def __init__(self, index_file_path: Path):
+        self.index_file_path = index_file_path
+
+    def load(self) -> dict:
+        if not self.index_file_path.exists():
+            return {}
+        try:
+            raw = self.index_file_path.read_text(encoding="utf-8").strip()
+            return json.loads(raw) if raw else {}
+        except (json.JSONDecodeError, OSError):
+            return {}
+
+    def save(self, data: dict) -> None:
+        """Atomically replace the index file."""
+        self.index_file_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_file_path.with_name(self.index_file_path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.index_file_path)
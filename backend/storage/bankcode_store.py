@@ -1,28 +1,84 @@
 import csv
+import hashlib
+import threading
 from pathlib import Path
 
 class BankCodeStore:
     """
     Simple loader/validator for BankCode.csv.
-    We only need to validate (bank_code, branch_code) existence.
+    Validates (bank_code, branch_code) pairs and serves the full bank/branch
+    catalogue, reloading both whenever the CSV changes on disk.
     """
 
     def __init__(self, bankcode_csv_path: Path):
         self.bankcode_csv_path = bankcode_csv_path
         self._pairs: set[tuple[str, str]] = set()
 
+        # Full catalogue, its ETag and the (mtime_ns, size) it was read at
+        self._catalogue: dict = {"banks": []}
+        self._etag = ""
+        self._fingerprint = None
+        self._lock = threading.Lock()
+
     def load(self) -> None:
-        """Load BankCode.csv into an in-memory set for O(1) validation."""
-        self._pairs.clear()
+        """Load BankCode.csv into an in-memory set for O(1) validation, plus the catalogue."""
+        stat = self.bankcode_csv_path.stat()
+        raw = self.bankcode_csv_path.read_bytes()
+
+        pairs: set[tuple[str, str]] = set()
+        banks: dict[str, dict] = {}
+        reader = csv.DictReader(raw.decode("utf-8-sig").splitlines())
+        for row in reader:
+            bank_code = (row.get("Bank_Code") or "").strip()
+            branch_code = (row.get("Branch_Code") or "").strip()
+            if not (bank_code and branch_code):
+                continue
+            pairs.add((bank_code, branch_code))
+
+            bank = banks.setdefault(bank_code, {
+                "bank_code": bank_code,
+                "bank_name": (row.get("Bank_Name") or "").strip(),
+                "swift_code": (row.get("SWIFT_Code") or "").strip(),
+                "branches": [],
+            })
+            bank["branches"].append({
+                "branch_code": branch_code,
+                "branch_name": (row.get("Branch_Name") or "").strip(),
+                "remarks": (row.get("Remarks") or "").strip(),
+            })
+
+        with self._lock:
+            self._pairs = pairs
+            self._catalogue = {"banks": list(banks.values())}
+            self._etag = hashlib.md5(raw).hexdigest()
+            self._fingerprint = (stat.st_mtime_ns, stat.st_size)
 
-        with self.bankcode_csv_path.open("r", newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                bank_code = (row.get("Bank_Code") or "").strip()
-                branch_code = (row.get("Branch_Code") or "").strip()
-                if bank_code and branch_code:
-                    self._pairs.add((bank_code, branch_code))
+    def reload_if_changed(self) -> bool:
+        """Re-read the CSV if its mtime/size moved since the last load. Returns True if reloaded."""
+        if not self.bankcode_csv_path.exists():
+            return False
+        stat = self.bankcode_csv_path.stat()
+        if (stat.st_mtime_ns, stat.st_size) == self._fingerprint:
+            return False
+        self.load()
+        return True
+
+    def catalogue(self) -> tuple[dict, str]:
+        """(catalogue, etag), hot-reloaded from the CSV when it has changed."""
+        self.reload_if_changed()
+        with self._lock:
+            return self._catalogue, self._etag
 
     def is_valid(self, bank_code: str, branch_code: str) -> bool:
         """Check if (bank_code, branch_code) exists in BankCode.csv."""
+        self.reload_if_changed()
         return (bank_code.strip(), branch_code.strip()) in self._pairs
+
+    def pairs(self) -> set[tuple[str, str]]:
+        """All known (bank_code, branch_code) pairs (for snapshots)."""
+        return set(self._pairs)
+
+    def restore_pairs(self, pairs: set[tuple[str, str]]) -> None:
+        """Replace the loaded pairs, e.g. from a startup snapshot instead of the CSV."""
+        self._pairs = set(pairs)
+        self._fingerprint = None  # catalogue not loaded: the first catalogue() reads the CSV
@@ -0,0 +1,39 @@
+import json
+import os
+from pathlib import Path
+
+
+class CheckpointStore:
+    """
+    Small JSON file used by background jobs to remember how far they got.
+    Writes go to a temp file first and are then renamed, so a crash never
+    leaves a half-written checkpoint behind.
+    """
+
+    def __init__(self, checkpoint_path: Path):
+        self.checkpoint_path = checkpoint_path
+
+    def load(self) -> dict:
+        """Return the last saved checkpoint, or {} if there is none (or it is unreadable)."""
+        if not self.checkpoint_path.exists():
+            return {}
+        try:
+            raw = self.checkpoint_path.read_text(encoding="utf-8").strip()
+            if not raw:
+                return {}
+            return json.loads(raw)
+        except (json.JSONDecodeError, OSError):
+            return {}
+
+    def save(self, data: dict) -> None:
+        """Atomically replace the checkpoint with `data`."""
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.checkpoint_path.with_name(self.checkpoint_path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def clear(self) -> None:
+        """Forget the checkpoint (forces the next run to start from scratch)."""
+        if self.checkpoint_path.exists():
+            self.checkpoint_path.unlink()
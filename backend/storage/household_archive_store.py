@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Iterable, Iterator
+from models.household import Household
+
+
+class HouseholdArchiveStore:
+    """
+    Cold tier for households that no longer change (fully redeemed).
+
+    One compact JSON object per line, append-only. A household promoted back
+    to the hot registry gets a tombstone line {"household_id": ..., "promoted": true}.
+    Only household_id -> byte offset is kept in memory; a lookup reads one line.
+    """
+
+    def __init__(self, archive_file_path: Path):
+        self.archive_file_path = archive_file_path
+        self._offsets: dict[str, int] = {}
+        self._dead_lines = 0
+        self.lock = threading.Lock()  # held for every write (see SnapshotService.save)
+
+    def load(self) -> None:
+        """Build the offset index from the archive file."""
+        self._offsets.clear()
+        self._dead_lines = 0
+        if not self.archive_file_path.exists():
+            return
+        with self.archive_file_path.open("rb") as f:
+            offset = f.tell()
+            for line in iter(f.readline, b""):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # torn last line after a crash
+                h_id = record.get("household_id")
+                if h_id in self._offsets:
+                    self._dead_lines += 1
+                if record.get("promoted"):
+                    self._offsets.pop(h_id, None)
+                    self._dead_lines += 1
+                else:
+                    self._offsets[h_id] = offset
+                offset = f.tell()
+
+    def __contains__(self, household_id: str) -> bool:
+        return household_id in self._offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def ids(self) -> list[str]:
+        return list(self._offsets)
+
+    def get(self, household_id: str) -> Household:
+        offset = self._offsets.get(household_id)
+        if offset is None:
+            return None
+        with self.lock, self.archive_file_path.open("rb") as f:
+            f.seek(offset)
+            return Household.from_dict(json.loads(f.readline()))
+
+    def archive_many(self, households: Iterable[Household]) -> int:
+        """Append households to the archive. Returns how many were written."""
+        lines = [(h.household_id, self._encode(h.to_dict())) for h in households]
+        if not lines:
+            return 0
+        self.archive_file_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.lock, self.archive_file_path.open("ab") as f:
+            for h_id, line in lines:
+                if h_id in self._offsets:
+                    self._dead_lines += 1
+                self._offsets[h_id] = f.tell()
+                f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        return len(lines)
+
+    def remove(self, household_id: str) -> None:
+        """Drop a household from the archive (it is being promoted back to hot)."""
+        if household_id not in self._offsets:
+            return
+        line = self._encode({"household_id": household_id, "promoted": True})
+        with self.lock, self.archive_file_path.open("ab") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+            del self._offsets[household_id]
+            self._dead_lines += 2
+
+    def iter_households(self) -> Iterator[Household]:
+        """Every archived household, in one sequential pass over the file."""
+        if not self.archive_file_path.exists():
+            return
+        with self.archive_file_path.open("rb") as f:
+            offset = f.tell()
+            for line in iter(f.readline, b""):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    return
+                if self._offsets.get(record.get("household_id")) == offset:
+                    yield Household.from_dict(record)
+                offset = f.tell()
+
+    def compact(self) -> None:
+        """Rewrite the file without superseded lines and tombstones (atomic)."""
+        if not self._dead_lines:
+            return
+        with self.lock:
+            tmp_path = self.archive_file_path.with_name(self.archive_file_path.name + ".tmp")
+            offsets = {}
+            with self.archive_file_path.open("rb") as src, tmp_path.open("wb") as dst:
+                for h_id, offset in sorted(self._offsets.items(), key=lambda item: item[1]):
+                    src.seek(offset)
+                    offsets[h_id] = dst.tell()
+                    dst.write(src.readline())
+                dst.flush()
+                os.fsync(dst.fileno())
+            os.replace(tmp_path, self.archive_file_path)
+            self._offsets = offsets
+            self._dead_lines = 0
+
+    def dead_lines(self) -> int:
+        return self._dead_lines
+
+    def _encode(self, data: dict) -> bytes:
+        return (json.dumps(data, separators=(",", ":")) + "\n").encode("utf-8")
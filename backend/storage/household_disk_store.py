@@ -0,0 +1,150 @@
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable, Iterator
+from models.household import Household, unit_key
+
+
+class HouseholdDiskStore:
+    """
+    Disk-resident household registry for populations that do not fit in RAM.
+    One SQLite table keyed (B-tree indexed) by household_id, value = the same
+    JSON dict HouseholdStore writes, so a lookup touches one row only. The
+    address is copied into indexed columns so lookups by postal code / unit
+    do not need an in-memory index either.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def exists(self) -> bool:
+        return self.db_path.exists()
+
+    def open(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS households (household_id TEXT PRIMARY KEY, data TEXT NOT NULL, "
+            "postal_code TEXT, unit_key TEXT)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(households)")}
+        if "postal_code" not in columns:
+            self._add_address_columns()
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS households_by_address ON households (postal_code, unit_key)"
+        )
+        self._conn.commit()
+
+    def _add_address_columns(self) -> None:
+        """Upgrade a store written before the address columns existed."""
+        self._conn.execute("ALTER TABLE households ADD COLUMN postal_code TEXT")
+        self._conn.execute("ALTER TABLE households ADD COLUMN unit_key TEXT")
+        last_id = ""
+        while True:
+            rows = self._conn.execute(
+                "SELECT household_id, data FROM households WHERE household_id > ? "
+                "ORDER BY household_id LIMIT 1000",
+                (last_id,),
+            ).fetchall()
+            if not rows:
+                return
+            updates = []
+            for household_id, data in rows:
+                d = json.loads(data)
+                updates.append((d["postal_code"], unit_key(d["unit_number"]), household_id))
+            self._conn.executemany(
+                "UPDATE households SET postal_code = ?, unit_key = ? WHERE household_id = ?", updates
+            )
+            last_id = rows[-1][0]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get(self, household_id: str) -> Household:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM households WHERE household_id = ?", (household_id,)
+            ).fetchone()
+        return Household.from_dict(json.loads(row[0])) if row else None
+
+    def contains(self, household_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM households WHERE household_id = ?", (household_id,)
+            ).fetchone()
+        return row is not None
+
+    def save(self, household: Household) -> None:
+        """Save or update a single household."""
+        self.save_many([household])
+
+    def save_many(self, households: Iterable[Household]) -> None:
+        """Save or update several households in one transaction."""
+        rows = [
+            (h.household_id, json.dumps(h.to_dict()), h.postal_code, unit_key(h.unit_number))
+            for h in households
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO households (household_id, data, postal_code, unit_key) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def postal_code_of(self, household_id: str) -> str:
+        """A household's postal code from its address column, without decoding the record."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT postal_code FROM households WHERE household_id = ?", (household_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def ids_at_address(self, postal_code: str, unit_number: str = None) -> list[str]:
+        """IDs of the households at a postal code (optionally one unit), via the address index."""
+        with self._lock:
+            if unit_number:
+                rows = self._conn.execute(
+                    "SELECT household_id FROM households WHERE postal_code = ? AND unit_key = ?",
+                    (postal_code, unit_key(unit_number)),
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT household_id FROM households WHERE postal_code = ?", (postal_code,)
+                ).fetchall()
+        return [household_id for (household_id,) in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM households").fetchone()[0]
+
+    def iter_ids(self) -> Iterator[str]:
+        """Every household ID, without decoding the records."""
+        with self._lock:
+            rows = self._conn.execute("SELECT household_id FROM households").fetchall()
+        for (household_id,) in rows:
+            yield household_id
+
+    def iter_households(self, batch_size: int = 1000) -> Iterator[Household]:
+        """Yield every household in key order, batch_size rows at a time."""
+        last_id = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT household_id, data FROM households WHERE household_id > ? "
+                    "ORDER BY household_id LIMIT ?",
+                    (last_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for household_id, data in rows:
+                yield Household.from_dict(json.loads(data))
+            last_id = rows[-1][0]
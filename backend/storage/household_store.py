@@ -1,7 +1,38 @@
 import json
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Iterator
 from models.household import Household
 
+logger = logging.getLogger(__name__)
+
+# Files at least this big are parsed in parallel when workers > 1
+PARALLEL_THRESHOLD_BYTES = 64 * 1024 * 1024
+
+_WHITESPACE = re.compile(r"\s*")
+
+
+def _parse_byte_range(path: str, start: int, end: int, is_first: bool, is_last: bool) -> list[dict]:
+    """
+    Worker: parse the top-level entries between two entry boundaries of
+    households.json into a list of household dicts. Runs in a child process.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8").strip()
+    if is_first:
+        text = text[1:]  # opening "{"
+    if is_last:
+        text = text.rstrip()[:-1]  # closing "}"
+    text = text.strip().rstrip(",")
+    if not text:
+        return []
+    return list(json.loads("{" + text + "}").values())
+
 class HouseholdStore:
     """
     File-based storage for households using JSON.
@@ -9,6 +40,9 @@ class HouseholdStore:
 
     def __init__(self, household_file_path: Path):
         self.household_file_path = household_file_path
+        # Held for every write, so a snapshot can fingerprint the file and
+        # capture state without a write landing in between
+        self.lock = threading.RLock()
 
     def _load_data(self) -> dict:
         """Internal helper to read raw JSON safely."""
@@ -32,15 +66,138 @@ class HouseholdStore:
 
     def save(self, household: Household) -> None:
         """Save or update a single household."""
-        data = self._load_data()
-        # Store using ID as key for easy lookup
-        data[household.household_id] = household.to_dict()
-        self._save_data(data)
+        with self.lock:
+            data = self._load_data()
+            # Store using ID as key for easy lookup
+            data[household.household_id] = household.to_dict()
+            self._save_data(data)
+
+    def remove_many(self, household_ids) -> None:
+        """Delete several households in one rewrite of the file."""
+        with self.lock:
+            data = self._load_data()
+            for household_id in household_ids:
+                data.pop(household_id, None)
+            self._save_data(data)
 
     def load_all(self) -> list[Household]:
         """Load all households into memory (for bootstrapping)."""
-        data = self._load_data()
-        households = []
-        for h_data in data.values():
-            households.append(Household.from_dict(h_data))
-        return households
\ No newline at end of file
+        return list(self.iter_households())
+
+    def iter_households(self, workers: int = 1, chunk_size: int = 64 * 1024) -> Iterator[Household]:
+        """
+        Yield households one at a time without materialising the whole file.
+        Large files written by _save_data can be split across `workers` processes.
+        """
+        if not self.household_file_path.exists():
+            return
+        workers = min(workers, os.cpu_count() or 1)
+        if workers > 1 and self.household_file_path.stat().st_size >= PARALLEL_THRESHOLD_BYTES:
+            ranges = self._split_ranges(workers * 4)
+            if len(ranges) > 1:
+                yield from self._iter_parallel(ranges, workers)
+                return
+        yield from self._iter_streaming(chunk_size)
+
+    # --------------------------
+    # Incremental parsing
+    # --------------------------
+    def _iter_streaming(self, chunk_size: int) -> Iterator[Household]:
+        """
+        Walk the top-level {"id": {...}, ...} object with raw_decode, reading
+        chunk_size characters at a time; only one entry is held in memory.
+        """
+        decoder = json.JSONDecoder()
+        with self.household_file_path.open("r", encoding="utf-8") as f:
+            buf = ""
+            pos = 0
+            eof = False
+
+            def fill() -> bool:
+                # Drop what has been consumed and append the next chunk
+                nonlocal buf, pos, eof
+                if eof:
+                    return False
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    eof = True
+                    return False
+                buf = buf[pos:] + chunk
+                pos = 0
+                return True
+
+            def next_char() -> str:
+                # Skip whitespace, reading more input as needed ("" at end of file)
+                nonlocal pos
+                while True:
+                    pos = _WHITESPACE.match(buf, pos).end()
+                    if pos < len(buf):
+                        return buf[pos]
+                    if not fill():
+                        return ""
+
+            def decode():
+                # raw_decode the next value, reading more input until it is complete
+                nonlocal pos
+                while True:
+                    try:
+                        value, pos = decoder.raw_decode(buf, pos)
+                        return value
+                    except json.JSONDecodeError:
+                        if not fill():
+                            raise
+
+            try:
+                if next_char() != "{":
+                    return  # empty file
+                pos += 1
+                while True:
+                    c = next_char()
+                    if c in ("}", ""):
+                        return
+                    if c == ",":
+                        pos += 1
+                        continue
+                    decode()  # key
+                    if next_char() != ":":
+                        raise json.JSONDecodeError("Expecting ':'", buf, pos)
+                    pos += 1
+                    next_char()
+                    yield Household.from_dict(decode())
+            except json.JSONDecodeError as e:
+                logger.warning("Stopped reading %s: %s", self.household_file_path, e)
+
+    def _split_ranges(self, parts: int) -> list[tuple[int, int]]:
+        """
+        Byte ranges that each start on a top-level entry. _save_data writes
+        indent=4, so those are the lines starting with exactly 4 spaces and a quote.
+        """
+        size = self.household_file_path.stat().st_size
+        boundaries = [0]
+        with self.household_file_path.open("rb") as f:
+            for i in range(1, parts):
+                f.seek(max(size * i // parts, boundaries[-1]))
+                f.readline()  # skip the partial line
+                while True:
+                    pos = f.tell()
+                    line = f.readline()
+                    if not line:
+                        break
+                    if line.startswith(b'    "') and not line.startswith(b'     '):
+                        if pos > boundaries[-1]:
+                            boundaries.append(pos)
+                        break
+        boundaries.append(size)
+        return list(zip(boundaries[:-1], boundaries[1:]))
+
+    def _iter_parallel(self, ranges: list[tuple[int, int]], workers: int) -> Iterator[Household]:
+        path = str(self.household_file_path)
+        last = len(ranges) - 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_parse_byte_range, path, start, end, i == 0, i == last)
+                for i, (start, end) in enumerate(ranges)
+            ]
+            for future in futures:
+                for h_data in future.result():
+                    yield Household.from_dict(h_data)
\ No newline at end of file
@@ -0,0 +1,52 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Iterable
+
+
+class IdempotencyStore:
+    """
+    Append-only journal of cached responses, one compact JSON object per line:
+    {"key", "fingerprint", "status", "body", "mimetype", "expires_at"}.
+    Expired lines are dropped when the journal is rewritten.
+    """
+
+    def __init__(self, journal_path: Path):
+        self.journal_path = journal_path
+        self._lock = threading.Lock()
+
+    def load(self) -> list[dict]:
+        """Every journaled entry, oldest first (a torn last line is ignored)."""
+        if not self.journal_path.exists():
+            return []
+        entries = []
+        with self.journal_path.open("rb") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    break
+        return entries
+
+    def append(self, entry: dict) -> None:
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, self.journal_path.open("ab") as f:
+            f.write(self._encode(entry))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def rewrite(self, entries: Iterable[dict]) -> None:
+        """Atomically replace the journal with `entries`."""
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.journal_path.with_name(self.journal_path.name + ".tmp")
+        with self._lock:
+            with tmp_path.open("wb") as f:
+                for entry in entries:
+                    f.write(self._encode(entry))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.journal_path)
+
+    def _encode(self, entry: dict) -> bytes:
+        return (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
@@ -0,0 +1,67 @@
+import csv
+import os
+from pathlib import Path
+
+
+class LogIndexStore:
+    """
+    On-disk secondary index into the hourly redemption logs.
+    Each line maps a key (e.g. a Household ID) to one log row:
+        key,RedeemYYYYMMDDHH.csv,byte_offset
+
+    The file is append-only while the server runs and is held in memory as
+    key -> [(file, offset), ...] in log order, so a lookup costs O(results).
+    """
+
+    def __init__(self, index_file_path: Path):
+        self.index_file_path = index_file_path
+        self._entries: dict[str, list[tuple[str, int]]] = {}
+        self._last: tuple[str, int] = ("", -1)
+
+    def exists(self) -> bool:
+        return self.index_file_path.exists()
+
+    def load(self) -> None:
+        """Read the whole index file into memory."""
+        self._entries.clear()
+        self._last = ("", -1)
+        if not self.exists():
+            return
+        with self.index_file_path.open("r", newline="", encoding="utf-8") as f:
+            for row in csv.reader(f):
+                if len(row) != 3:
+                    continue  # torn last line after a crash
+                self._remember(row[0], row[1], int(row[2]))
+
+    def add(self, key: str, file_name: str, offset: int) -> None:
+        """Append one entry to the index file and to memory."""
+        self.index_file_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.index_file_path.open("a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow([key, file_name, offset])
+        self._remember(key, file_name, offset)
+
+    def rebuild(self, entries: list[tuple[str, str, int]]) -> None:
+        """Replace the index with `entries` (already in log order), written atomically."""
+        self.index_file_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_file_path.with_name(self.index_file_path.name + ".tmp")
+        with tmp_path.open("w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(entries)
+        os.replace(tmp_path, self.index_file_path)
+
+        self._entries.clear()
+        self._last = ("", -1)
+        for key, file_name, offset in entries:
+            self._remember(key, file_name, offset)
+
+    def lookup(self, key: str) -> list[tuple[str, int]]:
+        """All (file, offset) positions for `key`, oldest first (shared list: do not modify)."""
+        return self._entries.get(key, [])
+
+    def last_position(self) -> tuple[str, int]:
+        """Furthest (file, offset) covered by the index; ("", -1) when empty."""
+        return self._last
+
+    def _remember(self, key: str, file_name: str, offset: int) -> None:
+        self._entries.setdefault(key, []).append((file_name, offset))
+        if (file_name, offset) > self._last:
+            self._last = (file_name, offset)
@@ -1,4 +1,5 @@
 import csv
+import threading
 from pathlib import Path
 from typing import Iterable
 from models.merchant import Merchant
@@ -24,6 +25,7 @@ class MerchantStore:
 
     def __init__(self, merchant_file_path: Path):
         self.merchant_file_path = merchant_file_path
+        self.lock = threading.RLock()  # held for every write (see SnapshotService.save)
 
     def ensure_file_with_header(self) -> None:
         """Create file + header if not exists or empty."""
@@ -35,10 +37,11 @@ class MerchantStore:
 
     def append(self, merchant: Merchant) -> None:
         """Append one merchant record to Merchant.txt."""
-        self.ensure_file_with_header()
-        with self.merchant_file_path.open("a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(merchant.to_csv_row())
+        with self.lock:
+            self.ensure_file_with_header()
+            with self.merchant_file_path.open("a", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(merchant.to_csv_row())
 
     def load_all(self) -> list[Merchant]:
         """
@@ -1,6 +1,9 @@
 import csv
+import re
+import threading
 from datetime import datetime
 from pathlib import Path
+from typing import Callable, Iterator
 
 
 REDEEM_HEADER = [
@@ -15,15 +18,53 @@ REDEEM_HEADER = [
     "Remarks",
 ]
 
+REDEEM_FILE_GLOB = "Redeem" + "[0-9]" * 10 + ".csv"
+
+
+def parse_amount(value: str) -> int:
+    """Convert a logged money string such as '$10.00' back into whole dollars."""
+    return int(float((value or "0").strip().lstrip("$") or 0))
+
+
+def hour_of(path: Path) -> str:
+    """Return the YYYYMMDDHH part of a RedeemYYYYMMDDHH.csv file name."""
+    return path.stem[len("Redeem"):]
+
+
+def hour_bound(value: str, default_hour: str) -> str:
+    """
+    A query date (YYYYMMDD or YYYYMMDDHH) as an hour key; a bare date gets
+    `default_hour` ("00" for a lower bound, "23" for an upper one).
+    """
+    value = (value or "").strip()
+    if re.match(r"^\d{8}$", value):
+        return value + default_hour
+    if re.match(r"^\d{10}$", value):
+        return value
+    raise ValueError("Dates must be YYYYMMDD or YYYYMMDDHH.")
+
 
 class RedemptionStore:
     """
     Handles writing redemption logs to hourly CSV:
     RedeemYYYYMMDDHH.csv
+
+    Listeners registered with add_listener() are told the file name and byte
+    offset of every appended row, so secondary indexes can stay in sync.
+
+    `lock` is held by a redemption from its first appended row until every
+    aggregate has recorded it; a checkpoint that takes the log position under
+    the same lock never covers rows its aggregates have not counted yet.
     """
 
     def __init__(self, data_dir: Path):
         self.data_dir = data_dir
+        self._listeners: list[Callable[[str, int, list[str]], None]] = []
+        self.lock = threading.RLock()
+
+    def add_listener(self, listener: Callable[[str, int, list[str]], None]) -> None:
+        """Call listener(file_name, offset, row) after each append_row()."""
+        self._listeners.append(listener)
 
     def _file_path(self) -> Path:
         filename = f"Redeem{datetime.now().strftime('%Y%m%d%H')}.csv"
@@ -38,4 +79,58 @@ class RedemptionStore:
             writer = csv.writer(f)
             if need_header:
                 writer.writerow(REDEEM_HEADER)
-            writer.writerow(row)
\ No newline at end of file
+            f.flush()
+            offset = f.tell()
+            writer.writerow(row)
+
+        for listener in self._listeners:
+            listener(path.name, offset, row)
+
+    def current_hour(self) -> str:
+        """Hour key (YYYYMMDDHH) of the file currently being appended to."""
+        return datetime.now().strftime('%Y%m%d%H')
+
+    def list_log_files(self) -> list[Path]:
+        """All hourly redemption logs, oldest first (file names sort chronologically)."""
+        if not self.data_dir.exists():
+            return []
+        return sorted(self.data_dir.glob(REDEEM_FILE_GLOB))
+
+    def iter_rows(self, path: Path) -> Iterator[dict]:
+        """Yield every data row of one hourly log as a dict keyed by REDEEM_HEADER."""
+        with path.open("r", newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield row
+
+    def iter_rows_with_offsets(self, path: Path, start: int = 0) -> Iterator[tuple[int, dict]]:
+        """
+        Yield (byte_offset, row) for every data row at or after `start`.
+        The offset points at the beginning of the row's line, so it can be
+        stored in an index and handed back to read_row_at().
+        """
+        with path.open("rb") as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                line_offset = offset
+                offset += len(line)
+                values = next(csv.reader([line.decode("utf-8")]), [])
+                if not values or values == REDEEM_HEADER:
+                    continue
+                yield line_offset, dict(zip(REDEEM_HEADER, values))
+
+    def read_row_at(self, path: Path, offset: int) -> dict:
+        """Read the single row starting at `offset` (as produced by iter_rows_with_offsets)."""
+        with path.open("rb") as f:
+            f.seek(offset)
+            line = f.readline()
+        values = next(csv.reader([line.decode("utf-8")]), [])
+        return dict(zip(REDEEM_HEADER, values))
+
+    def end_of_row(self, path: Path, offset: int) -> int:
+        """Byte offset just past the row starting at `offset`, i.e. where the next row starts."""
+        with path.open("rb") as f:
+            f.seek(offset)
+            f.readline()
+            return f.tell()
@@ -0,0 +1,72 @@
+import os
+import pickle
+from contextlib import ExitStack
+from pathlib import Path
+
+SNAPSHOT_MAGIC = b"CDCSNAP"
+SNAPSHOT_VERSION = 2
+
+
+class SnapshotStore:
+    """
+    Binary (pickle) snapshot of in-memory service state, for fast restarts.
+
+    File layout: MAGIC + 2-byte version + pickle({"sources": ..., "state": ...}).
+    "sources" records (mtime_ns, size) of every text file the state was built
+    from; if any of them changed since, the snapshot is treated as stale.
+    """
+
+    def __init__(self, snapshot_path: Path, source_paths: list[Path], source_locks: list = ()):
+        self.snapshot_path = snapshot_path
+        self.source_paths = source_paths
+        self.source_locks = list(source_locks)
+
+    def locked(self) -> ExitStack:
+        """Context manager holding every source file's write lock."""
+        stack = ExitStack()
+        for lock in self.source_locks:
+            stack.enter_context(lock)
+        return stack
+
+    def fingerprint(self) -> dict:
+        result = {}
+        for path in self.source_paths:
+            if path.exists():
+                stat = path.stat()
+                result[path.name] = [stat.st_mtime_ns, stat.st_size]
+            else:
+                result[path.name] = None
+        return result
+
+    def save(self, state: dict, sources: dict) -> None:
+        """
+        Write the snapshot atomically (temp file + rename). `sources` must be
+        fingerprint() taken before `state` was captured: a write after that
+        then makes the snapshot stale instead of passing for current.
+        """
+        payload = {"sources": sources, "state": state}
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        with tmp_path.open("wb") as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(SNAPSHOT_VERSION.to_bytes(2, "big"))
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.snapshot_path)
+
+    def load(self) -> dict:
+        """Return the saved state, or None if missing, unreadable, another version, or stale."""
+        if not self.snapshot_path.exists():
+            return None
+        try:
+            with self.snapshot_path.open("rb") as f:
+                if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                    return None
+                if int.from_bytes(f.read(2), "big") != SNAPSHOT_VERSION:
+                    return None
+                payload = pickle.load(f)
+        except Exception:
+            return None
+
+        if payload.get("sources") != self.fingerprint():
+            return None
+        return payload.get("state")
@@ -0,0 +1,62 @@
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+
+class TrancheStore:
+    """
+    Ledger of voucher tranches granted after registration, one compact JSON
+    object per line: {"household_id", "tranche_id", "vouchers", "granted_at"}.
+    Append-only; reconciliation adds these grants to the initial allocation.
+    """
+
+    def __init__(self, ledger_path: Path):
+        self.ledger_path = ledger_path
+        self._granted: dict[str, dict[str, dict[str, int]]] = {}  # household -> tranche -> vouchers
+        self.lock = threading.Lock()
+
+    def load(self) -> None:
+        self._granted.clear()
+        for grant in self.iter_grants():
+            self._granted.setdefault(grant["household_id"], {})[grant["tranche_id"]] = grant["vouchers"]
+
+    def iter_grants(self):
+        """Every recorded grant, oldest first (a torn last line is ignored)."""
+        if not self.ledger_path.exists():
+            return
+        with self.ledger_path.open("rb") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    return
+
+    def has(self, household_id: str, tranche_id: str) -> bool:
+        return tranche_id in self._granted.get(household_id, {})
+
+    def record(self, household_id: str, tranche_id: str, vouchers: dict[str, int]) -> None:
+        """Append one grant and fsync it before the wallet is credited."""
+        grant = {
+            "household_id": household_id,
+            "tranche_id": tranche_id,
+            "vouchers": vouchers,
+            "granted_at": datetime.now().isoformat(),
+        }
+        self.ledger_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.lock, self.ledger_path.open("ab") as f:
+            f.write((json.dumps(grant, separators=(",", ":")) + "\n").encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+            self._granted.setdefault(household_id, {})[tranche_id] = dict(vouchers)
+
+    def granted_vouchers(self) -> dict[str, dict[str, int]]:
+        """household_id -> {denomination: quantity} summed over every recorded tranche."""
+        totals: dict[str, dict[str, int]] = {}
+        for household_id, tranches in self._granted.items():
+            wallet = totals.setdefault(household_id, {})
+            for vouchers in tranches.values():
+                for denom, qty in vouchers.items():
+                    wallet[denom] = wallet.get(denom, 0) + int(qty)
+        return totals
@@ -0,0 +1,208 @@
+"""
+Simple integration-style tests for the audit lookup index.
+
+How to run (from backend/ directory):
+  python -m tests.test_audit
+
+This script tests 4 cases:
+1) Transactions and voucher codes are found across several hour files
+2) The index survives a restart and picks up rows written after it was saved
+3) Unknown and malformed IDs are handled
+4) Concurrent redemptions log their TX IDs in increasing order, so every
+   one of them is found (a TX taken before the log lock could land late)
+"""
+
+from pathlib import Path
+import shutil
+import threading
+
+from storage.bankcode_store import BankCodeStore
+from storage.merchant_store import MerchantStore
+from storage.household_store import HouseholdStore
+from storage.counter_store import CounterStore
+from storage.redemption_store import RedemptionStore, REDEEM_HEADER
+from storage.audit_index_store import AuditIndexStore
+from services.merchant_service import MerchantService
+from services.household_service import HouseholdService
+from services.redemption_service import RedemptionService
+from services.audit_service import AuditService
+
+
+def _assert_true(cond: bool, msg: str) -> None:
+    if not cond:
+        raise AssertionError(msg)
+
+
+def _new_case_dir(case_name: str) -> Path:
+    """
+    Create an isolated temp dir with three hourly logs:
+    TX1001..TX1100 (two notes each), numbered in order like CounterStore does.
+    """
+    root = Path(__file__).resolve().parent / "_tmp_audit"
+    case_dir = root / case_name
+    if case_dir.exists():
+        shutil.rmtree(case_dir)
+    case_dir.mkdir(parents=True, exist_ok=True)
+
+    tx, v = 1000, 0
+    for hour in ["2026010109", "2026010110", "2026010111"]:
+        lines = [",".join(REDEEM_HEADER)]
+        for _ in range(34):
+            tx += 1
+            for remark in ("1", "Final denomination used"):
+                v += 1
+                lines.append(f"TX{tx},H52298800781,M0001,{hour}0000,V{v:07d},$2.00,$4.00,Completed,{remark}")
+        (case_dir / f"Redeem{hour}.csv").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return case_dir
+
+
+def _cleanup_all() -> None:
+    root = Path(__file__).resolve().parent / "_tmp_audit"
+    if root.exists():
+        shutil.rmtree(root)
+
+
+def _make_service(tmp_dir: Path) -> AuditService:
+    service = AuditService(RedemptionStore(tmp_dir), AuditIndexStore(tmp_dir / "audit_index.json"), sample_every=8)
+    service.bootstrap()
+    return service
+
+
+def test_lookups_across_files() -> None:
+    tmp_dir = _new_case_dir("lookups")
+    service = _make_service(tmp_dir)
+
+    for tx in (1001, 1034, 1035, 1060, 1102):
+        result = service.find_transaction(f"TX{tx}")
+        _assert_true(result is not None and len(result["rows"]) == 2, f"TX{tx} should have 2 rows")
+        _assert_true(all(r["Transaction_ID"] == f"TX{tx}" for r in result["rows"]), f"rows should belong to TX{tx}")
+
+    voucher = service.find_voucher("V0000069")
+    _assert_true(voucher is not None and voucher["row"]["Transaction_ID"] == "TX1035", "V0000069 belongs to TX1035")
+    _assert_true(voucher["file"] == "Redeem2026010110.csv", "V0000069 is in the second hour file")
+
+
+def test_restart_picks_up_new_rows() -> None:
+    tmp_dir = _new_case_dir("restart")
+    service = _make_service(tmp_dir)
+    service.save()
+
+    # Rows appended after the index was saved (e.g. the server crashed)
+    with (tmp_dir / "Redeem2026010111.csv").open("a", encoding="utf-8") as f:
+        f.write("TX1103,H52298800781,M0001,20260101110000,V0000205,$5.00,$5.00,Completed,Final denomination used\n")
+
+    restarted = _make_service(tmp_dir)
+    _assert_true(restarted.find_transaction("TX1103") is not None, "row written after the save should be indexed")
+    _assert_true(restarted.find_voucher("V0000205")["row"]["Denomination_Used"] == "$5.00", "voucher row should be returned")
+
+
+def test_unknown_and_malformed() -> None:
+    tmp_dir = _new_case_dir("unknown")
+    service = _make_service(tmp_dir)
+
+    _assert_true(service.find_transaction("TX999") is None, "TX below the first logged ID should not be found")
+    _assert_true(service.find_transaction("TX5000") is None, "TX above the last logged ID should not be found")
+    _assert_true(service.find_voucher("V0000000") is None, "V0000000 was never issued")
+    try:
+        service.find_transaction("1001")
+        raise AssertionError("Expected ValueError for malformed transaction ID.")
+    except ValueError as e:
+        _assert_true("Invalid transaction ID" in str(e), "Error message should mention invalid transaction ID.")
+
+
+class _SlowFirstCounter(CounterStore):
+    """CounterStore whose first TX allocation stalls after taking its number."""
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self.allocated, self.release = threading.Event(), threading.Event()
+
+    def next_transaction_id(self) -> str:
+        tx_id = super().next_transaction_id()
+        if not self.allocated.is_set():
+            self.allocated.set()
+            self.release.wait(5)
+        return tx_id
+
+
+def test_concurrent_redemptions_stay_ordered() -> None:
+    root = Path(__file__).resolve().parent / "_tmp_audit" / "concurrent"
+    if root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True)
+
+    bank_store = BankCodeStore(Path(__file__).resolve().parents[1] / "storage" / "data" / "BankCode.csv")
+    bank_store.load()
+    household_store = HouseholdStore(root / "households.json")
+    redemption_store = RedemptionStore(root)
+    merchant_service = MerchantService(MerchantStore(root / "Merchant.txt"), bank_store)
+    household_service = HouseholdService(household_store)
+    counter_store = _SlowFirstCounter(root / "counters.json")
+    audit = AuditService(redemption_store, AuditIndexStore(root / "audit_index.json"), sample_every=1)
+    audit.bootstrap()
+    redemption_service = RedemptionService(
+        household_service=household_service,
+        household_store=household_store,
+        merchant_service=merchant_service,
+        counter_store=counter_store,
+        redemption_store=redemption_store,
+        pending_codes={},
+    )
+    household = household_service.register_household("H52298800781", "560123", "#06-03")
+    merchant = merchant_service.register_merchant({
+        "merchant_name": "ABC Minimart",
+        "uen": "201234567A",
+        "bank_name": "DBS Bank Ltd",
+        "bank_code": "7171",
+        "branch_code": "001",
+        "account_number": "123-456-789",
+        "account_holder_name": "ABC Minimart Pte Ltd",
+    })
+    codes = [redemption_service.generate_code(household.household_id, {"2": 1}) for _ in range(3)]
+
+    def redeem(code):
+        redemption_service.redeem(merchant_id=merchant.merchant_id, code=code)
+
+    first = threading.Thread(target=redeem, args=(codes[0],))
+    first.start()
+    _assert_true(counter_store.allocated.wait(5), "the first redemption should have taken its TX ID")
+    others = [threading.Thread(target=redeem, args=(code,)) for code in codes[1:]]
+    for t in others:
+        t.start()
+    for t in others:
+        t.join(0.2)  # without the log lock around allocation they would log first
+    counter_store.release.set()
+    for t in [first] + others:
+        t.join()
+
+    logged = [row["Transaction_ID"] for path in redemption_store.list_log_files() for row in redemption_store.iter_rows(path)]
+    _assert_true(logged == sorted(logged), f"TX IDs should be logged in increasing order: {logged}")
+    for tx_id in logged:
+        _assert_true(audit.find_transaction(tx_id) is not None, f"{tx_id} should be found")
+
+
+def main() -> None:
+    _cleanup_all()
+
+    tests = [
+        ("lookups across files", test_lookups_across_files),
+        ("restart picks up new rows", test_restart_picks_up_new_rows),
+        ("unknown and malformed IDs", test_unknown_and_malformed),
+        ("concurrent redemptions stay ordered", test_concurrent_redemptions_stay_ordered),
+    ]
+
+    passed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {name}: {e}")
+
+    _cleanup_all()
+    print(f"\nResult: {passed}/{len(tests)} tests passed.")
+
+
+if __name__ == "__main__":
+    main()
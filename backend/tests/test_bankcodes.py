@@ -0,0 +1,108 @@
+"""
+Simple tests for the bank code catalogue served over the API.
+
+How to run (from backend/ directory):
+  python -m tests.test_bankcodes
+
+This script tests 3 cases:
+1) The catalogue groups branches under their bank and has a stable ETag
+2) Editing BankCode.csv reloads the catalogue and the valid pairs (new ETag)
+3) After a snapshot restore (pairs only) the catalogue is read from the CSV
+"""
+
+from pathlib import Path
+import os
+import shutil
+
+from storage.bankcode_store import BankCodeStore
+
+HEADER = "Bank_Code,Bank_Name,Branch_Code,Branch_Name,SWIFT_Code,Remarks\n"
+
+
+def _assert_true(cond: bool, msg: str) -> None:
+    if not cond:
+        raise AssertionError(msg)
+
+
+def _new_case_dir(case_name: str) -> Path:
+    """Create an isolated temp dir for a single test case."""
+    root = Path(__file__).resolve().parent / "_tmp_bankcodes"
+    case_dir = root / case_name
+    if case_dir.exists():
+        shutil.rmtree(case_dir)
+    case_dir.mkdir(parents=True, exist_ok=True)
+    return case_dir
+
+
+def _cleanup_all() -> None:
+    root = Path(__file__).resolve().parent / "_tmp_bankcodes"
+    if root.exists():
+        shutil.rmtree(root)
+
+
+def test_catalogue_groups_branches_by_bank() -> None:
+    path = _new_case_dir("catalogue") / "BankCode.csv"
+    path.write_text(HEADER + "7171,DBS Bank Ltd,001,Main Branch,DBSSSGSG,FAST\n"
+                             "7171,DBS Bank Ltd,002,Jurong,DBSSSGSG,FAST\n", encoding="utf-8")
+    store = BankCodeStore(path)
+    store.load()
+
+    catalogue, etag = store.catalogue()
+    _assert_true(len(catalogue["banks"]) == 1, f"expected one bank, got {catalogue['banks']}")
+    branches = [b["branch_code"] for b in catalogue["banks"][0]["branches"]]
+    _assert_true(branches == ["001", "002"], f"unexpected branches: {branches}")
+    _assert_true(catalogue["banks"][0]["swift_code"] == "DBSSSGSG", "bank should carry its SWIFT code")
+    _assert_true(store.catalogue()[1] == etag, "ETag should not change while the CSV is unchanged")
+
+
+def test_hot_reload_when_csv_changes() -> None:
+    path = _new_case_dir("hot_reload") / "BankCode.csv"
+    path.write_text(HEADER + "7171,DBS Bank Ltd,001,Main Branch,DBSSSGSG,FAST\n", encoding="utf-8")
+    store = BankCodeStore(path)
+    store.load()
+    _, etag = store.catalogue()
+
+    path.write_text(HEADER + "7339,OCBC Bank,501,Tampines Branch,OCBCSGSG,FAST\n", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    catalogue, new_etag = store.catalogue()
+    _assert_true(new_etag != etag, "ETag should change when the CSV changes")
+    _assert_true(catalogue["banks"][0]["bank_code"] == "7339", "catalogue should be reloaded from the CSV")
+    _assert_true(store.is_valid("7339", "501") and not store.is_valid("7171", "001"),
+                 "valid bank/branch pairs should be reloaded too")
+
+
+def test_catalogue_after_snapshot_restore_reads_csv() -> None:
+    path = _new_case_dir("snapshot_restore") / "BankCode.csv"
+    path.write_text(HEADER + "7171,DBS Bank Ltd,001,Main Branch,DBSSSGSG,FAST\n", encoding="utf-8")
+    store = BankCodeStore(path)
+    store.restore_pairs({("7171", "001")})
+    _assert_true(store.catalogue()[0]["banks"][0]["bank_name"] == "DBS Bank Ltd",
+                 "catalogue should be read from the CSV after a pairs-only restore")
+
+
+def main() -> None:
+    _cleanup_all()
+
+    tests = [
+        ("catalogue groups branches by bank", test_catalogue_groups_branches_by_bank),
+        ("hot reload when CSV changes", test_hot_reload_when_csv_changes),
+        ("catalogue after snapshot restore", test_catalogue_after_snapshot_restore_reads_csv),
+    ]
+
+    passed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {name}: {e}")
+
+    _cleanup_all()
+    print(f"\nResult: {passed}/{len(tests)} tests passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Simple unit-style tests for the Bloom filters in front of ID lookups.
+
+How to run (from backend/ directory):
+  python -m tests.test_bloom_filter
+
+This script tests 5 cases:
+1) Every added ID is reported as possibly present (no false negatives)
+2) The false-positive rate stays near the configured target
+3) Household lookups reject unknown IDs, and the filter grows past its capacity
+4) Merchant lookups go through the filter too
+5) Non-string IDs (e.g. a JSON number) are unknown, not a crash
+"""
+
+from services.bloom_filter import BloomFilter
+from services.household_service import HouseholdService
+from services.merchant_service import MerchantService
+
+
+class _NullStore:
+    def save(self, item):
+        pass
+
+
+def _assert_true(cond: bool, msg: str) -> None:
+    if not cond:
+        raise AssertionError(msg)
+
+
+def test_bloom_filter_has_no_false_negatives() -> None:
+    bloom = BloomFilter(1000)
+    ids = [f"H{i:011d}" for i in range(1000)]
+    for h_id in ids:
+        bloom.add(h_id)
+    _assert_true(all(bloom.might_contain(h_id) for h_id in ids), "an added ID must never be rejected")
+
+
+def test_bloom_filter_false_positive_rate_stays_near_target() -> None:
+    bloom = BloomFilter(5000, false_positive_rate=0.01)
+    for i in range(5000):
+        bloom.add(f"H{i:011d}")
+    hits = sum(bloom.might_contain(f"X{i:011d}") for i in range(10000))
+    _assert_true(hits < 300, f"too many false positives: {hits} / 10000")
+    _assert_true(bloom.metrics()["rejected"] == 10000 - hits, "every miss should be counted as rejected")
+
+
+def test_household_lookup_rejects_unknown_ids_and_grows() -> None:
+    service = HouseholdService(_NullStore())
+    service.register_household("H52298800781", "123456", "#01-01")
+    _assert_true(service.get_household("H52298800781") is not None, "registered household should be found")
+    _assert_true(service.get_household("H00000000000") is None, "unknown household should not be found")
+    _assert_true(service.id_filter.metrics()["checks"] >= 2, "lookups should go through the filter")
+
+    # Filter is rebuilt bigger once it holds more than its capacity
+    capacity = service.id_filter.capacity
+    service.id_filter.count = capacity
+    service.register_household("H52298800782", "123456", "#01-02")
+    _assert_true(service.id_filter.capacity >= capacity, "filter should not shrink when rebuilt")
+    _assert_true(service.get_household("H52298800781") is not None, "rebuilt filter should keep old IDs")
+    _assert_true(service.get_household("H52298800782") is not None, "rebuilt filter should hold the new ID")
+
+
+def test_merchant_lookup_uses_filter() -> None:
+    service = MerchantService(_NullStore(), None)
+    _assert_true(service.get_merchant("M0001") is None, "unknown merchant should not be found")
+    _assert_true(service.id_filter.metrics()["rejected"] == 1, "the filter should have rejected the lookup")
+
+
+def test_non_string_ids_are_not_found() -> None:
+    households = HouseholdService(_NullStore())
+    households.register_household("H52298800781", "123456", "#01-01")
+    merchants = MerchantService(_NullStore(), None)
+    checks = households.id_filter.metrics()["checks"]
+    for bad_id in (123, 5.0, True, None, ["H52298800781"], {"id": "H52298800781"}):
+        _assert_true(households.get_household(bad_id) is None, f"household ID {bad_id!r} should not be found")
+        _assert_true(merchants.get_merchant(bad_id) is None, f"merchant ID {bad_id!r} should not be found")
+    _assert_true(households.id_filter.metrics()["checks"] == checks, "non-string IDs should not reach the filter")
+
+
+def main() -> None:
+    tests = [
+        ("no false negatives", test_bloom_filter_has_no_false_negatives),
+        ("false-positive rate near target", test_bloom_filter_false_positive_rate_stays_near_target),
+        ("household lookup rejects unknown IDs and grows", test_household_lookup_rejects_unknown_ids_and_grows),
+        ("merchant lookup uses filter", test_merchant_lookup_uses_filter),
+        ("non-string IDs are not found", test_non_string_ids_are_not_found),
+    ]
+
+    passed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {name}: {e}")
+
+    print(f"\nResult: {passed}/{len(tests)} tests passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Simple integration-style tests for the postal-sector redemption heat map.
+
+How to run (from backend/ directory):
+  python -m tests.test_district_stats
+
+This script tests 4 cases:
+1) redeem() updates the sector x hour cell and the merchant breakdown
+2) A first start without checkpoint backfills from the logs (parallel workers),
+   without counting the lookups in the household ID filter metrics
+3) A restart replays only the log tail after the checkpoint
+4) Hours past the retention are rolled up into day buckets at checkpoint,
+   still counted for whole-day ranges and kept across a restart
+"""
+
+from pathlib import Path
+import shutil
+from datetime import datetime, timedelta
+
+from storage.bankcode_store import BankCodeStore
+from storage.merchant_store import MerchantStore
+from storage.household_store import HouseholdStore
+from storage.counter_store import CounterStore
+from storage.redemption_store import RedemptionStore
+from storage.checkpoint_store import CheckpointStore
+
+from services.merchant_service import MerchantService
+from services.household_service import HouseholdService
+from services.redemption_service import RedemptionService
+from services.district_stats_service import DistrictStatsService
+
+
+def _assert_true(cond: bool, msg: str) -> None:
+    if not cond:
+        raise AssertionError(msg)
+
+
+def _new_case_dir(case_name: str) -> Path:
+    """Create an isolated temp dir for a single test case."""
+    root = Path(__file__).resolve().parent / "_tmp_district_stats"
+    case_dir = root / case_name
+    if case_dir.exists():
+        shutil.rmtree(case_dir)
+    case_dir.mkdir(parents=True, exist_ok=True)
+    return case_dir
+
+
+def _cleanup_all() -> None:
+    root = Path(__file__).resolve().parent / "_tmp_district_stats"
+    if root.exists():
+        shutil.rmtree(root)
+
+
+def _make_env(tmp_dir: Path):
+    """Build stores/services like app.py; returns (redemption_service, district_stats, households, merchant)."""
+    base_dir = Path(__file__).resolve().parents[1]
+    bank_store = BankCodeStore(base_dir / "storage" / "data" / "BankCode.csv")
+    bank_store.load()
+
+    household_store = HouseholdStore(tmp_dir / "households.json")
+    redemption_store = RedemptionStore(tmp_dir)
+
+    merchant_service = MerchantService(MerchantStore(tmp_dir / "Merchant.txt"), bank_store)
+    household_service = HouseholdService(household_store)
+    district_stats = DistrictStatsService(
+        redemption_store, household_service, CheckpointStore(tmp_dir / "district_checkpoint.json")
+    )
+    district_stats.bootstrap()
+
+    redemption_service = RedemptionService(
+        household_service=household_service,
+        household_store=household_store,
+        merchant_service=merchant_service,
+        counter_store=CounterStore(tmp_dir / "counters.json"),
+        redemption_store=redemption_store,
+        pending_codes={},
+        district_stats_service=district_stats,
+    )
+
+    households = [
+        household_service.register_household("H52298800781", "560123", "#06-03"),
+        household_service.register_household("H52298800782", "119999", "#02-01"),
+    ]
+    merchant = merchant_service.register_merchant({
+        "merchant_name": "ABC Minimart",
+        "uen": "201234567A",
+        "bank_name": "DBS Bank Ltd",
+        "bank_code": "7171",
+        "branch_code": "001",
+        "account_number": "123-456-789",
+        "account_holder_name": "ABC Minimart Pte Ltd",
+    })
+    return redemption_service, district_stats, households, merchant
+
+
+def _redeem(redemption_service, household, merchant, vouchers: dict) -> None:
+    code = redemption_service.generate_code(household.household_id, vouchers)
+    redemption_service.redeem(merchant_id=merchant.merchant_id, code=code)
+
+
+def _restart(redemption_service, tmp_dir: Path, workers: int = 1) -> DistrictStatsService:
+    restarted = DistrictStatsService(
+        redemption_service.redemption_store,
+        redemption_service.household_service,
+        CheckpointStore(tmp_dir / "district_checkpoint.json"),
+        workers=workers,
+    )
+    restarted.bootstrap()
+    return restarted
+
+
+def test_redeem_updates_heat_map() -> None:
+    tmp_dir = _new_case_dir("live")
+    redemption_service, district_stats, households, merchant = _make_env(tmp_dir)
+
+    _redeem(redemption_service, households[0], merchant, {"10": 1, "5": 2})
+    _redeem(redemption_service, households[1], merchant, {"2": 1})
+
+    result = district_stats.heat_map()
+    hour = datetime.now().strftime("%Y%m%d%H")
+    _assert_true(result["hours"][hour]["56"] == {"count": 1, "amount": 20}, f"unexpected cell: {result['hours']}")
+    _assert_true(result["sectors"]["11"]["merchants"][merchant.merchant_id]["amount"] == 2, "merchant breakdown missing")
+    _assert_true(district_stats.heat_map(date_to="20000101")["hours"] == {}, "date filter should apply")
+
+
+def test_backfill_without_checkpoint() -> None:
+    tmp_dir = _new_case_dir("backfill")
+    redemption_service, _, households, merchant = _make_env(tmp_dir)
+
+    _redeem(redemption_service, households[0], merchant, {"5": 1})
+    _redeem(redemption_service, households[0], merchant, {"5": 1})
+    (tmp_dir / "district_checkpoint.json").unlink()
+    id_filter = redemption_service.household_service.id_filter
+    checks = id_filter.metrics()["checks"]
+
+    restarted = _restart(redemption_service, tmp_dir, workers=2)
+    sector = restarted.heat_map()["sectors"]["56"]
+    _assert_true(sector["count"] == 2 and sector["amount"] == 10, f"unexpected sector totals after backfill: {sector}")
+    _assert_true(id_filter.metrics()["checks"] == checks, "the backfill should not go through the ID filter")
+
+
+def test_restart_replays_log_tail() -> None:
+    tmp_dir = _new_case_dir("checkpoint")
+    redemption_service, district_stats, households, merchant = _make_env(tmp_dir)
+
+    _redeem(redemption_service, households[0], merchant, {"10": 1})
+    district_stats.checkpoint()
+    _redeem(redemption_service, households[1], merchant, {"2": 3})  # only in the log tail
+
+    restarted = _restart(redemption_service, tmp_dir)
+    sectors = restarted.heat_map()["sectors"]
+    _assert_true(sectors["56"]["amount"] == 10 and sectors["11"]["amount"] == 6, f"unexpected sectors: {sectors}")
+    _assert_true(sectors["56"]["count"] == 1, "checkpointed transaction should not be counted twice")
+
+
+def test_old_hours_roll_up_into_days() -> None:
+    tmp_dir = _new_case_dir("roll_up")
+    redemption_service, district_stats, households, merchant = _make_env(tmp_dir)
+
+    old = datetime.now() - timedelta(days=district_stats.hourly_retention_days + 5)
+    district_stats.record("560123", merchant.merchant_id, 7, old)
+    district_stats.record("560123", merchant.merchant_id, 3, old + timedelta(hours=1))
+    _redeem(redemption_service, households[0], merchant, {"10": 1})
+    district_stats.checkpoint()
+
+    day = old.strftime("%Y%m%d")
+    result = district_stats.heat_map()
+    _assert_true(not any(hour.startswith(day) for hour in district_stats.hours), "old hours should be rolled up")
+    _assert_true(result["days"][day]["56"] == {"count": 2, "amount": 10}, f"unexpected day bucket: {result['days']}")
+    _assert_true(result["sectors"]["56"]["amount"] == 20, "day buckets should count towards sector totals")
+    _assert_true(district_stats.heat_map(date_from=day, date_to=day)["days"] == {day: {"56": {"count": 2, "amount": 10}}}, "a whole-day range should include the day")
+    _assert_true(district_stats.heat_map(date_from=day + "05", date_to=day + "06")["days"] == {}, "a partial-day range cannot use a rolled-up day")
+
+    restarted = _restart(redemption_service, tmp_dir)
+    _assert_true(restarted.heat_map()["days"] == result["days"], "rolled-up days should survive a restart")
+    _assert_true(restarted.heat_map()["sectors"]["56"]["amount"] == 20, "a restart should not count anything twice")
+
+
+def main() -> None:
+    _cleanup_all()
+
+    tests = [
+        ("redeem updates heat map", test_redeem_updates_heat_map),
+        ("backfill without checkpoint", test_backfill_without_checkpoint),
+        ("restart replays log tail", test_restart_replays_log_tail),
+        ("old hours roll up into days", test_old_hours_roll_up_into_days),
+    ]
+
+    passed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {name}: {e}")
+
+    _cleanup_all()
+    print(f"\nResult: {passed}/{len(tests)} tests passed.")
+
+
+if __name__ == "__main__":
+    main()
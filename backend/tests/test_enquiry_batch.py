@@ -0,0 +1,72 @@
+"""
+Simple unit-style tests for batch enquiries.
+
+How to run (from backend/ directory):
+  python -m tests.test_enquiry_batch
+
+This script tests 2 cases:
+1) Results come back in request order, unknown or malformed IDs as not_found
+2) A batch larger than MAX_ENQUIRY_BATCH_SIZE is rejected up front
+"""
+
+from storage.household_store import HouseholdStore
+from services.household_service import HouseholdService, MAX_ENQUIRY_BATCH_SIZE
+
+
+class _NullStore(HouseholdStore):
+    def __init__(self):
+        super().__init__(None)
+
+    def save(self, household):
+        pass
+
+
+def _assert_true(cond: bool, msg: str) -> None:
+    if not cond:
+        raise AssertionError(msg)
+
+
+def test_enquire_many_keeps_request_order() -> None:
+    service = HouseholdService(_NullStore())
+    service.register_household("H52298800781", "560123", "#06-01")
+    service.register_household("H52298800782", "560123", "#06-02")
+
+    results = list(service.enquire_many(["H52298800782", "H00000000000", "H52298800781", 42]))
+
+    ids = [r["household_id"] for r in results]
+    _assert_true(ids == ["H52298800782", "H00000000000", "H52298800781", 42], f"results out of request order: {ids}")
+    statuses = [r["status"] for r in results]
+    _assert_true(statuses == ["success", "not_found", "success", "not_found"], f"unexpected statuses: {statuses}")
+    _assert_true(results[0]["balance"] == service.get_household("H52298800782").balance, "result should carry the balance")
+    _assert_true(results[0]["version"] == 1, "result should carry the wallet version")
+
+
+def test_enquire_many_rejects_oversized_batch() -> None:
+    service = HouseholdService(_NullStore())
+    try:
+        service.enquire_many(["H52298800781"] * (MAX_ENQUIRY_BATCH_SIZE + 1))
+        raise AssertionError("oversized batch should be rejected")
+    except ValueError as e:
+        _assert_true(str(MAX_ENQUIRY_BATCH_SIZE) in str(e), f"error should state the limit: {e}")
+
+
+def main() -> None:
+    tests = [
+        ("enquire many keeps request order", test_enquire_many_keeps_request_order),
+        ("enquire many rejects oversized batch", test_enquire_many_rejects_oversized_batch),
+    ]
+
+    passed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {name}: {e}")
+
+    print(f"\nResult: {passed}/{len(tests)} tests passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Simple unit-style tests for household event streams (server-sent events).
+
+How to run (from backend/ directory):
+  python -m tests.test_events
+
+This script tests 2 cases:
+1) A published event reaches only the subscribers of that household
+2) A subscriber that falls too far behind is closed, and can unsubscribe
+"""
+
+import json
+
+from services.event_service import EventService, SUBSCRIBER_QUEUE_SIZE
+
+
+def _assert_true(cond: bool, msg: str) -> None:
+    if not cond:
+        raise AssertionError(msg)
+
+
+def _parse(message: str) -> tuple[str, dict]:
+    fields = dict(line.split(": ", 1) for line in message.strip().splitlines())
+    return fields["event"], json.loads(fields["data"])
+
+
+def test_publish_reaches_only_that_household() -> None:
+    events = EventService()
+    mine = events.subscribe("H52298800781")
+    other = events.subscribe("H52298800782")
+
+    events.publish("H52298800781", "wallet", {"balance": 760})
+
+    _assert_true(_parse(mine.next(timeout=1)) == ("wallet", {"balance": 760}), "the household should get its event")
+    _assert_true(other.next(timeout=0.01) is None, "another household must not get the event")
+
+
+def test_unsubscribe_and_slow_subscriber() -> None:
+    events = EventService()
+    sub = events.subscribe("H52298800781")
+    for i in range(SUBSCRIBER_QUEUE_SIZE + 1):
+        events.publish("H52298800781", "wallet", {"balance": i})
+    _assert_true(sub.closed, "a subscriber that falls too far behind should be closed")
+
+    events.unsubscribe("H52298800781", sub)
+    _assert_true(events.subscriber_count() == 0, "unsubscribe should drop the subscriber")
+
+
+def main() -> None:
+    tests = [
+        ("publish reaches only that household", test_publish_reaches_only_that_household),
+        ("unsubscribe and slow subscriber", test_unsubscribe_and_slow_subscriber),
+    ]
+
+    passed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {name}: {e}")
+
+    print(f"\nResult: {passed}/{len(tests)} tests passed.")
+
+
+if __name__ == "__main__":
+    main()
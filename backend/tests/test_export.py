@@ -0,0 +1,158 @@
+"""
+Simple tests for the redemption log export.
+
+How to run (from backend/ directory):
+  python -m tests.test_export
+
+This script tests 5 cases:
+1) Files in range are concatenated with a single header
+2) Resuming from a byte offset returns exactly the remaining bytes
+3) Bad date ranges are rejected
+4) A Range past the end gets 416 with Content-Range: bytes */<size>
+5) If-Range (ETag or Last-Modified date) resumes only an unchanged export
+"""
+
+from pathlib import Path
+import shutil
+
+from flask import Flask
+from werkzeug.http import http_date
+
+import app
+
+from storage.redemption_store import RedemptionStore, REDEEM_HEADER
+from services.export_service import ExportService
+
+
+def _assert_true(cond: bool, msg: str) -> None:
+    if not cond:
+        raise AssertionError(msg)
+
+
+def _new_case_dir(case_name: str) -> Path:
+    """Create an isolated temp dir for a single test case, with three hourly logs."""
+    root = Path(__file__).resolve().parent / "_tmp_export"
+    case_dir = root / case_name
+    if case_dir.exists():
+        shutil.rmtree(case_dir)
+    case_dir.mkdir(parents=True, exist_ok=True)
+
+    header = ",".join(REDEEM_HEADER) + "\n"
+    for i, hour in enumerate(["2026010109", "2026010215", "2026010300"]):
+        row = f"TX{1001 + i},H52298800781,M0001,{hour}0000,V000000{i + 1},$2.00,$2.00,Completed,Final denomination used\n"
+        (case_dir / f"Redeem{hour}.csv").write_text(header + row, encoding="utf-8")
+    return case_dir
+
+
+def _cleanup_all() -> None:
+    root = Path(__file__).resolve().parent / "_tmp_export"
+    if root.exists():
+        shutil.rmtree(root)
+
+
+def test_range_is_concatenated() -> None:
+    tmp_dir = _new_case_dir("concat")
+    service = ExportService(RedemptionStore(tmp_dir))
+
+    segments = service.plan("20260101", "20260102")
+    data = b"".join(service.stream(segments)).decode("utf-8")
+    lines = data.strip().splitlines()
+
+    _assert_true(len(segments) == 2, f"expected 2 files in range, got {len(segments)}")
+    _assert_true(len(lines) == 3, f"expected header + 2 rows, got {len(lines)} lines")
+    _assert_true(lines[0].startswith("Transaction_ID") and not lines[2].startswith("Transaction_ID"),
+                 "header should appear once, at the top")
+    _assert_true(service.total_length(segments) == len(data), "total_length should match streamed bytes")
+
+
+def test_resume_from_offset() -> None:
+    tmp_dir = _new_case_dir("resume")
+    service = ExportService(RedemptionStore(tmp_dir))
+
+    segments = service.plan("20260101", "2026010300")
+    full = b"".join(service.stream(segments))
+    for offset in (0, 1, 150, len(full) - 1):
+        tail = b"".join(service.stream(segments, offset))
+        _assert_true(tail == full[offset:], f"resume from {offset} should return the remaining bytes")
+    middle = b"".join(service.stream(segments, 100, 50))
+    _assert_true(middle == full[100:150], "bounded range should return exactly the requested bytes")
+
+
+def test_bad_dates() -> None:
+    tmp_dir = _new_case_dir("bad_dates")
+    service = ExportService(RedemptionStore(tmp_dir))
+
+    for date_from, date_to in (("2026-01-01", "20260102"), ("20260103", "20260101")):
+        try:
+            service.plan(date_from, date_to)
+            raise AssertionError(f"Expected ValueError for range {date_from}..{date_to}")
+        except ValueError:
+            pass
+
+
+def _export(service: ExportService, segments: list, headers: dict):
+    with Flask(__name__).test_request_context(headers=headers):
+        return app.export_response(service, segments, "export.csv")
+
+
+def test_unsatisfiable_range() -> None:
+    tmp_dir = _new_case_dir("unsatisfiable")
+    service = ExportService(RedemptionStore(tmp_dir))
+    segments = service.plan("20260101", "2026010300")
+    total = service.total_length(segments)
+
+    resp = _export(service, segments, {"Range": f"bytes={total}-"})
+    _assert_true(resp.status_code == 416, f"a range past the end should be refused, got {resp.status_code}")
+    _assert_true(resp.headers["Content-Range"] == f"bytes */{total}", f"unexpected Content-Range: {resp.headers.get('Content-Range')}")
+
+    resp = _export(service, segments, {"Range": f"bytes={total - 10}-"})
+    _assert_true(resp.status_code == 206 and len(resp.get_data()) == 10, "a satisfiable range should still be served")
+
+
+def test_if_range() -> None:
+    tmp_dir = _new_case_dir("if_range")
+    service = ExportService(RedemptionStore(tmp_dir))
+    segments = service.plan("20260101", "2026010300")
+    etag = service.etag(segments)
+    modified = http_date(service.last_modified(segments))
+
+    first = _export(service, segments, {})
+    _assert_true(first.headers["Last-Modified"] == modified, "the export should carry Last-Modified")
+
+    for validator in (f'"{etag}"', modified):
+        resp = _export(service, segments, {"Range": "bytes=100-", "If-Range": validator})
+        _assert_true(resp.status_code == 206, f"If-Range {validator} matches: expected 206, got {resp.status_code}")
+
+    stale_date = http_date(service.last_modified(segments).timestamp() - 60)
+    for validator in ('"stale"', stale_date):
+        resp = _export(service, segments, {"Range": "bytes=100-", "If-Range": validator})
+        _assert_true(resp.status_code == 200, f"If-Range {validator} is stale: expected the whole export, got {resp.status_code}")
+        _assert_true(len(resp.get_data()) == service.total_length(segments), "a stale If-Range should get every byte")
+
+
+def main() -> None:
+    _cleanup_all()
+
+    tests = [
+        ("range is concatenated", test_range_is_concatenated),
+        ("resume from offset", test_resume_from_offset),
+        ("bad dates", test_bad_dates),
+        ("unsatisfiable range", test_unsatisfiable_range),
+        ("if-range", test_if_range),
+    ]
+
+    passed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {name}: {e}")
+
+    _cleanup_all()
+    print(f"\nResult: {passed}/{len(tests)} tests passed.")
+
+
+if __name__ == "__main__":
+    main()
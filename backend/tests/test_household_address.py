@@ -0,0 +1,175 @@
+"""
+Simple unit-style tests for the household postal code / unit index.
+
+How to run (from backend/ directory):
+  python -m tests.test_household_address
+
+This script tests 5 cases:
+1) Households are found by postal code, optionally narrowed to a unit
+2) With one_household_per_unit, a second household at the same unit is rejected
+3) The index is built when households are loaded at bootstrap
+4) A failed save does not leave the unit claimed
+5) Disk mode answers address lookups from the disk store (also after upgrading
+   a store written without the address columns), not an in-memory index
+"""
+
+from pathlib import Path
+import json
+import shutil
+import sqlite3
+
+from storage.household_disk_store import HouseholdDiskStore
+from storage.household_store import HouseholdStore
+from services.household_cache import HouseholdCache
+from services.household_service import HouseholdService, unit_key
+
+
+class _NullStore(HouseholdStore):
+    def __init__(self):
+        super().__init__(None)
+
+    def save(self, household):
+        pass
+
+
+class _FailingStore(_NullStore):
+    """Fails the next `failures` saves, like a full disk."""
+
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+
+    def save(self, household):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("No space left on device")
+
+
+def _assert_true(cond: bool, msg: str) -> None:
+    if not cond:
+        raise AssertionError(msg)
+
+
+def _new_case_dir(case_name: str) -> Path:
+    """Create an isolated temp dir for a single test case."""
+    root = Path(__file__).resolve().parent / "_tmp_household_address"
+    case_dir = root / case_name
+    if case_dir.exists():
+        shutil.rmtree(case_dir)
+    case_dir.mkdir(parents=True, exist_ok=True)
+    return case_dir
+
+
+def _cleanup_all() -> None:
+    root = Path(__file__).resolve().parent / "_tmp_household_address"
+    if root.exists():
+        shutil.rmtree(root)
+
+
+def test_find_by_address() -> None:
+    service = HouseholdService(_NullStore())
+    service.register_household("H52298800781", "560123", "#06-01")
+    service.register_household("H52298800782", "560123", "#06-01")
+    service.register_household("H52298800783", "560123", "#07-02")
+    service.register_household("H52298800784", "560999", "#07-02")
+
+    found = [h.household_id for h in service.find_by_address("560123")]
+    _assert_true(found == ["H52298800781", "H52298800782", "H52298800783"], f"unexpected households at 560123: {found}")
+    found = [h.household_id for h in service.find_by_address("560123", "#6-1")]
+    _assert_true(found == ["H52298800781", "H52298800782"], f"unit should be matched after normalising: {found}")
+    _assert_true(service.find_by_address("111111") == [], "an unknown postal code should find nothing")
+
+
+def test_one_household_per_unit() -> None:
+    service = HouseholdService(_NullStore(), one_household_per_unit=True)
+    service.register_household("H52298800781", "560123", "#06-01")
+    try:
+        service.register_household("H52298800782", "560123", "#6-01")
+        raise AssertionError("second household at the same unit should be rejected")
+    except ValueError as e:
+        _assert_true("already registered at this unit" in str(e), f"unexpected error: {e}")
+    service.register_household("H52298800783", "560123", "#06-02")
+
+
+def test_index_built_at_bootstrap() -> None:
+    service = HouseholdService(_NullStore())
+    source = HouseholdService(_NullStore())
+    source.register_household("H52298800781", "560123", "#06-01")
+    service.load_households(source.households_by_id.values())
+    _assert_true(service.ids_by_address["560123"][unit_key("#06-01")] == {"H52298800781"},
+                 "loaded households should be indexed by address")
+
+
+def test_failed_save_does_not_claim_the_unit() -> None:
+    service = HouseholdService(_FailingStore(1), one_household_per_unit=True)
+    try:
+        service.register_household("H52298800781", "560123", "#06-01")
+        raise AssertionError("the failed save should surface")
+    except OSError:
+        pass
+    _assert_true(service.find_by_address("560123") == [], "a household that was never saved should not be indexed")
+    service.register_household("H52298800782", "560123", "#06-01")
+
+
+def test_disk_mode_looks_up_addresses_in_the_store() -> None:
+    tmp_dir = _new_case_dir("disk_mode")
+    db_path = tmp_dir / "households.db"
+
+    # A store written before the address columns existed
+    source = HouseholdService(_NullStore())
+    source.register_household("H52298800781", "560123", "#06-01")
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("CREATE TABLE households (household_id TEXT PRIMARY KEY, data TEXT NOT NULL)")
+    conn.execute("INSERT INTO households VALUES (?, ?)",
+                 ("H52298800781", json.dumps(source.get_household("H52298800781").to_dict())))
+    conn.commit()
+    conn.close()
+
+    disk_store = HouseholdDiskStore(db_path)
+    disk_store.open()
+    try:
+        service = HouseholdService(_NullStore(), HouseholdCache(disk_store, 10), one_household_per_unit=True)
+        service.bootstrap_from_file()
+        _assert_true(service.ids_by_address == {}, "disk mode should not build an in-memory address index")
+        found = [h.household_id for h in service.find_by_address("560123", "#6-1")]
+        _assert_true(found == ["H52298800781"], f"the upgraded store should be indexed by address: {found}")
+
+        service.register_household("H52298800782", "560123", "#06-02")
+        try:
+            service.register_household("H52298800783", "560123", "#6-2")
+            raise AssertionError("second household at the same unit should be rejected")
+        except ValueError as e:
+            _assert_true("already registered at this unit" in str(e), f"unexpected error: {e}")
+        found = [h.household_id for h in service.find_by_address("560123")]
+        _assert_true(found == ["H52298800781", "H52298800782"], f"unexpected households at 560123: {found}")
+        _assert_true(service.ids_by_address == {}, "registering should not fill an in-memory index in disk mode")
+    finally:
+        disk_store.close()
+
+
+def main() -> None:
+    _cleanup_all()
+
+    tests = [
+        ("find by address", test_find_by_address),
+        ("one household per unit", test_one_household_per_unit),
+        ("index built at bootstrap", test_index_built_at_bootstrap),
+        ("failed save does not claim the unit", test_failed_save_does_not_claim_the_unit),
+        ("disk mode looks up addresses in the store", test_disk_mode_looks_up_addresses_in_the_store),
+    ]
+
+    passed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {name}: {e}")
+
+    _cleanup_all()
+    print(f"\nResult: {passed}/{len(tests)} tests passed.")
+
+
+if __name__ == "__main__":
+    main()
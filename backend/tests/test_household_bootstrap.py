@@ -0,0 +1,61 @@
+import unittest
+import shutil
+from pathlib import Path
+from unittest import mock
+
+import storage.household_store as household_store_module
+from services.household_service import HouseholdService
+from storage.household_store import HouseholdStore
+
+class TestHouseholdBootstrap(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(__file__).resolve().parent / "_tmp_bootstrap"
+        self.test_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.test_dir / "households.json"
+
+        # Register a few households through the normal path so the file has the real layout
+        self.store = HouseholdStore(self.path)
+        service = HouseholdService(self.store)
+        for i in range(25):
+            service.register_household(f"H{52298800700 + i}", "560123", f"#06-{i + 1:02d}")
+        self.expected = {h.household_id: h for h in service.households_by_id.values()}
+
+    def tearDown(self):
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+
+    def test_streaming_matches_file(self):
+        """Tiny read chunks must still yield every household intact."""
+        loaded = list(self.store.iter_households(chunk_size=7))
+        self.assertEqual({h.household_id: h for h in loaded}, self.expected)
+
+    def test_parallel_matches_file(self):
+        """The byte-range split must not lose or duplicate households."""
+        with mock.patch.object(household_store_module, "PARALLEL_THRESHOLD_BYTES", 1), \
+             mock.patch.object(household_store_module.os, "cpu_count", return_value=4):
+            ranges = self.store._split_ranges(8)
+            loaded = list(self.store.iter_households(workers=2))
+
+        self.assertGreater(len(ranges), 1)
+        self.assertEqual([h.household_id for h in loaded], list(self.expected))
+        self.assertEqual({h.household_id: h for h in loaded}, self.expected)
+
+    def test_bootstrap_fills_registry(self):
+        """bootstrap_from_file streams straight into households_by_id."""
+        service = HouseholdService(HouseholdStore(self.path))
+        service.bootstrap_from_file()
+        self.assertEqual(service.households_by_id, self.expected)
+
+    def test_empty_and_truncated_files(self):
+        """Empty files load nothing; a truncated file keeps the complete entries."""
+        self.path.write_text("", encoding="utf-8")
+        self.assertEqual(self.store.load_all(), [])
+
+        self.path.write_text(
+            '{"H52298800781": {"household_id": "H52298800781", "balance": 5, "vouchers": {"5": 1}, "link": ""}, "H5229',
+            encoding="utf-8",
+        )
+        self.assertEqual([h.household_id for h in self.store.load_all()], ["H52298800781"])
+
+if __name__ == "__main__":
+    unittest.main()
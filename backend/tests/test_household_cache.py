@@ -0,0 +1,232 @@
+"""
+Simple integration-style tests for disk mode (LRU cache over HouseholdDiskStore).
+
+How to run (from backend/ directory):
+  python -m tests.test_household_cache
+
+This script tests 5 cases:
+1) Changes are written through and reloaded intact after eviction and restart
+2) Redemption in disk mode persists through the cache, with hit/miss metrics
+3) First start migrates households.json into the disk store
+4) A change to a cached household is on disk without any flush or clean shutdown
+5) Two redemptions of one household keep both deductions when the household
+   is evicted between the first one's load and persist
+"""
+
+from pathlib import Path
+import shutil
+import threading
+
+from storage.bankcode_store import BankCodeStore
+from storage.merchant_store import MerchantStore
+from storage.household_store import HouseholdStore
+from storage.household_disk_store import HouseholdDiskStore
+from storage.counter_store import CounterStore
+from storage.redemption_store import RedemptionStore
+
+from services.merchant_service import MerchantService
+from services.household_service import HouseholdService
+from services.household_cache import HouseholdCache
+from services.redemption_service import RedemptionService
+
+
+def _assert_true(cond: bool, msg: str) -> None:
+    if not cond:
+        raise AssertionError(msg)
+
+
+def _new_case_dir(case_name: str) -> Path:
+    """Create an isolated temp dir for a single test case."""
+    root = Path(__file__).resolve().parent / "_tmp_household_cache"
+    case_dir = root / case_name
+    if case_dir.exists():
+        shutil.rmtree(case_dir)
+    case_dir.mkdir(parents=True, exist_ok=True)
+    return case_dir
+
+
+def _cleanup_all() -> None:
+    root = Path(__file__).resolve().parent / "_tmp_household_cache"
+    if root.exists():
+        shutil.rmtree(root)
+
+
+def _make_household_service(tmp_dir: Path, capacity: int) -> HouseholdService:
+    disk_store = HouseholdDiskStore(tmp_dir / "households.db")
+    disk_store.open()
+    service = HouseholdService(HouseholdStore(tmp_dir / "households.json"), HouseholdCache(disk_store, capacity))
+    service.bootstrap_from_file()
+    return service
+
+
+def test_eviction_writes_back() -> None:
+    tmp_dir = _new_case_dir("eviction")
+    service = _make_household_service(tmp_dir, capacity=2)
+
+    for i in range(5):
+        service.register_household(f"H5229880078{i}", "560123", f"#06-0{i + 1}")
+    first = service.get_household("H52298800780")
+    first.balance -= 2
+    first.vouchers["2"] -= 1
+    service.persist(first)
+    cache = service.household_cache
+
+    _assert_true(cache.metrics()["size"] == 2, "cache should never hold more than its capacity")
+    for i in range(1, 5):
+        service.get_household(f"H5229880078{i}")  # push the changed household out
+
+    cache.disk_store.close()
+    reopened = _make_household_service(tmp_dir, capacity=2)
+    again = reopened.get_household("H52298800780")
+    _assert_true(again.balance == first.balance and again.vouchers == first.vouchers, "evicted change should be on disk")
+    _assert_true(reopened.liabilities()["outstanding_vouchers"]["2"] == 5 * 80 - 1, "bootstrap should rebuild totals from disk")
+
+
+def _make_redemption_service(tmp_dir: Path, household_service: HouseholdService):
+    base_dir = Path(__file__).resolve().parents[1]
+    bank_store = BankCodeStore(base_dir / "storage" / "data" / "BankCode.csv")
+    bank_store.load()
+
+    merchant_service = MerchantService(MerchantStore(tmp_dir / "Merchant.txt"), bank_store)
+    redemption_service = RedemptionService(
+        household_service=household_service,
+        household_store=household_service.household_store,
+        merchant_service=merchant_service,
+        counter_store=CounterStore(tmp_dir / "counters.json"),
+        redemption_store=RedemptionStore(tmp_dir),
+        pending_codes={},
+    )
+    merchant = merchant_service.register_merchant({
+        "merchant_name": "ABC Minimart",
+        "uen": "201234567A",
+        "bank_name": "DBS Bank Ltd",
+        "bank_code": "7171",
+        "branch_code": "001",
+        "account_number": "123-456-789",
+        "account_holder_name": "ABC Minimart Pte Ltd",
+    })
+    return redemption_service, merchant
+
+
+def test_redemption_in_disk_mode() -> None:
+    tmp_dir = _new_case_dir("redemption")
+    household_service = _make_household_service(tmp_dir, capacity=10)
+    redemption_service, merchant = _make_redemption_service(tmp_dir, household_service)
+    household = household_service.register_household("H52298800781", "560123", "#06-03")
+
+    code = redemption_service.generate_code(household.household_id, {"10": 1})
+    result = redemption_service.redeem(merchant_id=merchant.merchant_id, code=code)
+    cache = household_service.household_cache
+
+    _assert_true(not (tmp_dir / "households.json").exists(), "disk mode should not rewrite households.json")
+    _assert_true(cache.disk_store.get(household.household_id).balance == result["remaining_balance"], "the deduction should be on disk as soon as redeem returns")
+    _assert_true(cache.metrics()["hits"] >= 2, "generate_code and redeem should hit the cache")
+    _assert_true(household_service.verify_liabilities()["consistent"], "liability counters should match the disk store")
+
+
+def test_migrates_json_on_first_start() -> None:
+    tmp_dir = _new_case_dir("migration")
+    json_service = HouseholdService(HouseholdStore(tmp_dir / "households.json"))
+    json_service.register_household("H52298800781", "560123", "#06-03")
+    json_service.register_household("H52298800782", "560123", "#06-04")
+
+    service = _make_household_service(tmp_dir, capacity=1)
+    _assert_true(len(service.households_by_id) == 2, "both households should be migrated")
+    _assert_true("H52298800782" in service.households_by_id, "migrated household should be found on disk")
+    _assert_true(service.get_household("H00000000000") is None, "unknown household should miss")
+
+    before = service.household_cache.metrics()
+    _assert_true(service.postal_code_of("H52298800781") == "560123", "postal code should be read from the disk store")
+    _assert_true(service.household_cache.metrics() == before, "a postal code lookup should not touch the cache")
+
+
+def test_change_survives_crash() -> None:
+    tmp_dir = _new_case_dir("crash")
+    service = _make_household_service(tmp_dir, capacity=10)
+    household = service.register_household("H52298800781", "560123", "#06-03")
+    household.vouchers["10"] -= 1
+    household.balance -= 10
+    service.persist(household)
+
+    # No eviction, flush or close: read the database from a second connection
+    other = HouseholdDiskStore(tmp_dir / "households.db")
+    other.open()
+    on_disk = other.get("H52298800781")
+    _assert_true(on_disk.balance == household.balance, "a deduction should be durable once persist() returns")
+    other.close()
+
+
+def test_eviction_between_load_and_persist() -> None:
+    tmp_dir = _new_case_dir("concurrent")
+    household_service = _make_household_service(tmp_dir, capacity=1)
+    redemption_service, merchant = _make_redemption_service(tmp_dir, household_service)
+    household = household_service.register_household("H52298800781", "560123", "#06-03")
+    household_service.register_household("H52298800782", "560123", "#06-04")
+    balance = household.balance
+    first_code = redemption_service.generate_code(household.household_id, {"10": 1})
+    second_code = redemption_service.generate_code(household.household_id, {"10": 1})
+
+    # Pause the first redemption after it loaded the household, before it persists
+    paused, resume = threading.Event(), threading.Event()
+    apply_liability_delta = household_service.apply_liability_delta
+
+    def pausing_apply_liability_delta(vouchers, value):
+        if not paused.is_set():
+            paused.set()
+            resume.wait(5)
+        apply_liability_delta(vouchers, value)
+
+    household_service.apply_liability_delta = pausing_apply_liability_delta
+    errors = []
+
+    def redeem(code):
+        try:
+            redemption_service.redeem(merchant_id=merchant.merchant_id, code=code)
+        except Exception as e:
+            errors.append(e)
+
+    first = threading.Thread(target=redeem, args=(first_code,))
+    second = threading.Thread(target=redeem, args=(second_code,))
+    first.start()
+    try:
+        _assert_true(paused.wait(5), "the first redemption should have loaded the household")
+        household_service.get_household("H52298800782")  # evicts the household being changed
+        second.start()
+        second.join(0.5)  # without the household lock it completes on a stale copy
+    finally:
+        resume.set()
+        first.join()
+        second.join()
+
+    on_disk = household_service.household_cache.disk_store.get(household.household_id)
+    _assert_true(not errors, f"both redemptions should succeed: {errors}")
+    _assert_true(on_disk.balance == balance - 20 and on_disk.vouchers["10"] == 45 - 2,
+                 f"both deductions should be on disk, balance is {on_disk.balance}")
+
+
+def main() -> None:
+    _cleanup_all()
+
+    tests = [
+        ("changes written through", test_eviction_writes_back),
+        ("redemption in disk mode", test_redemption_in_disk_mode),
+        ("migrates json on first start", test_migrates_json_on_first_start),
+        ("change survives crash", test_change_survives_crash),
+        ("eviction between load and persist", test_eviction_between_load_and_persist),
+    ]
+
+    passed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {name}: {e}")
+
+    _cleanup_all()
+    print(f"\nResult: {passed}/{len(tests)} tests passed.")
+
+
+if __name__ == "__main__":
+    main()
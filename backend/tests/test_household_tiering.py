@@ -0,0 +1,200 @@
+"""
+Simple integration-style tests for cold tiering of fully-redeemed households.
+
+How to run (from backend/ directory):
+  python -m tests.test_household_tiering
+
+This script tests 5 cases:
+1) Zero-balance households move to the archive and are still found on lookup
+2) A new tranche promotes an archived household back to the hot registry
+3) The archive survives a restart (offsets rebuilt, promoted households dropped)
+4) A tranche is the configured one, granted once per tranche ID and recorded
+5) Operator-only endpoints refuse requests without the operator token
+"""
+
+from pathlib import Path
+import shutil
+
+from flask import Flask, jsonify
+
+import app
+
+from storage.household_store import HouseholdStore
+from storage.household_archive_store import HouseholdArchiveStore
+from storage.tranche_store import TrancheStore
+
+from services.household_service import HouseholdService, TRANCHE_VOUCHERS
+
+
+def _assert_true(cond: bool, msg: str) -> None:
+    if not cond:
+        raise AssertionError(msg)
+
+
+def _new_case_dir(case_name: str) -> Path:
+    """Create an isolated temp dir for a single test case."""
+    root = Path(__file__).resolve().parent / "_tmp_tiering"
+    case_dir = root / case_name
+    if case_dir.exists():
+        shutil.rmtree(case_dir)
+    case_dir.mkdir(parents=True, exist_ok=True)
+    return case_dir
+
+
+def _cleanup_all() -> None:
+    root = Path(__file__).resolve().parent / "_tmp_tiering"
+    if root.exists():
+        shutil.rmtree(root)
+
+
+def _make_service(tmp_dir: Path) -> HouseholdService:
+    archive_store = HouseholdArchiveStore(tmp_dir / "households_archive.jsonl")
+    archive_store.load()
+    tranche_store = TrancheStore(tmp_dir / "tranches.jsonl")
+    tranche_store.load()
+    service = HouseholdService(
+        HouseholdStore(tmp_dir / "households.json"), archive_store=archive_store, tranche_store=tranche_store
+    )
+    service.bootstrap_from_file()
+    return service
+
+
+def _redeem_everything(service: HouseholdService, household_id: str) -> None:
+    household = service.get_household(household_id)
+    service.apply_liability_delta({d: -q for d, q in household.vouchers.items()}, -household.balance)
+    household.vouchers = {d: 0 for d in household.vouchers}
+    household.balance = 0
+    service.persist(household)
+
+
+def test_archives_zero_balance_households() -> None:
+    tmp_dir = _new_case_dir("archive")
+    service = _make_service(tmp_dir)
+    service.register_household("H52298800781", "560123", "#06-01")
+    service.register_household("H52298800782", "560123", "#06-02")
+    _redeem_everything(service, "H52298800781")
+
+    _assert_true(service.archive_cold_households() == 1, "only the fully-redeemed household should move")
+    _assert_true("H52298800781" not in service.households_by_id, "archived household should leave the hot set")
+    _assert_true(len(HouseholdStore(tmp_dir / "households.json").load_all()) == 1, "households.json should shrink")
+
+    cold = service.get_household("H52298800781")
+    _assert_true(cold is not None and cold.balance == 0, "lookup should fall through to the archive")
+    _assert_true(service.verify_liabilities()["consistent"], "archiving should not change liabilities")
+    try:
+        service.register_household("H52298800781", "560123", "#06-01")
+        raise AssertionError("archived ID should still count as registered")
+    except ValueError:
+        pass
+
+
+def test_tranche_promotes_back_to_hot() -> None:
+    tmp_dir = _new_case_dir("promote")
+    service = _make_service(tmp_dir)
+    service.register_household("H52298800781", "560123", "#06-01")
+    _redeem_everything(service, "H52298800781")
+    service.archive_cold_households()
+
+    household = service.grant_tranche("H52298800781", "2026-topup")
+    _assert_true(household.balance == 770, "tranche value should be credited")
+    _assert_true("H52298800781" in service.households_by_id, "household should be hot again")
+    _assert_true("H52298800781" not in service.archive_store, "household should leave the archive")
+    _assert_true(service.liabilities()["outstanding_value"] == 770, "tranche should add to liabilities")
+
+
+def test_archive_survives_restart() -> None:
+    tmp_dir = _new_case_dir("restart")
+    service = _make_service(tmp_dir)
+    for i in range(1, 4):
+        service.register_household(f"H5229880078{i}", "560123", f"#06-0{i}")
+        _redeem_everything(service, f"H5229880078{i}")
+    service.archive_cold_households()
+    service.grant_tranche("H52298800782", "2026-topup")
+
+    restarted = _make_service(tmp_dir)
+    _assert_true(len(restarted.archive_store) == 2, "promoted household should not be in the archive")
+    _assert_true(restarted.get_household("H52298800783").balance == 0, "archived household should load by offset")
+    _assert_true(restarted.get_household("H52298800782").balance == 770, "promoted household should be hot")
+
+    restarted.archive_store.compact()
+    _assert_true(restarted.archive_store.dead_lines() == 0, "compaction should drop tombstones")
+    _assert_true(restarted.get_household("H52298800781") is not None, "offsets should be valid after compaction")
+
+
+def test_tranche_is_configured_and_recorded() -> None:
+    tmp_dir = _new_case_dir("tranche_ledger")
+    service = _make_service(tmp_dir)
+    service.register_household("H52298800781", "560123", "#06-01")
+
+    household = service.grant_tranche("H52298800781", "2026-topup")
+    _assert_true(household.vouchers == {d: 2 * q for d, q in TRANCHE_VOUCHERS.items()},
+                 "only the configured denominations and quantities should be credited")
+    try:
+        service.grant_tranche("H52298800781", "2026-topup")
+        raise AssertionError("the same tranche should not be granted twice")
+    except ValueError as e:
+        _assert_true("already granted" in str(e), f"unexpected error: {e}")
+
+    restarted = _make_service(tmp_dir)
+    _assert_true(restarted.tranche_store.granted_vouchers() == {"H52298800781": TRANCHE_VOUCHERS},
+                 "the grant should be in the ledger after a restart")
+
+    unrecorded = HouseholdService(HouseholdStore(tmp_dir / "households.json"))
+    unrecorded.bootstrap_from_file()
+    try:
+        unrecorded.grant_tranche("H52298800781", "2026-second")
+        raise AssertionError("grants without a ledger should be refused")
+    except ValueError:
+        pass
+
+
+def test_operator_token_required() -> None:
+    flask_app = Flask(__name__)
+
+    @flask_app.post("/grant")
+    @app.operator_only
+    def grant():
+        return jsonify({"status": "success"}), 201
+
+    client = flask_app.test_client()
+    saved = app.OPERATOR_TOKEN
+    try:
+        app.OPERATOR_TOKEN = ""
+        _assert_true(client.post("/grant").status_code == 403, "no configured token should disable the endpoint")
+
+        app.OPERATOR_TOKEN = "s3cret"
+        _assert_true(client.post("/grant").status_code == 401, "missing credentials should be refused")
+        wrong = client.post("/grant", headers={"Authorization": "Bearer nope"})
+        _assert_true(wrong.status_code == 401, "a wrong token should be refused")
+        right = client.post("/grant", headers={"Authorization": "Bearer s3cret"})
+        _assert_true(right.status_code == 201, "the operator token should be accepted")
+    finally:
+        app.OPERATOR_TOKEN = saved
+
+
+def main() -> None:
+    _cleanup_all()
+
+    tests = [
+        ("archives zero-balance households", test_archives_zero_balance_households),
+        ("tranche promotes back to hot", test_tranche_promotes_back_to_hot),
+        ("archive survives restart", test_archive_survives_restart),
+        ("tranche configured and recorded", test_tranche_is_configured_and_recorded),
+        ("tranche endpoint needs operator token", test_operator_token_required),
+    ]
+
+    passed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {name}: {e}")
+
+    _cleanup_all()
+    print(f"\nResult: {passed}/{len(tests)} tests passed.")
+
+
+if __name__ == "__main__":
+    main()
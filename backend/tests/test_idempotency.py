@@ -0,0 +1,209 @@
+"""
+Simple tests for Idempotency-Key handling on POST endpoints.
+
+How to run (from backend/ directory):
+  python -m tests.test_idempotency
+
+This script tests 6 cases:
+1) A retry is replayed without running the view; a different body is refused
+2) A rate-limited (429) reply is not cached, so the retry runs the view
+3) A key whose first request is still in flight cannot be claimed again
+4) The cache is bounded and entries expire after the TTL
+5) Journaled entries survive a restart
+6) A second request with the key while the first is blocked gets 409 +
+   Retry-After, and a retry after the first finishes gets its reply
+"""
+
+from pathlib import Path
+import shutil
+import threading
+
+from flask import Flask, jsonify
+
+import services.idempotency_cache as module
+from app import idempotent
+from services.idempotency_cache import IdempotencyCache
+from storage.idempotency_store import IdempotencyStore
+
+
+class _Clock:
+    """Stands in for the time module inside services.idempotency_cache."""
+
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+
+    def time(self) -> float:
+        return self.now
+
+
+def _assert_true(cond: bool, msg: str) -> None:
+    if not cond:
+        raise AssertionError(msg)
+
+
+def _new_case_dir(case_name: str) -> Path:
+    """Create an isolated temp dir for a single test case."""
+    root = Path(__file__).resolve().parent / "_tmp_idempotency"
+    case_dir = root / case_name
+    if case_dir.exists():
+        shutil.rmtree(case_dir)
+    case_dir.mkdir(parents=True, exist_ok=True)
+    return case_dir
+
+
+def _cleanup_all() -> None:
+    root = Path(__file__).resolve().parent / "_tmp_idempotency"
+    if root.exists():
+        shutil.rmtree(root)
+
+
+def _app(cache: IdempotencyCache, calls: list) -> Flask:
+    app = Flask(__name__)
+
+    @app.post("/things")
+    @idempotent(cache, "things")
+    def create_thing():
+        calls.append(1)
+        return jsonify({"thing": len(calls)}), 201
+
+    return app
+
+
+def test_retry_is_replayed_without_running_the_view() -> None:
+    calls = []
+    client = _app(IdempotencyCache(), calls).test_client()
+
+    first = client.post("/things", json={"a": 1}, headers={"Idempotency-Key": "k1"})
+    retry = client.post("/things", json={"a": 1}, headers={"Idempotency-Key": "k1"})
+    mismatch = client.post("/things", json={"a": 2}, headers={"Idempotency-Key": "k1"})
+    unkeyed = client.post("/things", json={"a": 1})
+
+    _assert_true((first.status_code, retry.status_code) == (201, 201), "both replies should be 201")
+    _assert_true(retry.get_json() == first.get_json() == {"thing": 1}, "the retry should get the original body")
+    _assert_true(retry.headers["Idempotent-Replayed"] == "true", "the retry should be marked as replayed")
+    _assert_true(mismatch.status_code == 422, f"a different body under the key should be refused, got {mismatch.status_code}")
+    _assert_true(unkeyed.get_json() == {"thing": 2}, "a request without a key should always run")
+    _assert_true(len(calls) == 2, f"the view should have run twice, ran {len(calls)} times")
+
+
+def test_rate_limited_reply_is_not_cached() -> None:
+    app = Flask(__name__)
+    replies = [("busy", 429), ("done", 201)]
+
+    @app.post("/things")
+    @idempotent(IdempotencyCache(), "things")
+    def create_thing():
+        body, status = replies.pop(0)
+        return jsonify({"result": body}), status
+
+    client = app.test_client()
+    first = client.post("/things", json={}, headers={"Idempotency-Key": "k1"})
+    retry = client.post("/things", json={}, headers={"Idempotency-Key": "k1"})
+
+    _assert_true(first.status_code == 429, f"expected 429, got {first.status_code}")
+    _assert_true(retry.status_code == 201 and "Idempotent-Replayed" not in retry.headers,
+                 "the retry after a 429 should run the view")
+
+
+def test_in_flight_key_is_refused() -> None:
+    cache = IdempotencyCache()
+    _assert_true(cache.begin("k1") is None, "a new key should be claimed")
+    try:
+        cache.begin("k1")
+        raise AssertionError("a second claim of an in-flight key should fail")
+    except ValueError:
+        pass
+    cache.release("k1")
+    _assert_true(cache.begin("k1") is None, "a released key can be claimed again")
+
+
+def test_bounded_and_ttl() -> None:
+    clock, saved = _Clock(), module.time
+    module.time = clock
+    try:
+        cache = IdempotencyCache(max_entries=2, ttl_seconds=60)
+        for key in ("a", "b", "c"):
+            cache.begin(key)
+            cache.complete(key, "f", 200, "{}", "application/json")
+        _assert_true(len(cache) == 2 and cache.begin("a") is None, "the oldest entry should be evicted")
+        cache.release("a")
+
+        clock.now += 61
+        _assert_true(cache.begin("b") is None and len(cache) == 0, "entries should expire after the TTL")
+    finally:
+        module.time = saved
+
+
+def test_journal_survives_restart() -> None:
+    tmp_dir = _new_case_dir("journal")
+    store = IdempotencyStore(tmp_dir / "idempotency.jsonl")
+    cache = IdempotencyCache(store=store)
+    cache.begin("redemption:k1")
+    cache.complete("redemption:k1", "f", 200, '{"transaction_id": "TX1"}', "application/json")
+
+    restarted = IdempotencyCache(store=IdempotencyStore(tmp_dir / "idempotency.jsonl"))
+    _assert_true(restarted.load() == 1, "the journaled entry should be restored")
+    _assert_true(restarted.begin("redemption:k1")["body"] == '{"transaction_id": "TX1"}',
+                 "the restored entry should hold the original body")
+
+
+def test_concurrent_retry_gets_409_then_replay() -> None:
+    app = Flask(__name__)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    @app.post("/things")
+    @idempotent(IdempotencyCache(), "things")
+    def create_thing():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return jsonify({"thing": len(calls)}), 201
+
+    client = app.test_client()
+    replies = []
+    first = threading.Thread(target=lambda: replies.append(
+        client.post("/things", json={}, headers={"Idempotency-Key": "k1"})))
+    first.start()
+    try:
+        _assert_true(started.wait(5), "the first request should be running")
+        concurrent = client.post("/things", json={}, headers={"Idempotency-Key": "k1"})
+        _assert_true(concurrent.status_code == 409, f"expected 409 while in flight, got {concurrent.status_code}")
+        _assert_true(concurrent.headers.get("Retry-After") == "1", "an in-flight 409 should invite a retry")
+    finally:
+        release.set()
+        first.join()
+
+    retry = client.post("/things", json={}, headers={"Idempotency-Key": "k1"})
+    _assert_true(replies[0].status_code == 201 and retry.status_code == 201, "the original request should complete")
+    _assert_true(retry.get_json() == replies[0].get_json(), "the retry should get the original reply")
+    _assert_true(len(calls) == 1, f"the view should have run once, ran {len(calls)} times")
+
+
+def main() -> None:
+    _cleanup_all()
+
+    tests = [
+        ("retry is replayed without running the view", test_retry_is_replayed_without_running_the_view),
+        ("rate-limited reply is not cached", test_rate_limited_reply_is_not_cached),
+        ("in-flight key is refused", test_in_flight_key_is_refused),
+        ("bounded and TTL", test_bounded_and_ttl),
+        ("journal survives restart", test_journal_survives_restart),
+        ("concurrent retry gets 409 then replay", test_concurrent_retry_gets_409_then_replay),
+    ]
+
+    passed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {name}: {e}")
+
+    _cleanup_all()
+    print(f"\nResult: {passed}/{len(tests)} tests passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Simple integration-style tests for program-wide liability counters.
+
+How to run (from backend/ directory):
+  python -m tests.test_liabilities
+
+This script tests 3 cases:
+1) Registration adds the initial allocation to the totals
+2) Redemption and deduct_balance keep the totals equal to a full recompute
+3) Bootstrapping from file rebuilds the same totals
+"""
+
+from pathlib import Path
+import shutil
+
+from storage.bankcode_store import BankCodeStore
+from storage.merchant_store import MerchantStore
+from storage.household_store import HouseholdStore
+from storage.counter_store import CounterStore
+from storage.redemption_store import RedemptionStore
+
+from services.merchant_service import MerchantService
+from services.household_service import HouseholdService, INITIAL_VOUCHERS
+from services.redemption_service import RedemptionService
+
+
+def _assert_true(cond: bool, msg: str) -> None:
+    if not cond:
+        raise AssertionError(msg)
+
+
+def _new_case_dir(case_name: str) -> Path:
+    """Create an isolated temp dir for a single test case."""
+    root = Path(__file__).resolve().parent / "_tmp_liabilities"
+    case_dir = root / case_name
+    if case_dir.exists():
+        shutil.rmtree(case_dir)
+    case_dir.mkdir(parents=True, exist_ok=True)
+    return case_dir
+
+
+def _cleanup_all() -> None:
+    root = Path(__file__).resolve().parent / "_tmp_liabilities"
+    if root.exists():
+        shutil.rmtree(root)
+
+
+INITIAL_VALUE = sum(int(d) * q for d, q in INITIAL_VOUCHERS.items())
+
+
+def _make_env(tmp_dir: Path):
+    base_dir = Path(__file__).resolve().parents[1]
+    bank_store = BankCodeStore(base_dir / "storage" / "data" / "BankCode.csv")
+    bank_store.load()
+
+    household_store = HouseholdStore(tmp_dir / "households.json")
+    merchant_service = MerchantService(MerchantStore(tmp_dir / "Merchant.txt"), bank_store)
+    household_service = HouseholdService(household_store)
+    redemption_service = RedemptionService(
+        household_service=household_service,
+        household_store=household_store,
+        merchant_service=merchant_service,
+        counter_store=CounterStore(tmp_dir / "counters.json"),
+        redemption_store=RedemptionStore(tmp_dir),
+        pending_codes={},
+    )
+    merchant = merchant_service.register_merchant({
+        "merchant_name": "ABC Minimart",
+        "uen": "201234567A",
+        "bank_name": "DBS Bank Ltd",
+        "bank_code": "7171",
+        "branch_code": "001",
+        "account_number": "123-456-789",
+        "account_holder_name": "ABC Minimart Pte Ltd",
+    })
+    return household_service, redemption_service, merchant
+
+
+def test_registration_adds_allocation() -> None:
+    tmp_dir = _new_case_dir("registration")
+    household_service, _, _ = _make_env(tmp_dir)
+
+    household_service.register_household("H52298800781", "560123", "#06-03")
+    household_service.register_household("H52298800782", "560123", "#06-04")
+
+    totals = household_service.liabilities()
+    _assert_true(totals["outstanding_value"] == 2 * INITIAL_VALUE, f"expected two allocations outstanding, got {totals}")
+    _assert_true(
+        totals["outstanding_vouchers"] == {d: 2 * q for d, q in INITIAL_VOUCHERS.items()},
+        "voucher counts should be twice the initial allocation",
+    )
+
+
+def test_deductions_match_recompute() -> None:
+    tmp_dir = _new_case_dir("deductions")
+    household_service, redemption_service, merchant = _make_env(tmp_dir)
+    household = household_service.register_household("H52298800781", "560123", "#06-03")
+
+    code = redemption_service.generate_code(household.household_id, {"10": 2, "2": 1})
+    redemption_service.redeem(merchant_id=merchant.merchant_id, code=code)
+    household_service.deduct_balance(household.household_id, 5)
+
+    report = household_service.verify_liabilities()
+    _assert_true(report["consistent"], f"running totals should match recompute: {report}")
+    _assert_true(report["outstanding_value"] == INITIAL_VALUE - 22 - 5, f"unexpected outstanding value: {report}")
+    _assert_true(report["outstanding_vouchers"]["10"] == INITIAL_VOUCHERS["10"] - 2, "two $10 notes should be gone")
+
+
+def test_bootstrap_rebuilds_totals() -> None:
+    tmp_dir = _new_case_dir("bootstrap")
+    household_service, redemption_service, merchant = _make_env(tmp_dir)
+    household = household_service.register_household("H52298800781", "560123", "#06-03")
+    code = redemption_service.generate_code(household.household_id, {"5": 3})
+    redemption_service.redeem(merchant_id=merchant.merchant_id, code=code)
+
+    restarted = HouseholdService(HouseholdStore(tmp_dir / "households.json"))
+    restarted.bootstrap_from_file()
+
+    _assert_true(restarted.liabilities() == household_service.liabilities(), "bootstrap should rebuild the same totals")
+
+
+def main() -> None:
+    _cleanup_all()
+
+    tests = [
+        ("registration adds allocation", test_registration_adds_allocation),
+        ("deductions match recompute", test_deductions_match_recompute),
+        ("bootstrap rebuilds totals", test_bootstrap_rebuilds_totals),
+    ]
+
+    passed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {name}: {e}")
+
+    _cleanup_all()
+    print(f"\nResult: {passed}/{len(tests)} tests passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Simple unit-style tests for merchant name prefix search.
+
+How to run (from backend/ directory):
+  python -m tests.test_merchant_search
+
+This script tests 2 cases:
+1) A prefix matches the start of the name or of any word, case-insensitively
+2) Newly registered merchants are searchable and results respect the limit
+"""
+
+from pathlib import Path
+
+from models.merchant import Merchant
+from storage.bankcode_store import BankCodeStore
+from services.merchant_service import MerchantService
+
+
+class _NullStore:
+    def append(self, merchant):
+        pass
+
+
+def _assert_true(cond: bool, msg: str) -> None:
+    if not cond:
+        raise AssertionError(msg)
+
+
+def _make_service() -> MerchantService:
+    bank_store = BankCodeStore(Path(__file__).resolve().parents[1] / "storage" / "data" / "BankCode.csv")
+    bank_store.load()
+    service = MerchantService(_NullStore(), bank_store)
+    service.load_merchants([
+        Merchant("M0001", "ABC Minimart", "201234567A", "DBS Bank Ltd", "7171", "001",
+                 "123", "ABC Pte Ltd", "2025-01-01", "Active"),
+        Merchant("M0002", "Abacus Books", "201234567B", "DBS Bank Ltd", "7171", "001",
+                 "456", "Abacus Pte Ltd", "2025-01-01", "Active"),
+    ])
+    return service
+
+
+def _ids(merchants) -> list[str]:
+    return [m.merchant_id for m in merchants]
+
+
+def test_prefix_search_matches_name_and_words() -> None:
+    service = _make_service()
+    _assert_true(_ids(service.search_by_name("ab")) == ["M0002", "M0001"], "'ab' should match both, sorted by name")
+    _assert_true(_ids(service.search_by_name("MINI")) == ["M0001"], "a word prefix should match, ignoring case")
+    _assert_true(_ids(service.search_by_name("abc  mini")) == ["M0001"], "every query word should match a name word")
+    _assert_true(service.search_by_name("zzz") == [], "no merchant should match 'zzz'")
+    _assert_true(service.search_by_name("") == [], "an empty query should match nothing")
+
+
+def test_registered_merchants_are_searchable_and_limited() -> None:
+    service = _make_service()
+    service.register_merchant({
+        "merchant_name": "Abbey Bakery",
+        "uen": "201234567C",
+        "bank_name": "DBS Bank Ltd",
+        "bank_code": "7171",
+        "branch_code": "001",
+        "account_number": "789",
+        "account_holder_name": "Abbey Pte Ltd",
+    })
+    names = [m.merchant_name for m in service.search_by_name("ab", limit=2)]
+    _assert_true(names == ["Abacus Books", "Abbey Bakery"], f"unexpected limited results: {names}")
+
+
+def main() -> None:
+    tests = [
+        ("prefix search matches name and words", test_prefix_search_matches_name_and_words),
+        ("registered merchants searchable and limited", test_registered_merchants_are_searchable_and_limited),
+    ]
+
+    passed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {name}: {e}")
+
+    print(f"\nResult: {passed}/{len(tests)} tests passed.")
+
+
+if __name__ == "__main__":
+    main()
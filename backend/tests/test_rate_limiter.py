@@ -0,0 +1,100 @@
+"""
+Simple unit-style tests for the token-bucket rate limiter.
+
+How to run (from backend/ directory):
+  python -m tests.test_rate_limiter
+
+This script tests 3 cases:
+1) A burst is allowed, then requests wait for the refill (per identity)
+2) Idle buckets are evicted, and the least recently seen past max_buckets
+3) A 429 reply carries Retry-After in whole seconds
+"""
+
+from flask import Flask
+
+import services.rate_limiter as module
+from app import too_many_requests
+from services.rate_limiter import TokenBucketLimiter
+
+
+class _Clock:
+    """Stands in for the time module inside services.rate_limiter."""
+
+    def __init__(self, start: float = 100.0):
+        self.now = start
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def _assert_true(cond: bool, msg: str) -> None:
+    if not cond:
+        raise AssertionError(msg)
+
+
+def test_burst_then_refill() -> None:
+    clock, saved = _Clock(), module.time
+    module.time = clock
+    try:
+        limiter = TokenBucketLimiter(rate=1, burst=3)
+
+        waits = [limiter.acquire("M001") for _ in range(3)]
+        _assert_true(waits == [0, 0, 0], f"the burst should be allowed: {waits}")
+        _assert_true(limiter.acquire("M001") == 1.0, "an empty bucket should wait one token")
+        _assert_true(limiter.acquire("M002") == 0, "other identities have their own bucket")
+
+        clock.now += 0.5
+        _assert_true(limiter.acquire("M001") == 0.5, "half a token refilled: wait half a second")
+        clock.now += 0.5
+        _assert_true(limiter.acquire("M001") == 0, "a full token refilled: allowed")
+        _assert_true(limiter.rejected == 2, f"expected 2 rejections, got {limiter.rejected}")
+    finally:
+        module.time = saved
+
+
+def test_idle_buckets_are_evicted() -> None:
+    clock, saved = _Clock(), module.time
+    module.time = clock
+    try:
+        limiter = TokenBucketLimiter(rate=1, burst=2, max_buckets=3)
+
+        for key in ("a", "b", "c", "d"):
+            limiter.acquire(key)
+        _assert_true(len(limiter) == 3, "least recently seen bucket is dropped past max_buckets")
+
+        clock.now += 2  # long enough for every bucket to be full again
+        limiter.acquire("e")
+        limiter.acquire("e")
+        _assert_true(len(limiter) == 1, f"idle buckets should be evicted, {len(limiter)} left")
+    finally:
+        module.time = saved
+
+
+def test_too_many_requests_response() -> None:
+    with Flask(__name__).app_context():
+        resp = too_many_requests(0.2)
+    _assert_true(resp.status_code == 429, f"expected 429, got {resp.status_code}")
+    _assert_true(resp.headers["Retry-After"] == "1", "Retry-After should be rounded up to whole seconds")
+
+
+def main() -> None:
+    tests = [
+        ("burst then refill", test_burst_then_refill),
+        ("idle buckets are evicted", test_idle_buckets_are_evicted),
+        ("too many requests response", test_too_many_requests_response),
+    ]
+
+    passed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {name}: {e}")
+
+    print(f"\nResult: {passed}/{len(tests)} tests passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Simple integration-style tests for balance reconciliation.
+
+How to run (from backend/ directory):
+  python -m tests.test_reconciliation
+
+This script tests 4 cases:
+1) Wallets that match the logs produce an empty report
+2) A tampered wallet is reported (parallel workers)
+3) Finished hours are checkpointed and not re-read on the next run
+4) A recorded tranche grant is part of the expected wallet
+"""
+
+from pathlib import Path
+import shutil
+
+from storage.bankcode_store import BankCodeStore
+from storage.merchant_store import MerchantStore
+from storage.household_store import HouseholdStore
+from storage.counter_store import CounterStore
+from storage.redemption_store import RedemptionStore, REDEEM_HEADER
+from storage.checkpoint_store import CheckpointStore
+from storage.tranche_store import TrancheStore
+
+from services.merchant_service import MerchantService
+from services.household_service import HouseholdService
+from services.redemption_service import RedemptionService
+from services.reconciliation_service import ReconciliationService
+
+
+def _assert_true(cond: bool, msg: str) -> None:
+    if not cond:
+        raise AssertionError(msg)
+
+
+def _new_case_dir(case_name: str) -> Path:
+    """Create an isolated temp dir for a single test case."""
+    root = Path(__file__).resolve().parent / "_tmp_reconciliation"
+    case_dir = root / case_name
+    if case_dir.exists():
+        shutil.rmtree(case_dir)
+    case_dir.mkdir(parents=True, exist_ok=True)
+    return case_dir
+
+
+def _cleanup_all() -> None:
+    root = Path(__file__).resolve().parent / "_tmp_reconciliation"
+    if root.exists():
+        shutil.rmtree(root)
+
+
+def _make_env(tmp_dir: Path, workers: int = 1):
+    """Register one household + merchant, redeem once; returns (household_store, household, reconciler, household_service)."""
+    base_dir = Path(__file__).resolve().parents[1]
+    bank_store = BankCodeStore(base_dir / "storage" / "data" / "BankCode.csv")
+    bank_store.load()
+
+    household_store = HouseholdStore(tmp_dir / "households.json")
+    redemption_store = RedemptionStore(tmp_dir)
+
+    merchant_service = MerchantService(MerchantStore(tmp_dir / "Merchant.txt"), bank_store)
+    tranche_store = TrancheStore(tmp_dir / "tranches.jsonl")
+    household_service = HouseholdService(household_store, tranche_store=tranche_store)
+    redemption_service = RedemptionService(
+        household_service=household_service,
+        household_store=household_store,
+        merchant_service=merchant_service,
+        counter_store=CounterStore(tmp_dir / "counters.json"),
+        redemption_store=redemption_store,
+        pending_codes={},
+    )
+
+    household = household_service.register_household("H52298800781", "560123", "#06-03")
+    merchant = merchant_service.register_merchant({
+        "merchant_name": "ABC Minimart",
+        "uen": "201234567A",
+        "bank_name": "DBS Bank Ltd",
+        "bank_code": "7171",
+        "branch_code": "001",
+        "account_number": "123-456-789",
+        "account_holder_name": "ABC Minimart Pte Ltd",
+    })
+    code = redemption_service.generate_code(household.household_id, {"10": 1, "2": 3})
+    redemption_service.redeem(merchant_id=merchant.merchant_id, code=code)
+
+    reconciler = ReconciliationService(
+        household_store=household_store,
+        redemption_store=redemption_store,
+        checkpoint_store=CheckpointStore(tmp_dir / "reconcile_checkpoint.json"),
+        report_path=tmp_dir / "reconcile_report.json",
+        workers=workers,
+        tranche_store=tranche_store,
+    )
+    return household_store, household, reconciler, household_service
+
+
+def test_clean_reconciliation() -> None:
+    tmp_dir = _new_case_dir("clean")
+    _, _, reconciler, _ = _make_env(tmp_dir)
+
+    report = reconciler.run()
+
+    _assert_true(report["households_checked"] == 1, "one household should be checked")
+    _assert_true(report["discrepancy_count"] == 0, f"expected no discrepancies, got {report['discrepancies']}")
+    _assert_true((tmp_dir / "reconcile_report.json").exists(), "report file should be written")
+
+
+def test_tampered_wallet_is_reported() -> None:
+    tmp_dir = _new_case_dir("tampered")
+    household_store, household, reconciler, _ = _make_env(tmp_dir, workers=2)
+
+    household.vouchers["5"] += 1
+    household.balance += 5
+    household_store.save(household)
+
+    report = reconciler.run()
+    fields = sorted(d["field"] for d in report["discrepancies"])
+    _assert_true(fields == ["balance", "vouchers.5"], f"unexpected discrepancies: {fields}")
+
+
+def test_closed_hours_are_checkpointed() -> None:
+    tmp_dir = _new_case_dir("checkpoint")
+    household_store, household, reconciler, _ = _make_env(tmp_dir)
+
+    # An older, finished hour for the same household: one extra $5 note
+    old_file = tmp_dir / "Redeem2020010100.csv"
+    old_file.write_text(
+        ",".join(REDEEM_HEADER) + "\n"
+        + f"TX1,{household.household_id},M0001,20200101000000,V0000001,$5.00,$5.00,Completed,Final denomination used\n",
+        encoding="utf-8",
+    )
+    household.vouchers["5"] -= 1
+    household.balance -= 5
+    household_store.save(household)
+
+    first = reconciler.run()
+    _assert_true(first["discrepancy_count"] == 0, f"expected no discrepancies, got {first['discrepancies']}")
+    _assert_true(first["checkpoint_hour"] == "2020010100", "finished hour should be checkpointed")
+
+    second = reconciler.run()
+    _assert_true(old_file.name not in second["files_processed"], "checkpointed hour should not be re-read")
+    _assert_true(second["discrepancy_count"] == 0, "checkpointed tallies should still be applied")
+
+
+def test_tranche_grant_is_expected() -> None:
+    tmp_dir = _new_case_dir("tranche")
+    _, household, reconciler, household_service = _make_env(tmp_dir)
+
+    household_service.grant_tranche(household.household_id, "2026-topup")
+
+    report = reconciler.run()
+    _assert_true(report["discrepancy_count"] == 0, f"a recorded grant is not a discrepancy: {report['discrepancies']}")
+
+
+def main() -> None:
+    _cleanup_all()
+
+    tests = [
+        ("clean reconciliation", test_clean_reconciliation),
+        ("tampered wallet", test_tampered_wallet_is_reported),
+        ("closed hours checkpointed", test_closed_hours_are_checkpointed),
+        ("tranche grant expected", test_tranche_grant_is_expected),
+    ]
+
+    passed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {name}: {e}")
+
+    _cleanup_all()
+    print(f"\nResult: {passed}/{len(tests)} tests passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,17 @@ What this script tests:
 4) Reused code (single-use)
 5) Inactive merchant
 6) Insufficient vouchers at redemption time (simulate wallet change after code generation)
+7) Retried redemption with the same idempotency key returns the original result
+8) Batch redemption reports a final status per item
+9) Redemption pushes code-consumed and wallet events to the household's stream
+10) A code can be generated for an amount; the fewest exact vouchers are reserved,
+    and only positive whole-dollar amounts are accepted
+11) A completed idempotency key is journaled: a retry after a restart (single or
+    batch) returns the original result
+12) Idempotency keys are scoped per merchant and refuse a different code
+13) A retry while the first redemption is still running is refused as in
+    flight (KeyInFlightError, 409 at the API), not as a failed redemption;
+    in a batch the item is reported "pending"
 
 Notes:
 - Uses real BankCode.csv from storage/data/ for merchant registration validation.
@@ -32,6 +43,7 @@ Notes:
 
 from pathlib import Path
 import shutil
+import threading
 from datetime import datetime, timedelta
 
 from storage.bankcode_store import BankCodeStore
@@ -43,6 +55,9 @@ from storage.redemption_store import RedemptionStore
 from services.merchant_service import MerchantService
 from services.household_service import HouseholdService
 from services.redemption_service import RedemptionService
+from services.event_service import EventService
+from services.idempotency_cache import IdempotencyCache, KeyInFlightError
+from storage.idempotency_store import IdempotencyStore
 
 
 def _assert_true(cond: bool, msg: str) -> None:
@@ -238,6 +253,170 @@ def test_insufficient_vouchers_at_redemption_time() -> None:
         _assert_true("Insufficient vouchers" in str(e), "Error message should mention insufficient vouchers.")
 
 
+def test_idempotent_retry() -> None:
+    tmp_dir = _new_case_dir("idempotent_retry")
+
+    merchant_service, household_service, redemption_service, pending_codes, household, merchant = _seed_household_and_merchant(tmp_dir)
+
+    code = redemption_service.generate_code(household.household_id, {"10": 1})
+    first = redemption_service.redeem(merchant_id=merchant.merchant_id, code=code, idempotency_key="key-1")
+    again = redemption_service.redeem(merchant_id=merchant.merchant_id, code=code, idempotency_key="key-1")
+
+    _assert_true(again == first, "retry should return the original result")
+    lines = list(tmp_dir.glob("Redeem*.csv"))[0].read_text(encoding="utf-8").strip().splitlines()
+    _assert_true(len(lines) == 1 + 1, "retry must not redeem (or log) a second time")
+
+
+def test_batch_redemption() -> None:
+    tmp_dir = _new_case_dir("batch_redemption")
+
+    merchant_service, household_service, redemption_service, pending_codes, household, merchant = _seed_household_and_merchant(tmp_dir)
+
+    good = redemption_service.generate_code(household.household_id, {"5": 1})
+    results = redemption_service.redeem_batch([
+        {"idempotency_key": "a", "merchant_id": merchant.merchant_id, "code": good},
+        {"idempotency_key": "b", "merchant_id": merchant.merchant_id, "code": "000000"},
+        {"idempotency_key": "a", "merchant_id": merchant.merchant_id, "code": good},
+    ])
+
+    _assert_true([r["status"] for r in results] == ["success", "failed", "success"], f"unexpected statuses: {results}")
+    _assert_true("Invalid code" in results[1]["error"], "failed item should carry its error")
+    _assert_true(results[2]["result"] == results[0]["result"], "duplicate key in a batch should not redeem twice")
+
+
+def test_idempotency_survives_restart() -> None:
+    tmp_dir = _new_case_dir("idempotency_restart")
+    journal = IdempotencyStore(tmp_dir / "idempotency_redemptions.jsonl")
+
+    merchant_service, household_service, redemption_service, pending_codes, household, merchant = _seed_household_and_merchant(tmp_dir)
+    redemption_service.idempotency_cache = IdempotencyCache(store=journal)
+
+    code = redemption_service.generate_code(household.household_id, {"10": 1})
+    first = redemption_service.redeem(merchant_id=merchant.merchant_id, code=code, idempotency_key="key-1")
+
+    # "Restart": fresh services over the same files, cache reloaded from the journal
+    merchant_service, household_service, redemption_service, pending_codes = _make_env(tmp_dir)
+    redemption_service.idempotency_cache = IdempotencyCache(store=journal)
+    redemption_service.idempotency_cache.load()
+
+    again = redemption_service.redeem(merchant_id=merchant.merchant_id, code=code, idempotency_key="key-1")
+    _assert_true(again == first, "a retry after a restart should return the original result")
+
+    results = redemption_service.redeem_batch([
+        {"idempotency_key": "key-1", "merchant_id": merchant.merchant_id, "code": code},
+    ])
+    _assert_true(results[0]["status"] == "success", f"batch retry should replay, got {results}")
+    _assert_true(results[0]["result"] == first, "batch and single redemption should share one store")
+
+
+def test_idempotency_key_scoped_per_merchant() -> None:
+    tmp_dir = _new_case_dir("idempotency_scope")
+
+    merchant_service, household_service, redemption_service, pending_codes, household, merchant = _seed_household_and_merchant(tmp_dir)
+    other = merchant_service.register_merchant({
+        "merchant_name": "XYZ Provision",
+        "uen": "201234568B",
+        "bank_name": "DBS Bank Ltd",
+        "bank_code": "7171",
+        "branch_code": "001",
+        "account_number": "123-456-780",
+        "account_holder_name": "XYZ Provision Pte Ltd",
+        "status": "Active",
+    })
+
+    first_code = redemption_service.generate_code(household.household_id, {"10": 1})
+    second_code = redemption_service.generate_code(household.household_id, {"5": 1})
+    redemption_service.redeem(merchant_id=merchant.merchant_id, code=first_code, idempotency_key="shared")
+
+    # Same key from another merchant is a separate redemption, not a replay
+    result = redemption_service.redeem(merchant_id=other.merchant_id, code=second_code, idempotency_key="shared")
+    _assert_true(result.get("amount_redeemed") == 5, f"other merchant's key should redeem its own code, got {result}")
+
+    third_code = redemption_service.generate_code(household.household_id, {"2": 1})
+    try:
+        redemption_service.redeem(merchant_id=merchant.merchant_id, code=third_code, idempotency_key="shared")
+        raise AssertionError("reusing a key for a different code should be refused")
+    except ValueError as e:
+        _assert_true("different redemption" in str(e), f"unexpected error: {e}")
+    _assert_true(third_code in pending_codes, "the refused code must stay redeemable")
+
+
+def test_retry_while_in_flight() -> None:
+    tmp_dir = _new_case_dir("idempotency_in_flight")
+
+    merchant_service, household_service, redemption_service, pending_codes, household, merchant = _seed_household_and_merchant(tmp_dir)
+    code = redemption_service.generate_code(household.household_id, {"10": 1})
+    appended, release = threading.Event(), threading.Event()
+
+    def block_first_append(file_name, offset, row):
+        appended.set()
+        release.wait(5)
+
+    redemption_service.redemption_store.add_listener(block_first_append)
+    results = []
+    first = threading.Thread(target=lambda: results.append(
+        redemption_service.redeem(merchant_id=merchant.merchant_id, code=code, idempotency_key="key-1")))
+    first.start()
+    try:
+        _assert_true(appended.wait(5), "the first redemption should be running")
+        try:
+            redemption_service.redeem(merchant_id=merchant.merchant_id, code=code, idempotency_key="key-1")
+            raise AssertionError("a retry while the first is running should be refused")
+        except KeyInFlightError:
+            pass
+        batch = redemption_service.redeem_batch([
+            {"idempotency_key": "key-1", "merchant_id": merchant.merchant_id, "code": code},
+        ])
+        _assert_true(batch[0]["status"] == "pending", f"an in-flight batch item should stay pending, got {batch}")
+    finally:
+        release.set()
+        first.join()
+
+    again = redemption_service.redeem(merchant_id=merchant.merchant_id, code=code, idempotency_key="key-1")
+    _assert_true(again == results[0], "after the first finishes, the retry should get its result")
+
+
+def test_redemption_publishes_events() -> None:
+    tmp_dir = _new_case_dir("redemption_events")
+
+    merchant_service, household_service, redemption_service, pending_codes, household, merchant = _seed_household_and_merchant(tmp_dir)
+    redemption_service.event_service = EventService()
+    subscription = redemption_service.event_service.subscribe(household.household_id)
+
+    code = redemption_service.generate_code(household.household_id, {"10": 1})
+    redemption_service.redeem(merchant_id=merchant.merchant_id, code=code)
+
+    consumed = subscription.next(timeout=1)
+    wallet = subscription.next(timeout=1)
+    _assert_true("event: code_consumed" in consumed and code in consumed, "code_consumed event should name the code")
+    _assert_true("event: wallet" in wallet and f'"balance": {household.balance}' in wallet, "wallet event should carry the new balance")
+    _assert_true('"changed": {"10": -1}' in wallet, "wallet event should carry the delta")
+
+
+def test_generate_code_for_amount() -> None:
+    tmp_dir = _new_case_dir("redemption_amount")
+
+    merchant_service, household_service, redemption_service, pending_codes, household, merchant = _seed_household_and_merchant(tmp_dir)
+
+    code, vouchers = redemption_service.generate_code_for_amount(household.household_id, 17)
+    _assert_true(vouchers == {"10": 1, "5": 1, "2": 1}, f"expected 10+5+2, got {vouchers}")
+    _assert_true(pending_codes[code]["vouchers"] == vouchers, "the chosen vouchers should be reserved under the code")
+
+    try:
+        redemption_service.generate_code_for_amount(household.household_id, household.balance + 1)
+        raise AssertionError("an amount above the balance should be rejected")
+    except ValueError as e:
+        _assert_true("Insufficient balance" in str(e), f"unexpected error: {e}")
+
+    for amount in (12.7, True, 0, -5):
+        try:
+            redemption_service.generate_code_for_amount(household.household_id, amount)
+            raise AssertionError(f"amount {amount!r} should be rejected")
+        except ValueError as e:
+            _assert_true("whole number" in str(e), f"unexpected error for {amount!r}: {e}")
+    _assert_true(len(pending_codes) == 1, "a rejected amount must not reserve a code")
+
+
 def main() -> None:
     _cleanup_all()
 
@@ -248,6 +427,13 @@ def main() -> None:
         ("reused code", test_reused_code),
         ("inactive merchant", test_inactive_merchant),
         ("insufficient vouchers at redemption", test_insufficient_vouchers_at_redemption_time),
+        ("idempotent retry", test_idempotent_retry),
+        ("batch redemption", test_batch_redemption),
+        ("redemption publishes events", test_redemption_publishes_events),
+        ("generate code for amount", test_generate_code_for_amount),
+        ("idempotency survives restart", test_idempotency_survives_restart),
+        ("idempotency key scoped per merchant", test_idempotency_key_scoped_per_merchant),
+        ("retry while in flight", test_retry_while_in_flight),
     ]
 
     passed = 0
@@ -0,0 +1,177 @@
+"""
+Simple integration-style tests for the binary startup snapshot.
+
+How to run (from backend/ directory):
+  python -m tests.test_snapshot
+
+This script tests 4 cases:
+1) A fresh snapshot restores households, merchants and bank pairs
+2) Changing a source file makes the snapshot stale (fall back to text files)
+3) A corrupt or foreign file is ignored
+4) A write landing while the state is captured leaves the snapshot stale, not "current"
+"""
+
+from pathlib import Path
+import shutil
+
+from storage.bankcode_store import BankCodeStore
+from storage.merchant_store import MerchantStore
+from storage.household_store import HouseholdStore
+from storage.snapshot_store import SnapshotStore
+from models.household import Household
+
+from services.merchant_service import MerchantService
+from services.household_service import HouseholdService
+from services.snapshot_service import SnapshotService
+
+
+def _assert_true(cond: bool, msg: str) -> None:
+    if not cond:
+        raise AssertionError(msg)
+
+
+def _new_case_dir(case_name: str) -> Path:
+    """Create an isolated temp dir (with its own copy of BankCode.csv)."""
+    root = Path(__file__).resolve().parent / "_tmp_snapshot"
+    case_dir = root / case_name
+    if case_dir.exists():
+        shutil.rmtree(case_dir)
+    case_dir.mkdir(parents=True, exist_ok=True)
+    base_dir = Path(__file__).resolve().parents[1]
+    shutil.copy(base_dir / "storage" / "data" / "BankCode.csv", case_dir / "BankCode.csv")
+    return case_dir
+
+
+def _cleanup_all() -> None:
+    root = Path(__file__).resolve().parent / "_tmp_snapshot"
+    if root.exists():
+        shutil.rmtree(root)
+
+
+def _make_env(tmp_dir: Path):
+    """Returns (snapshot_service, household_service, merchant_service, bank_store) with nothing loaded yet."""
+    bank_store = BankCodeStore(tmp_dir / "BankCode.csv")
+    merchant_store = MerchantStore(tmp_dir / "Merchant.txt")
+    household_store = HouseholdStore(tmp_dir / "households.json")
+
+    merchant_service = MerchantService(merchant_store, bank_store)
+    household_service = HouseholdService(household_store)
+    snapshot_service = SnapshotService(
+        SnapshotStore(
+            tmp_dir / "state.snapshot",
+            [bank_store.bankcode_csv_path, merchant_store.merchant_file_path, household_store.household_file_path],
+        ),
+        household_service, merchant_service, bank_store,
+    )
+    return snapshot_service, household_service, merchant_service, bank_store
+
+
+def _seed_and_save(tmp_dir: Path):
+    snapshot_service, household_service, merchant_service, bank_store = _make_env(tmp_dir)
+    bank_store.load()
+    household_service.register_household("H52298800781", "560123", "#06-03")
+    merchant_service.register_merchant({
+        "merchant_name": "ABC Minimart",
+        "uen": "201234567A",
+        "bank_name": "DBS Bank Ltd",
+        "bank_code": "7171",
+        "branch_code": "001",
+        "account_number": "123-456-789",
+        "account_holder_name": "ABC Minimart Pte Ltd",
+    })
+    snapshot_service.save()
+    return household_service
+
+
+def test_restore_from_snapshot() -> None:
+    tmp_dir = _new_case_dir("restore")
+    original = _seed_and_save(tmp_dir)
+
+    snapshot_service, household_service, merchant_service, bank_store = _make_env(tmp_dir)
+    _assert_true(snapshot_service.restore(), "fresh snapshot should be used")
+    _assert_true(household_service.households_by_id == original.households_by_id, "households should match")
+    _assert_true("201234567A" in merchant_service.merchants_by_uen, "merchant UEN index should be restored")
+    _assert_true(bank_store.is_valid("7171", "001"), "bank pairs should be restored")
+    _assert_true(household_service.liabilities() == original.liabilities(), "liability counters should be rebuilt")
+
+
+def test_stale_snapshot_is_ignored() -> None:
+    tmp_dir = _new_case_dir("stale")
+    _seed_and_save(tmp_dir)
+
+    with (tmp_dir / "Merchant.txt").open("a", encoding="utf-8") as f:
+        f.write("M0002,Other Shop,201299999B,DBS Bank Ltd,7171,001,1,Other,2026-01-01,Active\n")
+
+    snapshot_service, _, _, _ = _make_env(tmp_dir)
+    _assert_true(not snapshot_service.restore(), "snapshot older than Merchant.txt should be rejected")
+
+
+def test_corrupt_snapshot_is_ignored() -> None:
+    tmp_dir = _new_case_dir("corrupt")
+    _seed_and_save(tmp_dir)
+
+    snapshot_path = tmp_dir / "state.snapshot"
+    data = snapshot_path.read_bytes()
+    snapshot_path.write_bytes(data[:40])
+    snapshot_service, _, _, _ = _make_env(tmp_dir)
+    _assert_true(not snapshot_service.restore(), "truncated snapshot should be rejected")
+
+    snapshot_path.write_bytes(b"not a snapshot")
+    _assert_true(not snapshot_service.restore(), "foreign file should be rejected")
+
+
+class _WriteDuringCapture(dict):
+    """households_by_id whose capture is followed by a registration reaching households.json."""
+
+    def __init__(self, data, household_store):
+        super().__init__(data)
+        self.household_store = household_store
+
+    def values(self):
+        captured = list(super().values())
+        late = Household.from_dict({**captured[0].to_dict(), "household_id": "H52298800782"})
+        self.household_store.save(late)
+        return captured
+
+
+def test_write_during_capture_makes_snapshot_stale() -> None:
+    tmp_dir = _new_case_dir("write_during_capture")
+    snapshot_service, household_service, _, bank_store = _make_env(tmp_dir)
+    bank_store.load()
+    household_service.register_household("H52298800781", "560123", "#06-03")
+
+    household_service.households_by_id = _WriteDuringCapture(
+        household_service.households_by_id, household_service.household_store
+    )
+    snapshot_service.save()
+
+    snapshot_service, _, _, _ = _make_env(tmp_dir)
+    _assert_true(not snapshot_service.restore(),
+                 "a snapshot missing a household that is already in households.json must not pass for current")
+
+
+def main() -> None:
+    _cleanup_all()
+
+    tests = [
+        ("restore from snapshot", test_restore_from_snapshot),
+        ("stale snapshot ignored", test_stale_snapshot_is_ignored),
+        ("corrupt snapshot ignored", test_corrupt_snapshot_is_ignored),
+        ("write during capture makes snapshot stale", test_write_during_capture_makes_snapshot_stale),
+    ]
+
+    passed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {name}: {e}")
+
+    _cleanup_all()
+    print(f"\nResult: {passed}/{len(tests)} tests passed.")
+
+
+if __name__ == "__main__":
+    main()
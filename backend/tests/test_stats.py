@@ -0,0 +1,221 @@
+"""
+Simple integration-style tests for live redemption statistics.
+
+How to run (from backend/ directory):
+  python -m tests.test_stats
+
+This script tests 5 cases:
+1) redeem() updates the minute/hour counters
+2) A restart rebuilds counters from the checkpoint plus the log tail
+3) A restart without checkpoint rebuilds counters from the full log
+4) A checkpoint requested while a redemption is being logged waits for it,
+   so its log position never covers rows the counters have not seen
+5) Redemptions never write the checkpoint; the periodic timer does
+"""
+
+from pathlib import Path
+import shutil
+import threading
+import time
+
+from storage.bankcode_store import BankCodeStore
+from storage.merchant_store import MerchantStore
+from storage.household_store import HouseholdStore
+from storage.counter_store import CounterStore
+from storage.redemption_store import RedemptionStore
+from storage.checkpoint_store import CheckpointStore
+
+from services.merchant_service import MerchantService
+from services.household_service import HouseholdService
+from services.redemption_service import RedemptionService
+from services.stats_service import StatsService
+
+
+def _assert_true(cond: bool, msg: str) -> None:
+    if not cond:
+        raise AssertionError(msg)
+
+
+def _new_case_dir(case_name: str) -> Path:
+    """Create an isolated temp dir for a single test case."""
+    root = Path(__file__).resolve().parent / "_tmp_stats"
+    case_dir = root / case_name
+    if case_dir.exists():
+        shutil.rmtree(case_dir)
+    case_dir.mkdir(parents=True, exist_ok=True)
+    return case_dir
+
+
+def _cleanup_all() -> None:
+    root = Path(__file__).resolve().parent / "_tmp_stats"
+    if root.exists():
+        shutil.rmtree(root)
+
+
+def _make_env(tmp_dir: Path):
+    """Build stores/services like app.py; returns (redemption_service, stats_service, household, merchant)."""
+    base_dir = Path(__file__).resolve().parents[1]
+    bank_store = BankCodeStore(base_dir / "storage" / "data" / "BankCode.csv")
+    bank_store.load()
+
+    household_store = HouseholdStore(tmp_dir / "households.json")
+    redemption_store = RedemptionStore(tmp_dir)
+
+    merchant_service = MerchantService(MerchantStore(tmp_dir / "Merchant.txt"), bank_store)
+    household_service = HouseholdService(household_store)
+    stats_service = StatsService(redemption_store, CheckpointStore(tmp_dir / "stats_checkpoint.json"))
+    stats_service.bootstrap()
+
+    redemption_service = RedemptionService(
+        household_service=household_service,
+        household_store=household_store,
+        merchant_service=merchant_service,
+        counter_store=CounterStore(tmp_dir / "counters.json"),
+        redemption_store=redemption_store,
+        pending_codes={},
+        stats_service=stats_service,
+    )
+
+    household = household_service.register_household("H52298800781", "560123", "#06-03")
+    merchant = merchant_service.register_merchant({
+        "merchant_name": "ABC Minimart",
+        "uen": "201234567A",
+        "bank_name": "DBS Bank Ltd",
+        "bank_code": "7171",
+        "branch_code": "001",
+        "account_number": "123-456-789",
+        "account_holder_name": "ABC Minimart Pte Ltd",
+    })
+    return redemption_service, stats_service, household, merchant
+
+
+def _redeem(redemption_service, household, merchant, vouchers: dict) -> None:
+    code = redemption_service.generate_code(household.household_id, vouchers)
+    redemption_service.redeem(merchant_id=merchant.merchant_id, code=code)
+
+
+def _current_hour(stats_service: StatsService) -> dict:
+    return stats_service.snapshot()["per_hour"][-1]
+
+
+def test_redeem_updates_counters() -> None:
+    tmp_dir = _new_case_dir("live")
+    redemption_service, stats_service, household, merchant = _make_env(tmp_dir)
+
+    _redeem(redemption_service, household, merchant, {"10": 1, "5": 2})
+
+    hour = _current_hour(stats_service)
+    minute = stats_service.snapshot()["per_minute"][-1]
+    _assert_true(hour["count"] == 1 and hour["amount"] == 20, f"unexpected hour bucket: {hour}")
+    _assert_true(hour["denominations"] == {"10": 1, "5": 2}, "denomination counts should be per note")
+    _assert_true(hour["merchants"][merchant.merchant_id]["amount"] == 20, "merchant amount should be 20")
+    _assert_true(minute["count"] == 1, "minute bucket should also be updated")
+
+
+def test_restart_replays_log_tail() -> None:
+    tmp_dir = _new_case_dir("checkpoint")
+    redemption_service, stats_service, household, merchant = _make_env(tmp_dir)
+
+    _redeem(redemption_service, household, merchant, {"10": 1})
+    stats_service.checkpoint()
+    _redeem(redemption_service, household, merchant, {"2": 3})  # only in the log tail
+
+    restarted = StatsService(redemption_service.redemption_store, CheckpointStore(tmp_dir / "stats_checkpoint.json"))
+    restarted.bootstrap()
+
+    hour = _current_hour(restarted)
+    _assert_true(hour["count"] == 2 and hour["amount"] == 16, f"unexpected hour bucket after restart: {hour}")
+    _assert_true(hour["denominations"] == {"10": 1, "2": 3}, f"unexpected denominations: {hour['denominations']}")
+
+
+def test_restart_without_checkpoint() -> None:
+    tmp_dir = _new_case_dir("no_checkpoint")
+    redemption_service, stats_service, household, merchant = _make_env(tmp_dir)
+
+    _redeem(redemption_service, household, merchant, {"5": 1})
+    _redeem(redemption_service, household, merchant, {"5": 1})
+    (tmp_dir / "stats_checkpoint.json").unlink()
+
+    restarted = StatsService(redemption_service.redemption_store, CheckpointStore(tmp_dir / "stats_checkpoint.json"))
+    restarted.bootstrap()
+
+    hour = _current_hour(restarted)
+    _assert_true(hour["count"] == 2 and hour["amount"] == 10, f"unexpected hour bucket after rebuild: {hour}")
+
+
+def test_checkpoint_during_redemption() -> None:
+    tmp_dir = _new_case_dir("checkpoint_race")
+    redemption_service, stats_service, household, merchant = _make_env(tmp_dir)
+    checkpointers = []
+
+    def checkpoint_after_append(file_name, offset, row):
+        # A periodic checkpoint firing after the log append but before record()
+        if not checkpointers:
+            checkpointer = threading.Thread(target=stats_service.checkpoint)
+            checkpointers.append(checkpointer)
+            checkpointer.start()
+            checkpointer.join(0.2)
+
+    redemption_service.redemption_store.add_listener(checkpoint_after_append)
+    _redeem(redemption_service, household, merchant, {"10": 1})
+    checkpointers[0].join()
+
+    restarted = StatsService(redemption_service.redemption_store, CheckpointStore(tmp_dir / "stats_checkpoint.json"))
+    restarted.bootstrap()
+
+    hour = _current_hour(restarted)
+    _assert_true(hour["count"] == 1 and hour["amount"] == 10, f"redemption lost across the checkpoint: {hour}")
+
+
+def test_checkpoint_off_redeem_path() -> None:
+    tmp_dir = _new_case_dir("periodic")
+    redemption_service, stats_service, household, merchant = _make_env(tmp_dir)
+    saves = []
+    save = stats_service.checkpoint_store.save
+    stats_service.checkpoint_store.save = lambda data: (saves.append(1), save(data))
+
+    for _ in range(3):
+        _redeem(redemption_service, household, merchant, {"2": 1})
+    _assert_true(saves == [], "redeem must not write the checkpoint")
+
+    stats_service.start_periodic(0.05)
+    try:
+        for _ in range(100):
+            if saves:
+                break
+            time.sleep(0.02)
+    finally:
+        stats_service._timer.cancel()
+    _assert_true(saves, "the periodic timer should write the checkpoint")
+
+    restarted = StatsService(redemption_service.redemption_store, CheckpointStore(tmp_dir / "stats_checkpoint.json"))
+    restarted.bootstrap()
+    _assert_true(_current_hour(restarted)["count"] == 3, "the timer's checkpoint should cover every redemption")
+
+
+def main() -> None:
+    _cleanup_all()
+
+    tests = [
+        ("redeem updates counters", test_redeem_updates_counters),
+        ("restart replays log tail", test_restart_replays_log_tail),
+        ("restart without checkpoint", test_restart_without_checkpoint),
+        ("checkpoint during redemption", test_checkpoint_during_redemption),
+        ("checkpoint off the redeem path", test_checkpoint_off_redeem_path),
+    ]
+
+    passed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {name}: {e}")
+
+    _cleanup_all()
+    print(f"\nResult: {passed}/{len(tests)} tests passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Simple integration-style tests for the per-household transaction index.
+
+How to run (from backend/ directory):
+  python -m tests.test_transaction_history
+
+This script tests 6 cases:
+1) Redemptions are indexed as they are logged and returned newest first
+2) A missing index is rebuilt from the logs (parallel workers)
+3) Rows logged after the index was last written are caught up on bootstrap
+4) Merchant history pages are stable while new redemptions arrive
+5) A restart with a non-empty household index resumes after its last row
+6) A restart with a non-empty merchant index resumes after its last row
+"""
+
+from pathlib import Path
+import shutil
+
+from storage.bankcode_store import BankCodeStore
+from storage.merchant_store import MerchantStore
+from storage.household_store import HouseholdStore
+from storage.counter_store import CounterStore
+from storage.redemption_store import RedemptionStore, REDEEM_HEADER
+from storage.log_index_store import LogIndexStore
+
+from services.merchant_service import MerchantService
+from services.household_service import HouseholdService
+from services.redemption_service import RedemptionService
+from services.transaction_history_service import TransactionHistoryService
+
+
+def _assert_true(cond: bool, msg: str) -> None:
+    if not cond:
+        raise AssertionError(msg)
+
+
+def _new_case_dir(case_name: str) -> Path:
+    """Create an isolated temp dir for a single test case."""
+    root = Path(__file__).resolve().parent / "_tmp_history"
+    case_dir = root / case_name
+    if case_dir.exists():
+        shutil.rmtree(case_dir)
+    case_dir.mkdir(parents=True, exist_ok=True)
+    return case_dir
+
+
+def _cleanup_all() -> None:
+    root = Path(__file__).resolve().parent / "_tmp_history"
+    if root.exists():
+        shutil.rmtree(root)
+
+
+def _make_env(tmp_dir: Path):
+    """Returns (redemption_service, history_service, household, merchant)."""
+    base_dir = Path(__file__).resolve().parents[1]
+    bank_store = BankCodeStore(base_dir / "storage" / "data" / "BankCode.csv")
+    bank_store.load()
+
+    household_store = HouseholdStore(tmp_dir / "households.json")
+    redemption_store = RedemptionStore(tmp_dir)
+
+    merchant_service = MerchantService(MerchantStore(tmp_dir / "Merchant.txt"), bank_store)
+    household_service = HouseholdService(household_store)
+    history_service = TransactionHistoryService(
+        redemption_store,
+        LogIndexStore(tmp_dir / "household_tx_index.csv"),
+        LogIndexStore(tmp_dir / "merchant_tx_index.csv"),
+    )
+    history_service.bootstrap()
+
+    redemption_service = RedemptionService(
+        household_service=household_service,
+        household_store=household_store,
+        merchant_service=merchant_service,
+        counter_store=CounterStore(tmp_dir / "counters.json"),
+        redemption_store=redemption_store,
+        pending_codes={},
+    )
+
+    household = household_service.register_household("H52298800781", "560123", "#06-03")
+    merchant = merchant_service.register_merchant({
+        "merchant_name": "ABC Minimart",
+        "uen": "201234567A",
+        "bank_name": "DBS Bank Ltd",
+        "bank_code": "7171",
+        "branch_code": "001",
+        "account_number": "123-456-789",
+        "account_holder_name": "ABC Minimart Pte Ltd",
+    })
+    return redemption_service, history_service, household, merchant
+
+
+def _redeem(redemption_service, household, merchant, vouchers: dict) -> dict:
+    code = redemption_service.generate_code(household.household_id, vouchers)
+    return redemption_service.redeem(merchant_id=merchant.merchant_id, code=code)
+
+
+def test_history_is_indexed_on_append() -> None:
+    tmp_dir = _new_case_dir("append")
+    redemption_service, history_service, household, merchant = _make_env(tmp_dir)
+
+    first = _redeem(redemption_service, household, merchant, {"10": 1, "5": 2})
+    second = _redeem(redemption_service, household, merchant, {"2": 1})
+
+    history = history_service.transactions_for_household(household.household_id)
+    _assert_true([t["transaction_id"] for t in history] == [second["transaction_id"], first["transaction_id"]],
+                 "history should list both transactions, newest first")
+    _assert_true(history[1]["vouchers"] == {"10": 1, "5": 2}, f"unexpected vouchers: {history[1]['vouchers']}")
+    _assert_true(history_service.transactions_for_household("H00000000000") == [], "unknown household has no history")
+
+
+def test_missing_index_is_rebuilt() -> None:
+    tmp_dir = _new_case_dir("rebuild")
+    redemption_service, _, household, merchant = _make_env(tmp_dir)
+    _redeem(redemption_service, household, merchant, {"10": 1})
+
+    # A second, older hour file so the rebuild has more than one file to fan out
+    (tmp_dir / "Redeem2020010100.csv").write_text(
+        ",".join(REDEEM_HEADER) + "\n"
+        + f"TX1,{household.household_id},M0001,20200101000000,V0000001,$5.00,$5.00,Completed,Final denomination used\n",
+        encoding="utf-8",
+    )
+    (tmp_dir / "household_tx_index.csv").unlink()
+
+    rebuilt = TransactionHistoryService(
+        RedemptionStore(tmp_dir),
+        LogIndexStore(tmp_dir / "household_tx_index.csv"),
+        LogIndexStore(tmp_dir / "merchant_tx_index.csv"),
+        workers=2,
+    )
+    rebuilt.bootstrap()
+
+    history = rebuilt.transactions_for_household(household.household_id)
+    _assert_true(len(history) == 2, f"expected 2 transactions after rebuild, got {len(history)}")
+    _assert_true(history[-1]["transaction_id"] == "TX1", "oldest transaction should come last")
+
+
+def test_bootstrap_catches_up() -> None:
+    tmp_dir = _new_case_dir("catch_up")
+    redemption_service, _, household, merchant = _make_env(tmp_dir)
+    _redeem(redemption_service, household, merchant, {"10": 1})
+
+    # Simulate a crash after the log row was written but before it was indexed
+    index_path = tmp_dir / "household_tx_index.csv"
+    index_path.write_text("", encoding="utf-8")
+
+    restarted = TransactionHistoryService(RedemptionStore(tmp_dir), LogIndexStore(index_path), LogIndexStore(tmp_dir / "merchant_tx_index.csv"))
+    restarted.bootstrap()
+
+    _assert_true(len(restarted.transactions_for_household(household.household_id)) == 1,
+                 "unindexed rows should be picked up on bootstrap")
+
+
+def _drop_last_index_line(index_path: Path) -> None:
+    """Simulate a crash after the last log row was written but before it was indexed."""
+    lines = index_path.read_text(encoding="utf-8").splitlines(keepends=True)
+    index_path.write_text("".join(lines[:-1]), encoding="utf-8")
+
+
+def test_household_restart_resumes_after_last_row() -> None:
+    tmp_dir = _new_case_dir("household_restart")
+    redemption_service, _, household, merchant = _make_env(tmp_dir)
+    tx_ids = [_redeem(redemption_service, household, merchant, {"10": 1})["transaction_id"] for _ in range(2)]
+
+    index_path = tmp_dir / "household_tx_index.csv"
+    _drop_last_index_line(index_path)
+
+    for _ in range(2):  # the second restart starts from a caught-up index
+        index = LogIndexStore(index_path)
+        restarted = TransactionHistoryService(RedemptionStore(tmp_dir), index, LogIndexStore(tmp_dir / "merchant_tx_index.csv"))
+        restarted.bootstrap()
+        _assert_true(len(index.lookup(household.household_id)) == 2,
+                     f"each log row should be indexed once: {index.lookup(household.household_id)}")
+
+    seen = [t["transaction_id"] for t in restarted.transactions_for_household(household.household_id)]
+    _assert_true(seen == tx_ids[::-1], f"restart should not add phantom transactions: {seen}")
+
+
+def test_merchant_restart_resumes_after_last_row() -> None:
+    tmp_dir = _new_case_dir("merchant_restart")
+    redemption_service, _, household, merchant = _make_env(tmp_dir)
+    tx_ids = [_redeem(redemption_service, household, merchant, {"10": 1})["transaction_id"] for _ in range(2)]
+
+    index_path = tmp_dir / "merchant_tx_index.csv"
+    _drop_last_index_line(index_path)
+
+    for _ in range(2):
+        index = LogIndexStore(index_path)
+        restarted = TransactionHistoryService(RedemptionStore(tmp_dir), LogIndexStore(tmp_dir / "household_tx_index.csv"), index)
+        restarted.bootstrap()
+        _assert_true(len(index.lookup(merchant.merchant_id)) == 2,
+                     f"each log row should be indexed once: {index.lookup(merchant.merchant_id)}")
+
+    page = restarted.redemptions_for_merchant(merchant.merchant_id)
+    seen = [t["transaction_id"] for t in page["redemptions"]]
+    _assert_true(seen == tx_ids[::-1], f"restart should not add phantom merchant rows: {seen}")
+
+
+def test_merchant_pagination() -> None:
+    tmp_dir = _new_case_dir("pagination")
+    redemption_service, history_service, household, merchant = _make_env(tmp_dir)
+
+    tx_ids = [_redeem(redemption_service, household, merchant, {"2": 2})["transaction_id"] for _ in range(5)]
+
+    page1 = history_service.redemptions_for_merchant(merchant.merchant_id, limit=2)
+    _redeem(redemption_service, household, merchant, {"5": 1})  # arrives between page fetches
+    page2 = history_service.redemptions_for_merchant(merchant.merchant_id, cursor=page1["next_cursor"], limit=2)
+    page3 = history_service.redemptions_for_merchant(merchant.merchant_id, cursor=page2["next_cursor"], limit=2)
+
+    seen = [t["transaction_id"] for page in (page1, page2, page3) for t in page["redemptions"]]
+    _assert_true(seen == tx_ids[::-1], f"pages should walk history newest first without gaps: {seen}")
+    _assert_true(page1["redemptions"][0]["vouchers"] == {"2": 2}, "multi-note transaction should not be split")
+    _assert_true(page3["next_cursor"] is None, "last page should have no next_cursor")
+
+    try:
+        history_service.redemptions_for_merchant(merchant.merchant_id, cursor="garbage")
+        raise AssertionError("Expected ValueError for a malformed cursor.")
+    except ValueError as e:
+        _assert_true("Invalid cursor" in str(e), "Error message should mention invalid cursor.")
+
+
+def main() -> None:
+    _cleanup_all()
+
+    tests = [
+        ("history indexed on append", test_history_is_indexed_on_append),
+        ("missing index rebuilt", test_missing_index_is_rebuilt),
+        ("bootstrap catches up", test_bootstrap_catches_up),
+        ("merchant pagination", test_merchant_pagination),
+        ("household restart resumes after last row", test_household_restart_resumes_after_last_row),
+        ("merchant restart resumes after last row", test_merchant_restart_resumes_after_last_row),
+    ]
+
+    passed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {name}: {e}")
+
+    _cleanup_all()
+    print(f"\nResult: {passed}/{len(tests)} tests passed.")
+
+
+if __name__ == "__main__":
+    main()
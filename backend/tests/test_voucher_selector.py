@@ -0,0 +1,96 @@
+"""
+Simple unit-style tests for voucher selection by amount.
+
+How to run (from backend/ directory):
+  python -m tests.test_voucher_selector
+
+This script tests 3 cases:
+1) Every reachable amount is matched exactly with the fewest notes (checked by brute force)
+2) A very large wallet is cheap to search; amounts outside 1..MAX_SELECTION_AMOUNT are rejected
+3) Only positive whole-dollar amounts are accepted (no bools, fractions, zero or negatives)
+"""
+
+import itertools
+
+from services.voucher_selector import select_vouchers, whole_dollars, MAX_SELECTION_AMOUNT
+
+
+def _assert_true(cond: bool, msg: str) -> None:
+    if not cond:
+        raise AssertionError(msg)
+
+
+def _fewest_notes_brute_force(wallet, amount):
+    best = None
+    denoms = sorted(wallet, key=int)
+    for counts in itertools.product(*(range(wallet[d] + 1) for d in denoms)):
+        if sum(int(d) * c for d, c in zip(denoms, counts)) == amount:
+            notes = sum(counts)
+            best = notes if best is None else min(best, notes)
+    return best
+
+
+def test_exact_and_fewest_notes() -> None:
+    wallet = {"2": 6, "5": 3, "10": 2}
+    for amount in range(1, 50):
+        selection = select_vouchers(wallet, amount)
+        expected = _fewest_notes_brute_force(wallet, amount)
+        if expected is None:
+            _assert_true(selection is None, f"${amount} is unreachable, got {selection}")
+            continue
+        _assert_true(sum(int(d) * q for d, q in selection.items()) == amount, f"${amount}: {selection} does not add up")
+        _assert_true(all(q <= wallet[d] for d, q in selection.items()), f"${amount}: {selection} exceeds the wallet")
+        _assert_true(sum(selection.values()) == expected, f"${amount}: expected {expected} notes, got {selection}")
+
+
+def test_large_wallet_and_bounds() -> None:
+    wallet = {"2": 1_000_000, "5": 1_000_000, "10": 1_000_000}
+    selection = select_vouchers(wallet, MAX_SELECTION_AMOUNT)
+    _assert_true(selection == {"10": MAX_SELECTION_AMOUNT // 10}, f"unexpected selection: {selection}")
+    for amount in (0, -5, MAX_SELECTION_AMOUNT + 1):
+        try:
+            select_vouchers(wallet, amount)
+            raise AssertionError(f"amount {amount} should be rejected")
+        except ValueError:
+            pass
+
+
+def test_whole_dollars_only() -> None:
+    for amount, expected in ((12, 12), (12.0, 12), ("12", 12), (" 7 ", 7)):
+        _assert_true(whole_dollars(amount) == expected, f"{amount!r} should be accepted as {expected}")
+
+    for amount in (True, False, 12.7, 0, -3, 0.0, "12.5", "-4", "", None, [12]):
+        try:
+            whole_dollars(amount)
+            raise AssertionError(f"{amount!r} should be rejected")
+        except ValueError as e:
+            _assert_true("whole number" in str(e), f"unexpected error for {amount!r}: {e}")
+
+    try:
+        select_vouchers({"10": 1}, True)
+        raise AssertionError("True must not be treated as $1")
+    except ValueError:
+        pass
+
+
+def main() -> None:
+    tests = [
+        ("exact and fewest notes", test_exact_and_fewest_notes),
+        ("large wallet and bounds", test_large_wallet_and_bounds),
+        ("whole dollars only", test_whole_dollars_only),
+    ]
+
+    passed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {name}: {e}")
+
+    print(f"\nResult: {passed}/{len(tests)} tests passed.")
+
+
+if __name__ == "__main__":
+    main()
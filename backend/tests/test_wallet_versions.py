@@ -0,0 +1,125 @@
+"""
+Simple unit-style tests for wallet versions and delta enquiries.
+
+How to run (from backend/ directory):
+  python -m tests.test_wallet_versions
+
+This script tests 3 cases:
+1) Every wallet mutation bumps the version, and versions survive a round trip
+2) wallet_since() answers not_modified, a delta, or the full wallet
+3) A household saved before versioning loads as version 0
+"""
+
+from pathlib import Path
+import shutil
+
+from models.household import Household
+from storage.household_store import HouseholdStore
+from storage.tranche_store import TrancheStore
+from services.household_service import HouseholdService
+
+
+class _NullStore(HouseholdStore):
+    def __init__(self):
+        super().__init__(None)
+
+    def save(self, household):
+        pass
+
+
+def _assert_true(cond: bool, msg: str) -> None:
+    if not cond:
+        raise AssertionError(msg)
+
+
+def _new_case_dir(case_name: str) -> Path:
+    """Create an isolated temp dir for a single test case."""
+    root = Path(__file__).resolve().parent / "_tmp_wallet_versions"
+    case_dir = root / case_name
+    if case_dir.exists():
+        shutil.rmtree(case_dir)
+    case_dir.mkdir(parents=True, exist_ok=True)
+    return case_dir
+
+
+def _cleanup_all() -> None:
+    root = Path(__file__).resolve().parent / "_tmp_wallet_versions"
+    if root.exists():
+        shutil.rmtree(root)
+
+
+def test_version_bumped_on_every_mutation() -> None:
+    tmp_dir = _new_case_dir("mutations")
+    service = HouseholdService(_NullStore(), tranche_store=TrancheStore(tmp_dir / "tranches.jsonl"))
+    household = service.register_household("H52298800781", "560123", "#06-01")
+    _assert_true(household.version == 1, f"a new household should be version 1, got {household.version}")
+
+    service.grant_tranche("H52298800781", "2026-topup")
+    _assert_true(household.version == 2, f"a tranche should bump the version, got {household.version}")
+    _assert_true(household.voucher_versions == {"2": 2, "5": 2, "10": 2},
+                 f"every credited denomination should carry the new version: {household.voucher_versions}")
+
+    service.deduct_balance("H52298800781", 5)
+    _assert_true(household.version == 3, f"a deduction should bump the version, got {household.version}")
+
+    restored = Household.from_dict(household.to_dict())
+    _assert_true((restored.version, restored.voucher_versions) == (3, household.voucher_versions),
+                 "versions should survive to_dict/from_dict")
+
+
+def test_wallet_since() -> None:
+    service = HouseholdService(_NullStore())
+    household = service.register_household("H52298800781", "560123", "#06-01")
+    household.vouchers["10"] -= 1  # as RedemptionService deducts one $10 note
+    household.bump_version(["10"])
+
+    _assert_true(service.wallet_since(household, 2) == {"status": "not_modified", "version": 2},
+                 "a client at the current version should get not_modified")
+
+    delta = service.wallet_since(household, 1)
+    _assert_true(delta["delta"] is True, "a client one version behind should get a delta")
+    _assert_true(delta["vouchers"] == {"10": household.vouchers["10"]}, f"delta should hold only $10: {delta['vouchers']}")
+    _assert_true(delta["balance"] == household.balance, "delta should carry the balance")
+
+    # No since_version, or a client ahead of the server: full wallet
+    for since in (None, 99):
+        full = service.wallet_since(household, since)
+        _assert_true("delta" not in full and full["vouchers"] == household.vouchers,
+                     f"since_version={since} should get the full wallet")
+
+
+def test_legacy_household_without_versions() -> None:
+    household = Household.from_dict({
+        "household_id": "H52298800781", "postal_code": "560123", "unit_number": "#06-01",
+        "balance": 10, "vouchers": {"2": 5}, "link": "",
+    })
+    _assert_true(household.version == 0, f"a legacy household should load as version 0, got {household.version}")
+    _assert_true(household.vouchers_changed_since(0) == {}, "nothing has changed since version 0 yet")
+    household.bump_version(["2"])
+    _assert_true(household.vouchers_changed_since(0) == {"2": 5}, "the bumped denomination should show as changed")
+
+
+def main() -> None:
+    _cleanup_all()
+
+    tests = [
+        ("version bumped on every mutation", test_version_bumped_on_every_mutation),
+        ("wallet since", test_wallet_since),
+        ("legacy household without versions", test_legacy_household_without_versions),
+    ]
+
+    passed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {name}: {e}")
+
+    _cleanup_all()
+    print(f"\nResult: {passed}/{len(tests)} tests passed.")
+
+
+if __name__ == "__main__":
+    main()
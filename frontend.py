@@ -1,9 +1,8 @@
 import flet as ft
-import requests
 import re
+import uuid
 
-# Configuration
-API_BASE_URL = "http://127.0.0.1:5000/api"
+from api_client import client
 
 def main(page: ft.Page):
     page.title = "CDC Voucher App"
@@ -27,32 +26,32 @@ def main(page: ft.Page):
     # ==========================================
     # API CALLS
     # ==========================================
-    def api_register_merchant(data):
+    async def api_register_merchant(data):
         try:
-            resp = requests.post(f"{API_BASE_URL}/merchants", json=data)
+            resp = await client.apost("/merchants", json=data, idempotency_key=str(uuid.uuid4()))
             if resp.status_code == 201:
                 return True, resp.json()
             return False, resp.json().get("error", "Registration failed")
         except Exception as e:
             return False, str(e)
 
-    def api_verify_merchant(m_id):
+    async def api_verify_merchant(m_id):
         try:
-            resp = requests.get(f"{API_BASE_URL}/merchants/{m_id}")
+            resp = await client.aget(f"/merchants/{m_id}")
             if resp.status_code == 200:
                 return True, resp.json()
             return False, "Invalid Merchant ID"
         except Exception as e:
             return False, str(e)
 
-    def api_register_household(h_id, postal, unit):
+    async def api_register_household(h_id, postal, unit):
         data = {
             "household_id": h_id,
             "postal_code": postal,
             "unit_number": unit
         }
         try:
-            resp = requests.post(f"{API_BASE_URL}/households", json=data)
+            resp = await client.apost("/households", json=data, idempotency_key=str(uuid.uuid4()))
             if resp.status_code == 201:
                 data = resp.json()
                 link = data.get("link", "")
@@ -62,21 +61,21 @@ def main(page: ft.Page):
         except Exception as e:
             return False, str(e), None
 
-    def api_check_balance(h_id):
+    async def api_check_balance(h_id):
         try:
-            resp = requests.post(f"{API_BASE_URL}/enquiry", json={
+            resp = await client.apost("/enquiry", json={
                 "household_id": h_id, 
                 "action": "check_balance"
-            })
+            }, idempotent=True)
             if resp.status_code == 200:
                 return True, resp.json()
             return False, resp.json().get("error", "Login failed")
         except Exception as e:
             return False, str(e)
 
-    def api_generate_code(h_id, selected_vouchers):
+    async def api_generate_code(h_id, selected_vouchers):
         try:
-            resp = requests.post(f"{API_BASE_URL}/enquiry", json={
+            resp = await client.apost("/enquiry", json={
                 "household_id": h_id,
                 "action": "generate_code",
                 "vouchers": selected_vouchers
@@ -87,12 +86,12 @@ def main(page: ft.Page):
         except Exception as e:
             return False, str(e)
 
-    def api_redeem(m_id, code):
+    async def api_redeem(m_id, code):
         try:
-            resp = requests.post(f"{API_BASE_URL}/redemption", json={
+            resp = await client.apost("/redemption", json={
                 "merchant_id": m_id, 
                 "code": code
-            })
+            }, idempotency_key=str(uuid.uuid4()))
             if resp.status_code == 200:
                 return True, resp.json()
             return False, resp.json().get("error", "Redemption failed")
@@ -110,7 +109,7 @@ def main(page: ft.Page):
         h_error_text = ft.Text("", color="red", size=14)
         m_error_text = ft.Text("", color="red", size=14)
 
-        def login_household(e):
+        async def login_household(e):
             h_error_text.value = "" 
             h_id = h_id_input.value
             if not h_id:
@@ -118,7 +117,7 @@ def main(page: ft.Page):
                 page.update()
                 return
             
-            success, data = api_check_balance(h_id)
+            success, data = await api_check_balance(h_id)
             if success:
                 state["household_id"] = h_id
                 state["balance"] = data["balance"]
@@ -129,7 +128,7 @@ def main(page: ft.Page):
                 h_error_text.value = "Invalid Household ID. Please register first."
                 page.update()
 
-        def login_merchant(e):
+        async def login_merchant(e):
             m_error_text.value = ""
             m_id = m_id_input.value
             if not m_id:
@@ -137,7 +136,7 @@ def main(page: ft.Page):
                 page.update()
                 return
             
-            success, data = api_verify_merchant(m_id)
+            success, data = await api_verify_merchant(m_id)
             if success:
                 state["merchant_id"] = m_id
                 show_merchant_view()
@@ -182,14 +181,14 @@ def main(page: ft.Page):
         
         result_display = ft.Column(horizontal_alignment=ft.CrossAxisAlignment.CENTER)
 
-        def handle_submit(e):
+        async def handle_submit(e):
             if not re.match(r"^H\d{6}$", id_field.value):
                 result_display.controls.clear()
                 result_display.controls.append(ft.Text("Invalid Format. ID must start with 'H' followed by 6 digits (e.g. H123456)", color="red"))
                 page.update()
                 return
 
-            success, h_id, link = api_register_household(
+            success, h_id, link = await api_register_household(
                 id_field.value,
                 postal_field.value,
                 unit_field.value
@@ -267,7 +266,7 @@ def main(page: ft.Page):
 
         result_display = ft.Column(horizontal_alignment=ft.CrossAxisAlignment.CENTER)
 
-        def handle_submit(e):
+        async def handle_submit(e):
             data = {
                 "merchant_name": name.value,
                 "uen": uen.value,
@@ -277,7 +276,7 @@ def main(page: ft.Page):
                 "account_number": acc_num.value,
                 "account_holder_name": holder.value
             }
-            success, res = api_register_merchant(data)
+            success, res = await api_register_merchant(data)
             result_display.controls.clear()
             
             if success:
@@ -334,7 +333,7 @@ def main(page: ft.Page):
                 counters[denom].value = str(new_qty)
                 update_selection_display()
 
-        def handle_generate_code(e):
+        async def handle_generate_code(e):
             final_vouchers = {k: v for k, v in state["selected"].items() if v > 0}
             if not final_vouchers:
                 page.snack_bar = ft.SnackBar(ft.Text("Select at least one voucher!"))
@@ -342,7 +341,11 @@ def main(page: ft.Page):
                 page.update()
                 return
 
-            success, result = api_generate_code(state["household_id"], final_vouchers)
+            # Keep the UI live while waiting, but block double submits
+            e.control.disabled = True
+            page.update()
+            success, result = await api_generate_code(state["household_id"], final_vouchers)
+            e.control.disabled = False
             if success:
                 show_code_view(result)
             else:
@@ -439,8 +442,12 @@ def main(page: ft.Page):
         code_input = ft.TextField(label="Voucher Code", text_align="center", text_size=24)
         result_text = ft.Text("", size=16)
 
-        def handle_redeem(e):
-            success, res = api_redeem(state["merchant_id"], code_input.value)
+        async def handle_redeem(e):
+            # Keep the UI live while waiting, but block double submits
+            e.control.disabled = True
+            page.update()
+            success, res = await api_redeem(state["merchant_id"], code_input.value)
+            e.control.disabled = False
             if success:
                 result_text.value = f"Success!\nTX: {res['transaction_id']}\nAmount: ${res['amount_redeemed']}"
                 result_text.color = "green"
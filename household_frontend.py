@@ -1,9 +1,9 @@
 import flet as ft
-import requests
 import re
+import threading
+import uuid
 
-# Configuration
-API_BASE_URL = "http://127.0.0.1:5000/api"
+from api_client import client
 
 def main(page: ft.Page):
     page.title = "CDC Voucher App - Households"
@@ -20,20 +20,21 @@ def main(page: ft.Page):
         "household_id": "",
         "balance": 0,
         "wallet": {},
-        "selected": {}
+        "selected": {},
+        "events_stop": None
     }
 
     # ==========================================
     # API CALLS
     # ==========================================
-    def api_register_household(h_id, postal, unit):
+    async def api_register_household(h_id, postal, unit):
         data = {
             "household_id": h_id,
             "postal_code": postal,
             "unit_number": unit
         }
         try:
-            resp = requests.post(f"{API_BASE_URL}/households", json=data)
+            resp = await client.apost("/households", json=data, idempotency_key=str(uuid.uuid4()))
             if resp.status_code == 201:
                 data = resp.json()
                 link = data.get("link", "")
@@ -43,21 +44,21 @@ def main(page: ft.Page):
         except Exception as e:
             return False, str(e), None
 
-    def api_check_balance(h_id):
+    async def api_check_balance(h_id):
         try:
-            resp = requests.post(f"{API_BASE_URL}/enquiry", json={
+            resp = await client.apost("/enquiry", json={
                 "household_id": h_id, 
                 "action": "check_balance"
-            })
+            }, idempotent=True)
             if resp.status_code == 200:
                 return True, resp.json()
             return False, resp.json().get("error", "Login failed")
         except Exception as e:
             return False, str(e)
 
-    def api_generate_code(h_id, selected_vouchers):
+    async def api_generate_code(h_id, selected_vouchers):
         try:
-            resp = requests.post(f"{API_BASE_URL}/enquiry", json={
+            resp = await client.apost("/enquiry", json={
                 "household_id": h_id,
                 "action": "generate_code",
                 "vouchers": selected_vouchers
@@ -68,16 +69,89 @@ def main(page: ft.Page):
         except Exception as e:
             return False, str(e)
 
+    async def api_generate_code_for_amount(h_id, amount):
+        try:
+            resp = await client.apost("/enquiry", json={
+                "household_id": h_id,
+                "action": "generate_code_for_amount",
+                "amount": amount
+            })
+            if resp.status_code == 200:
+                return True, resp.json().get("code")
+            return False, resp.json().get("error", "Error generating code")
+        except Exception as e:
+            return False, str(e)
+
+    # ==========================================
+    # LIVE UPDATES
+    # ==========================================
+    # The backend pushes wallet changes and consumed codes over server-sent
+    # events, so a redemption at the counter shows up without a re-login.
+    def start_events(h_id):
+        stop_events()
+        stop = threading.Event()
+        state["events_stop"] = stop
+        page.run_thread(listen_for_events, h_id, stop)
+
+    def stop_events():
+        if state["events_stop"] is not None:
+            state["events_stop"].set()
+            state["events_stop"] = None
+
+    def listen_for_events(h_id, stop):
+        try:
+            for event, data in client.events(f"/households/{h_id}/events", stop):
+                if stop.is_set() or state["household_id"] != h_id:
+                    return
+                if event == "wallet":
+                    state["balance"] = data["balance"]
+                    state["wallet"] = data["vouchers"]
+                    for denom, qty in list(state["selected"].items()):
+                        state["selected"][denom] = min(qty, state["wallet"].get(denom, 0))
+                    if views.get("dashboard") is not None and views["dashboard"].visible:
+                        show_dashboard()
+                elif event == "code_consumed":
+                    page.snack_bar = ft.SnackBar(ft.Text(f"Code {data['code']} redeemed at {data['merchant_id']}"))
+                    page.snack_bar.open = True
+                    if views.get("code") is not None and views["code"].visible and ui["code_text"].value == data["code"]:
+                        show_dashboard()
+                    else:
+                        page.update()
+        except Exception as e:
+            # e.g. 404: the household is gone, reconnecting would not help
+            if not stop.is_set() and state["household_id"] == h_id:
+                page.snack_bar = ft.SnackBar(ft.Text(f"Live updates stopped: {e}"))
+                page.snack_bar.open = True
+                page.update()
+
+    # ==========================================
+    # VIEW CACHE
+    # ==========================================
+    # Every screen is built once and stays on the page. Navigating only flips
+    # `visible`, so Flet sends a few changed properties, not a new control tree.
+    views = {}
+    ui = {}
+
+    def ensure_view(name, build):
+        if name not in views:
+            views[name] = build()
+            page.controls.append(views[name])
+
+    def show_view(name, build):
+        ensure_view(name, build)
+        for key, view in views.items():
+            view.visible = key == name
+        page.update()
+
     # ==========================================
     # SCREENS
     # ==========================================
 
     # --- 1. LOGIN HOME ---
-    def show_login():
-        page.clean()
+    def build_login():
         h_error_text = ft.Text("", color="red", size=14)
 
-        def login_household(e):
+        async def login_household(e):
             h_error_text.value = "" 
             h_id = h_id_input.value
             if not h_id:
@@ -85,51 +159,55 @@ def main(page: ft.Page):
                 page.update()
                 return
             
-            success, data = api_check_balance(h_id)
+            success, data = await api_check_balance(h_id)
             if success:
                 state["household_id"] = h_id
                 state["balance"] = data["balance"]
                 state["wallet"] = data["vouchers"]
                 state["selected"] = {}
+                start_events(h_id)
                 show_dashboard()
             else:
                 h_error_text.value = "Invalid Household ID. Please register first."
                 page.update()
 
         h_id_input = ft.TextField(label="Household ID", hint_text="Enter ID (e.g. H123...)")
+        ui["login_error"] = h_error_text
 
-        page.add(
-            ft.Column([
-                ft.Row([ft.Text("CDC Households", size=30, weight="bold", color="teal")], alignment=ft.MainAxisAlignment.CENTER),
-                ft.Divider(),
-                
-                ft.Text("Login to access vouchers", size=16),
-                h_id_input,
-                ft.Row([ft.Button("Login", on_click=login_household, width=360)], alignment=ft.MainAxisAlignment.CENTER),
-                ft.Row([ft.TextButton("No Account? Register Household", on_click=lambda e: show_register_household())], alignment=ft.MainAxisAlignment.CENTER),
-                ft.Row([h_error_text], alignment=ft.MainAxisAlignment.CENTER),
-            ], spacing=15, horizontal_alignment=ft.CrossAxisAlignment.STRETCH)
-        )
-        page.update()
+        return ft.Column([
+            ft.Row([ft.Text("CDC Households", size=30, weight="bold", color="teal")], alignment=ft.MainAxisAlignment.CENTER),
+            ft.Divider(),
+            
+            ft.Text("Login to access vouchers", size=16),
+            h_id_input,
+            ft.Row([ft.Button("Login", on_click=login_household, width=360)], alignment=ft.MainAxisAlignment.CENTER),
+            ft.Row([ft.TextButton("No Account? Register Household", on_click=lambda e: show_register_household())], alignment=ft.MainAxisAlignment.CENTER),
+            ft.Row([h_error_text], alignment=ft.MainAxisAlignment.CENTER),
+        ], spacing=15, horizontal_alignment=ft.CrossAxisAlignment.STRETCH)
+
+    def show_login():
+        stop_events()
+        if "login_error" in ui:
+            ui["login_error"].value = ""
+        show_view("login", build_login)
 
     # --- 2. REGISTER HOUSEHOLD ---
-    def show_register_household():
-        page.clean()
-        
+    def build_register_household():
         id_field = ft.TextField(label="Household ID (e.g. H52298800781)")
         postal_field = ft.TextField(label="Postal Code (e.g. 560456)")
         unit_field = ft.TextField(label="Unit Number (e.g. #08-02)")
         
         result_display = ft.Column(horizontal_alignment=ft.CrossAxisAlignment.CENTER)
+        ui["register_result"] = result_display
 
-        def handle_submit(e):
+        async def handle_submit(e):
             if not re.match(r"^H\d{11}$", id_field.value):
                 result_display.controls.clear()
                 result_display.controls.append(ft.Text("Invalid Format. ID must start with 'H' followed by 11 digits (e.g. H52298800781)", color="red"))
                 page.update()
                 return
 
-            success, h_id, link = api_register_household(
+            success, h_id, link = await api_register_household(
                 id_field.value,
                 postal_field.value,
                 unit_field.value
@@ -163,44 +241,69 @@ def main(page: ft.Page):
                 result_display.controls.append(ft.Text(f"Error: {h_id}", color="red"))
             page.update()
 
-        page.add(
-            ft.Column([
-                ft.Row([ft.IconButton(ft.Icons.ARROW_BACK, on_click=lambda e: show_login())], alignment=ft.MainAxisAlignment.START),
-                
-                ft.Text("Register Household", size=25, weight="bold"),
-                ft.Text("Enter your details to claim vouchers."),
-                
-                id_field,
-                postal_field,
-                unit_field,
-                
-                ft.Row([ft.Button("Register Now", on_click=handle_submit, bgcolor="teal", color="white")], alignment=ft.MainAxisAlignment.CENTER),
-                result_display
-            ], horizontal_alignment=ft.CrossAxisAlignment.STRETCH)
-        )
-        page.update()
+        return ft.Column([
+            ft.Row([ft.IconButton(ft.Icons.ARROW_BACK, on_click=lambda e: show_login())], alignment=ft.MainAxisAlignment.START),
+            
+            ft.Text("Register Household", size=25, weight="bold"),
+            ft.Text("Enter your details to claim vouchers."),
+            
+            id_field,
+            postal_field,
+            unit_field,
+            
+            ft.Row([ft.Button("Register Now", on_click=handle_submit, bgcolor="teal", color="white")], alignment=ft.MainAxisAlignment.CENTER),
+            result_display
+        ], horizontal_alignment=ft.CrossAxisAlignment.STRETCH)
+
+    def show_register_household():
+        if "register_result" in ui:
+            ui["register_result"].controls.clear()
+        show_view("register", build_register_household)
 
     # --- 3. HOUSEHOLD DASHBOARD ---
-    def show_dashboard():
-        page.clean()
-        
-        def update_selection_display():
-            total = 0
-            for denom, qty in state["selected"].items():
-                total += int(denom) * qty
-            total_text.value = f"Total Selected: ${total}"
-            page.update()
+    # Rows and counters are created once per denomination; a +/- tap only
+    # updates that counter and the total, and only those controls are sent.
+    voucher_rows = {}
+    counters = {}
+    owned_texts = {}
+
+    def update_selection_display():
+        total = 0
+        for denom, qty in state["selected"].items():
+            total += int(denom) * qty
+        ui["total_text"].value = f"Total Selected: ${total}"
+        ui["total_text"].update()
 
-        def modify_selection(denom, delta):
-            current_qty = state["selected"].get(denom, 0)
-            max_qty = state["wallet"].get(denom, 0)
-            new_qty = current_qty + delta
-            if 0 <= new_qty <= max_qty:
-                state["selected"][denom] = new_qty
-                counters[denom].value = str(new_qty)
-                update_selection_display()
+    def modify_selection(denom, delta):
+        current_qty = state["selected"].get(denom, 0)
+        max_qty = state["wallet"].get(denom, 0)
+        new_qty = current_qty + delta
+        if 0 <= new_qty <= max_qty:
+            state["selected"][denom] = new_qty
+            counters[denom].value = str(new_qty)
+            counters[denom].update()
+            update_selection_display()
+
+    def voucher_row(denom):
+        counters[denom] = ft.Text("0", size=20, width=30, text_align="center")
+        owned_texts[denom] = ft.Text("", size=12, color="grey")
+        return ft.Row([
+            ft.Container(
+                content=ft.Text(f"${denom}", color="white", weight="bold"),
+                bgcolor="teal", padding=10, border_radius=5, width=60, 
+                alignment=ft.Alignment(0, 0)
+            ),
+            ft.Column([
+                ft.Text(f"${denom} Voucher", weight="bold"),
+                owned_texts[denom]
+            ]),
+            ft.IconButton(ft.Icons.REMOVE, on_click=lambda e, d=denom: modify_selection(d, -1)),
+            counters[denom],
+            ft.IconButton(ft.Icons.ADD, on_click=lambda e, d=denom: modify_selection(d, 1)),
+        ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN)
 
-        def handle_generate_code(e):
+    def build_dashboard():
+        async def handle_generate_code(e):
             final_vouchers = {k: v for k, v in state["selected"].items() if v > 0}
             if not final_vouchers:
                 page.snack_bar = ft.SnackBar(ft.Text("Select at least one voucher!"))
@@ -208,7 +311,11 @@ def main(page: ft.Page):
                 page.update()
                 return
 
-            success, result = api_generate_code(state["household_id"], final_vouchers)
+            # Keep the UI live while waiting, but block double submits
+            e.control.disabled = True
+            page.update()
+            success, result = await api_generate_code(state["household_id"], final_vouchers)
+            e.control.disabled = False
             if success:
                 show_code_view(result)
             else:
@@ -216,40 +323,39 @@ def main(page: ft.Page):
                 page.snack_bar.open = True
                 page.update()
 
-        # Build UI
-        voucher_controls = []
-        counters = {}
-        sorted_denoms = sorted(state["wallet"].keys(), key=lambda x: int(x))
-
-        for denom in sorted_denoms:
-            count = state["wallet"][denom]
-            if count > 0:
-                counters[denom] = ft.Text("0", size=20, width=30, text_align="center")
-                voucher_controls.append(
-                    ft.Row([
-                        ft.Container(
-                            content=ft.Text(f"${denom}", color="white", weight="bold"),
-                            bgcolor="teal", padding=10, border_radius=5, width=60, 
-                            alignment=ft.Alignment(0, 0)
-                        ),
-                        ft.Column([
-                            ft.Text(f"${denom} Voucher", weight="bold"),
-                            ft.Text(f"Owned: {count}", size=12, color="grey")
-                        ]),
-                        ft.IconButton(ft.Icons.REMOVE, on_click=lambda e, d=denom: modify_selection(d, -1)),
-                        counters[denom],
-                        ft.IconButton(ft.Icons.ADD, on_click=lambda e, d=denom: modify_selection(d, 1)),
-                    ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN)
-                )
+        async def handle_generate_for_amount(e):
+            amount = (amount_input.value or "").strip()
+            if not amount.isdigit() or int(amount) <= 0:
+                page.snack_bar = ft.SnackBar(ft.Text("Enter a whole dollar amount!"))
+                page.snack_bar.open = True
+                page.update()
+                return
+
+            e.control.disabled = True
+            page.update()
+            success, result = await api_generate_code_for_amount(state["household_id"], int(amount))
+            e.control.disabled = False
+            if success:
+                amount_input.value = ""
+                show_code_view(result)
+            else:
+                page.snack_bar = ft.SnackBar(ft.Text(f"Error: {result}"))
+                page.snack_bar.open = True
+                page.update()
+
+        amount_input = ft.TextField(label="Amount ($)", keyboard_type=ft.KeyboardType.NUMBER, expand=True)
 
-        total_text = ft.Text("Total Selected: $0", size=20, weight="bold", color="green")
+        ui["balance_text"] = ft.Text("", size=40, weight="bold", color="white")
+        ui["id_text"] = ft.Text("", size=12, color="white70")
+        ui["voucher_column"] = ft.Column([])
+        ui["total_text"] = ft.Text("Total Selected: $0", size=20, weight="bold", color="green")
         
         wallet_box = ft.Row([
             ft.Container(
                 content=ft.Column([
                     ft.Text("Current Balance", color="white"),
-                    ft.Text(f"${state['balance']}", size=40, weight="bold", color="white"),
-                    ft.Text(f"ID: {state['household_id']}", size=12, color="white70")
+                    ui["balance_text"],
+                    ui["id_text"]
                 ]),
                 bgcolor="teal", padding=20, border_radius=10, width=400
             )
@@ -259,50 +365,77 @@ def main(page: ft.Page):
             ft.Button("Generate Code", on_click=handle_generate_code, width=400, height=50)
         ], alignment=ft.MainAxisAlignment.CENTER)
 
-        page.add(
-            ft.Column([
-                ft.Row([
-                    ft.IconButton(ft.Icons.LOGOUT, on_click=lambda e: show_login()),
-                    ft.Text("My Wallet", size=20, weight="bold"),
-                ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-                
-                wallet_box,
-                
-                ft.Divider(),
-                
-                ft.Text("Select Vouchers:"),
-                ft.Column(voucher_controls),
-                
-                ft.Divider(),
-                
-                ft.Row([total_text], alignment=ft.MainAxisAlignment.CENTER),
-                generate_btn
-            ], horizontal_alignment=ft.CrossAxisAlignment.STRETCH)
-        )
-        page.update()
+        return ft.Column([
+            ft.Row([
+                ft.IconButton(ft.Icons.LOGOUT, on_click=lambda e: show_login()),
+                ft.Text("My Wallet", size=20, weight="bold"),
+            ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+            
+            wallet_box,
+            
+            ft.Divider(),
+            
+            ft.Text("Select Vouchers:"),
+            ui["voucher_column"],
+            
+            ft.Divider(),
+            
+            ft.Row([ui["total_text"]], alignment=ft.MainAxisAlignment.CENTER),
+            generate_btn,
+
+            ft.Divider(),
+
+            ft.Text("Or pay an exact amount (fewest vouchers are picked for you):"),
+            ft.Row([
+                amount_input,
+                ft.Button("Generate", on_click=handle_generate_for_amount)
+            ])
+        ], horizontal_alignment=ft.CrossAxisAlignment.STRETCH)
+
+    def show_dashboard():
+        ensure_view("dashboard", build_dashboard)
+
+        # Sync the cached controls with the current household (unchanged values are not re-sent)
+        ui["balance_text"].value = f"${state['balance']}"
+        ui["id_text"].value = f"ID: {state['household_id']}"
+        for denom in sorted(state["wallet"].keys(), key=lambda x: int(x)):
+            if denom not in voucher_rows:
+                voucher_rows[denom] = voucher_row(denom)
+                ui["voucher_column"].controls.append(voucher_rows[denom])
+        for denom, row in voucher_rows.items():
+            count = state["wallet"].get(denom, 0)
+            row.visible = count > 0
+            owned_texts[denom].value = f"Owned: {count}"
+            counters[denom].value = str(state["selected"].get(denom, 0))
+        total = sum(int(d) * q for d, q in state["selected"].items())
+        ui["total_text"].value = f"Total Selected: ${total}"
+
+        show_view("dashboard", build_dashboard)
 
     # --- 4. CODE VIEW ---
+    def build_code_view():
+        ui["code_text"] = ft.Text("", size=60, weight="bold")
+        return ft.Column([
+            ft.IconButton(ft.Icons.ARROW_BACK, on_click=lambda e: show_dashboard()),
+            ft.Container(height=50),
+            ft.Text("Show to Merchant", size=20),
+            ft.Container(
+                content=ui["code_text"],
+                padding=30, border=ft.Border.all(2, "teal"), border_radius=10,
+                alignment=ft.Alignment(0, 0)
+            ),
+            ft.Text("Valid for 10 minutes", color="red", italic=True),
+
+            ft.Container(height=30),
+
+            ft.OutlinedButton("Logout", on_click=lambda e: show_login(), width=250)
+
+        ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, alignment=ft.MainAxisAlignment.CENTER)
+
     def show_code_view(code):
-        page.clean()
-        page.add(
-            ft.Column([
-                ft.IconButton(ft.Icons.ARROW_BACK, on_click=lambda e: show_dashboard()),
-                ft.Container(height=50),
-                ft.Text("Show to Merchant", size=20),
-                ft.Container(
-                    content=ft.Text(code, size=60, weight="bold"),
-                    padding=30, border=ft.Border.all(2, "teal"), border_radius=10,
-                    alignment=ft.Alignment(0, 0)
-                ),
-                ft.Text("Valid for 10 minutes", color="red", italic=True),
-
-                ft.Container(height=30),
-
-                ft.OutlinedButton("Logout", on_click=lambda e: show_login(), width=250)
-
-            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, alignment=ft.MainAxisAlignment.CENTER)
-        )
-        page.update()
+        ensure_view("code", build_code_view)
+        ui["code_text"].value = code
+        show_view("code", build_code_view)
 
     show_login()
 
@@ -1,9 +1,21 @@
 import flet as ft
-import requests
-import csv
+import asyncio
+import json
 import os
+import random
+import uuid
+from datetime import datetime
 
-API_BASE_URL = "http://127.0.0.1:5000/api"
+from api_client import client
+
+# Local copy of GET /api/bankcodes, revalidated with its ETag
+BANK_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cdc_voucher", "bankcodes.json")
+
+# Redemptions accepted at this terminal, kept until the backend gives a final status
+QUEUE_PATH = os.path.join(os.path.expanduser("~"), ".cdc_voucher", "redemption_queue.json")
+QUEUE_BATCH_SIZE = 20
+QUEUE_KEEP_FINISHED = 50
+QUEUE_MAX_BACKOFF_SECONDS = 60
 
 def main(page: ft.Page):
     page.title = "CDC Voucher App - Merchants"
@@ -15,58 +27,218 @@ def main(page: ft.Page):
 
     state = {
         "merchant_id": "",
-        "banks": {} 
+        "banks": {},
+        "bank_cache": {}
     }
 
     # ==========================================
     # API CALLS
     # ==========================================
-    def api_register_merchant(data):
+    async def api_register_merchant(data):
         try:
-            resp = requests.post(f"{API_BASE_URL}/merchants", json=data)
+            resp = await client.apost("/merchants", json=data, idempotency_key=str(uuid.uuid4()))
             if resp.status_code == 201:
                 return True, resp.json()
             return False, resp.json().get("error", "Registration failed")
         except Exception as e:
             return False, str(e)
 
-    def api_verify_merchant(m_id):
+    async def api_verify_merchant(m_id):
         try:
-            resp = requests.get(f"{API_BASE_URL}/merchants/{m_id}")
+            resp = await client.aget(f"/merchants/{m_id}")
             if resp.status_code == 200:
                 return True, resp.json()
             return False, "Invalid Merchant ID"
         except Exception as e:
             return False, str(e)
 
-    def api_redeem(m_id, code):
+    async def api_redeem_batch(items):
+        """(True, results) once the backend has answered; (False, error) if it should be retried."""
         try:
-            resp = requests.post(f"{API_BASE_URL}/redemption", json={
-                "merchant_id": m_id, 
-                "code": code
-            })
+            resp = await client.apost("/redemption/batch", json={
+                "redemptions": [
+                    {"idempotency_key": i["idempotency_key"], "merchant_id": i["merchant_id"], "code": i["code"]}
+                    for i in items
+                ]
+            }, idempotent=True)  # every item carries an idempotency key
+            if resp.status_code == 200:
+                return True, resp.json()["results"]
+            if resp.status_code == 400:
+                error = resp.json().get("error", "Redemption failed")
+                return True, [{"idempotency_key": i["idempotency_key"], "status": "failed", "error": error} for i in items]
+            return False, f"Server error ({resp.status_code})"
+        except Exception as e:
+            return False, str(e)
+
+    async def api_redemption_history(m_id, cursor=None, limit=20):
+        try:
+            params = {"limit": limit}
+            if cursor:
+                params["cursor"] = cursor
+            resp = await client.aget(f"/merchants/{m_id}/redemptions", params=params)
             if resp.status_code == 200:
                 return True, resp.json()
-            return False, resp.json().get("error", "Redemption failed")
+            return False, resp.json().get("error", "Could not load history")
         except Exception as e:
             return False, str(e)
 
+    async def api_bank_codes(etag=""):
+        """(changed, catalogue, etag); changed is False on 304 Not Modified or error."""
+        try:
+            headers = {"If-None-Match": etag} if etag else {}
+            resp = await client.aget("/bankcodes", headers=headers)
+            if resp.status_code == 200:
+                return True, resp.json(), resp.headers.get("ETag", "")
+        except Exception:
+            pass
+        return False, None, etag
+
+    # ==========================================
+    # BANK CODE CACHE
+    # ==========================================
+    def apply_bank_catalogue(catalogue):
+        banks = {}
+        for bank in catalogue.get("banks", []):
+            if bank.get("branches"):
+                banks[bank["bank_name"]] = {
+                    "code": bank["bank_code"],
+                    "branch": bank["branches"][0]["branch_code"]
+                }
+        state["banks"] = banks
+
+    def load_bank_cache():
+        try:
+            with open(BANK_CACHE_PATH, "r", encoding="utf-8") as f:
+                state["bank_cache"] = json.load(f)
+            apply_bank_catalogue(state["bank_cache"].get("catalogue", {}))
+        except (OSError, ValueError):
+            state["bank_cache"] = {}
+
+    async def revalidate_bank_codes(on_change):
+        """Ask the backend whether the cached catalogue is still current; refresh it if not."""
+        changed, catalogue, etag = await api_bank_codes(state["bank_cache"].get("etag", ""))
+        if not changed:
+            return
+        state["bank_cache"] = {"etag": etag, "catalogue": catalogue}
+        apply_bank_catalogue(catalogue)
+        try:
+            os.makedirs(os.path.dirname(BANK_CACHE_PATH), exist_ok=True)
+            with open(BANK_CACHE_PATH, "w", encoding="utf-8") as f:
+                json.dump(state["bank_cache"], f)
+        except OSError:
+            pass
+        on_change()
+
+    # ==========================================
+    # OFFLINE REDEMPTION QUEUE
+    # ==========================================
+    # The cashier's code is saved to disk first, then sent in the background
+    # with its idempotency key, so retries after a timeout never redeem twice.
+    queue = {"items": [], "draining": False, "on_change": None}
+
+    def load_queue():
+        try:
+            with open(QUEUE_PATH, "r", encoding="utf-8") as f:
+                queue["items"] = json.load(f)
+        except (OSError, ValueError):
+            queue["items"] = []
+
+    def save_queue():
+        # Write-then-rename, so a crash never leaves a half-written queue
+        os.makedirs(os.path.dirname(QUEUE_PATH), exist_ok=True)
+        tmp_path = QUEUE_PATH + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(queue["items"], f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, QUEUE_PATH)
+
+    def enqueue_redemption(m_id, code):
+        item = {
+            "idempotency_key": str(uuid.uuid4()),
+            "merchant_id": m_id,
+            "code": code,
+            "status": "pending",
+            "queued_at": datetime.now().isoformat(timespec="seconds"),
+            "attempts": 0
+        }
+        queue["items"].append(item)
+
+        # Keep every pending item, but only the latest finished ones
+        finished = [i for i in queue["items"] if i["status"] != "pending"]
+        for old in finished[:-QUEUE_KEEP_FINISHED]:
+            queue["items"].remove(old)
+        save_queue()
+        return item
+
+    def notify_queue_change():
+        if queue["on_change"]:
+            queue["on_change"]()
+
+    async def drain_queue():
+        """Send pending items in batches until none are left, backing off while the backend is down."""
+        if queue["draining"]:
+            return
+        queue["draining"] = True
+        delay = 1
+        try:
+            while True:
+                pending = [i for i in queue["items"] if i["status"] == "pending"][:QUEUE_BATCH_SIZE]
+                if not pending:
+                    return
+                success, res = await api_redeem_batch(pending)
+                if not success:
+                    for item in pending:
+                        item["attempts"] += 1
+                        item["last_error"] = res
+                    save_queue()
+                    notify_queue_change()
+                    await asyncio.sleep(delay + random.uniform(0, delay / 2))
+                    delay = min(delay * 2, QUEUE_MAX_BACKOFF_SECONDS)
+                    continue
+
+                by_key = {r.get("idempotency_key"): r for r in res}
+                finished = 0
+                for item in pending:
+                    r = by_key.get(item["idempotency_key"])
+                    if r is None:
+                        continue
+                    item["status"] = r["status"]
+                    item["result"] = r.get("result")
+                    item["error"] = r.get("error")
+                    if r["status"] != "pending":
+                        finished += 1
+                    else:
+                        item["attempts"] += 1
+                save_queue()
+                notify_queue_change()
+
+                # Rate-limited or still in flight on the backend: nothing settled, so back off
+                if not finished:
+                    await asyncio.sleep(delay + random.uniform(0, delay / 2))
+                    delay = min(delay * 2, QUEUE_MAX_BACKOFF_SECONDS)
+                else:
+                    delay = 1
+        finally:
+            queue["draining"] = False
+
     # ==========================================
     # SCREENS
     # ==========================================
 
     def show_login():
         page.clean()
+        queue["on_change"] = None
         m_error_text = ft.Text("", color="red", size=14)
 
-        def login_merchant(e):
+        async def login_merchant(e):
             m_error_text.value = ""
             if not m_id_input.value:
                 m_error_text.value = "Please enter a Merchant ID"
                 page.update()
                 return
             
-            success, data = api_verify_merchant(m_id_input.value)
+            success, data = await api_verify_merchant(m_id_input.value)
             if success:
                 state["merchant_id"] = m_id_input.value
                 show_merchant_view()
@@ -92,24 +264,6 @@ def main(page: ft.Page):
     def show_register_merchant():
         page.clean()
 
-        # Only load if we haven't already
-        if not state["banks"]:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            csv_path = os.path.join(current_dir, "backend", "storage", "data", "BankCode.csv")
-            
-            if os.path.exists(csv_path):
-                try:
-                    with open(csv_path, mode='r', encoding='utf-8-sig') as f:
-                        reader = csv.DictReader(f)
-                        for row in reader:
-                            if "Bank_Name" in row:
-                                state["banks"][row["Bank_Name"]] = {
-                                    "code": row["Bank_Code"],
-                                    "branch": row["Branch_Code"]
-                                }
-                except Exception:
-                    pass 
-
         name = ft.TextField(label="Business Name")
         uen = ft.TextField(label="UEN (Business Reg No)")
         
@@ -119,13 +273,20 @@ def main(page: ft.Page):
             label="Bank Name", 
             options=bank_items
         )
+
+        def refresh_bank_options():
+            bank_name_dropdown.options = [ft.dropdown.Option(b) for b in state["banks"].keys()]
+            page.update()
+
+        # Show the cached banks straight away; revalidate in the background
+        page.run_task(revalidate_bank_codes, refresh_bank_options)
         
         acc_num = ft.TextField(label="Account Number")
         holder = ft.TextField(label="Account Holder Name")
 
         result_display = ft.Column(horizontal_alignment=ft.CrossAxisAlignment.CENTER)
 
-        def handle_submit(e):
+        async def handle_submit(e):
             if not (uen.value.isdigit() and len(uen.value) in [9, 10]):
                 result_display.controls.clear()
                 result_display.controls.append(ft.Text("UEN must be 9 or 10 digits", color="red"))
@@ -154,7 +315,7 @@ def main(page: ft.Page):
                 "account_holder_name": holder.value
             }
             
-            success, res = api_register_merchant(data)
+            success, res = await api_register_merchant(data)
             result_display.controls.clear()
             
             if success:
@@ -191,18 +352,39 @@ def main(page: ft.Page):
         page.clean()
         code_input = ft.TextField(label="Voucher Code", text_align="center", text_size=24)
         result_text = ft.Text("", size=16)
+        queue_list = ft.Column(spacing=2)
 
-        def handle_redeem(e):
-            success, res = api_redeem(state["merchant_id"], code_input.value)
-            if success:
-                result_text.value = f"Success!\nTX: {res['transaction_id']}\nAmount: ${res['amount_redeemed']}"
-                result_text.color = "green"
-                code_input.value = ""
-            else:
-                result_text.value = f"Failed: {res}"
-                result_text.color = "red"
+        def describe(item):
+            if item["status"] == "success":
+                res = item["result"]
+                return f"{item['code']}: Success, TX {res['transaction_id']}, ${res['amount_redeemed']}", "green"
+            if item["status"] == "failed":
+                return f"{item['code']}: Failed, {item['error']}", "red"
+            retry = f" (retrying: {item['last_error']})" if item.get("attempts") else ""
+            return f"{item['code']}: Sending...{retry}", "orange"
+
+        def render_queue():
+            # Latest first, this merchant only
+            items = [i for i in queue["items"] if i["merchant_id"] == state["merchant_id"]][-10:][::-1]
+            queue_list.controls = [
+                ft.Text(text, size=12, color=color) for text, color in map(describe, items)
+            ]
+            if items:
+                result_text.value, result_text.color = describe(items[0])
             page.update()
 
+        queue["on_change"] = render_queue
+
+        def handle_redeem(e):
+            code = (code_input.value or "").strip()
+            if not code:
+                return
+            # Accept the code locally; the queue delivers it and reports the final status
+            enqueue_redemption(state["merchant_id"], code)
+            code_input.value = ""
+            render_queue()
+            page.run_task(drain_queue)
+
         action_area = ft.Column([
             ft.Text("Scan Code", size=20),
             code_input,
@@ -213,7 +395,9 @@ def main(page: ft.Page):
                 bgcolor=ft.Colors.GREY_100,
                 border_radius=10,
                 width=400
-            )
+            ),
+            ft.Text("Recent redemptions", size=14, weight="bold"),
+            queue_list
         ], horizontal_alignment=ft.CrossAxisAlignment.CENTER)
 
         page.add(
@@ -221,14 +405,79 @@ def main(page: ft.Page):
                 ft.Row([
                     ft.IconButton(ft.Icons.LOGOUT, on_click=lambda e: show_login()),
                     ft.Text(f"Merchant: {state['merchant_id']}", size=16, weight="bold"),
+                    ft.IconButton(ft.Icons.HISTORY, tooltip="Redemption History", on_click=lambda e: show_history()),
                 ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
                 ft.Divider(),
                 action_area
             ], horizontal_alignment=ft.CrossAxisAlignment.STRETCH)
         )
+        render_queue()
+
+    def show_history():
+        page.clean()
+        queue["on_change"] = None
+        history = {"cursor": None, "done": False, "loading": False}
+        status_text = ft.Text("", size=12, color="grey")
+
+        async def load_next_page():
+            # Only one request in flight, and stop once the server has no next_cursor
+            if history["loading"] or history["done"]:
+                return
+            history["loading"] = True
+            status_text.value = "Loading..."
+            page.update()
+
+            success, res = await api_redemption_history(state["merchant_id"], history["cursor"])
+            history["loading"] = False
+            if not success:
+                status_text.value = f"Failed: {res}"
+                page.update()
+                return
+
+            for txn in res["redemptions"]:
+                t = txn["date_time"]
+                when = f"{t[0:4]}-{t[4:6]}-{t[6:8]} {t[8:10]}:{t[10:12]}" if len(t) >= 12 else t
+                notes = ", ".join(f"{q} x ${d}" for d, q in sorted(txn["vouchers"].items(), key=lambda x: int(x[0])))
+                history_list.controls.append(
+                    ft.ListTile(
+                        title=ft.Text(f"{txn['transaction_id']}  ${txn['amount_redeemed']}", weight="bold"),
+                        subtitle=ft.Text(f"{when}\n{notes}"),
+                    )
+                )
+
+            history["cursor"] = res.get("next_cursor")
+            history["done"] = history["cursor"] is None
+            if history["done"]:
+                status_text.value = "End of history" if history_list.controls else "No redemptions yet"
+            else:
+                status_text.value = ""
+            page.update()
+
+        async def handle_scroll(e):
+            # Fetch the next page when the user gets close to the bottom
+            if e.max_scroll_extent is not None and e.pixels >= e.max_scroll_extent - 100:
+                await load_next_page()
+
+        history_list = ft.ListView(spacing=5, height=550, on_scroll=handle_scroll, scroll_interval=100)
+
+        page.add(
+            ft.Column([
+                ft.Row([
+                    ft.IconButton(ft.Icons.ARROW_BACK, on_click=lambda e: show_merchant_view()),
+                    ft.Text("Redemption History", size=20, weight="bold"),
+                ], alignment=ft.MainAxisAlignment.START),
+                ft.Divider(),
+                history_list,
+                ft.Row([status_text], alignment=ft.MainAxisAlignment.CENTER),
+            ], horizontal_alignment=ft.CrossAxisAlignment.STRETCH)
+        )
         page.update()
+        page.run_task(load_next_page)
 
+    load_bank_cache()
+    load_queue()
     show_login()
+    page.run_task(drain_queue)  # deliver anything left from the last session
 
 if __name__ == "__main__":
     ft.run(main)
\ No newline at end of file